@@ -2,6 +2,9 @@
 Configuracao ASGI para o projeto app.
 
 Expoe o callable ASGI como uma variavel de modulo chamada ``application``.
+E o ponto de entrada do stream de eventos do quadro (`/api/v1/events/`),
+que depende de respostas assincronas de longa duracao, e da leitura
+assincrona para polling (`/api/v1/async/`, ver `tasks.async_views`).
 
 Para mais informacoes sobre este arquivo, consulte
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
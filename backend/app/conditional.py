@@ -0,0 +1,115 @@
+"""GET condicional (ETag / If-None-Match) para os ViewSets da API.
+
+O ETag e derivado de uma "versao" barata das tabelas que compoem a resposta
+(max(`updated_at`) + contagem de linhas de cada modelo), calculada numa unica
+consulta. Quando o cliente reenvia o mesmo ETag, a resposta 304 sai antes de
+o queryset ser avaliado ou serializado.
+
+As respostas 200 tambem vao para o cache compartilhado (`app.response_cache`):
+um acerto devolve o corpo e o ETag gravados sem nenhuma consulta ao banco.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, Max, Value
+from rest_framework import status
+from rest_framework.response import Response
+
+from .response_cache import count_stat, response_cache_key
+
+
+def table_version(models):
+    """Retorna uma string que muda sempre que alguma das tabelas muda.
+
+    Usa `UNION ALL` de um agregado por modelo para gastar um unico round trip.
+    Todos os modelos precisam ter o campo `updated_at`.
+    """
+    querysets = [
+        model._default_manager.order_by()
+        .annotate(table=Value(model._meta.label, output_field=CharField()))
+        .values('table')
+        .annotate(last=Max('updated_at'), total=Count('pk'))
+        .values_list('table', 'last', 'total')
+        for model in models
+    ]
+    if not querysets:
+        return ''
+    rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+    return '|'.join(
+        f"{table}:{last.isoformat() if last else '-'}:{total}"
+        for table, last, total in sorted(rows)
+    )
+
+
+class ConditionalGetMixin:
+    """Adiciona ETag forte em `list`/`retrieve` e responde 304 quando possivel.
+
+    Cada ViewSet declara em `etag_models` todos os modelos cujos dados aparecem
+    no payload (inclusive nomes derivados de relacoes). `cache_timeout` define
+    o TTL no cache de respostas (None: `RESPONSE_CACHE_TIMEOUT`; 0: desligado).
+    """
+
+    etag_models = ()
+    cache_timeout = None
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is None:
+            return settings.RESPONSE_CACHE_TIMEOUT
+        return self.cache_timeout
+
+    def get_etag(self, request):
+        """Combina rota, query string, formato negociado e versao das tabelas."""
+        raw = '\n'.join([
+            request.get_full_path(),
+            request.accepted_media_type or '',
+            table_version(self.etag_models),
+        ])
+        return '"%s"' % hashlib.sha256(raw.encode()).hexdigest()[:40]
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Executa `handler` apenas se o ETag do cliente estiver desatualizado.
+
+        Com o cache de respostas ativo, procura antes uma resposta gravada
+        para a mesma rota, formato e versao dos `etag_models`.
+        """
+        if_none_match = request.headers.get('If-None-Match', '')
+        client_etags = {tag.strip() for tag in if_none_match.split(',')}
+
+        timeout = self.get_cache_timeout()
+        cache_key = None
+        if timeout:
+            cache_key = response_cache_key(
+                [request.get_full_path(), request.accepted_media_type or ''], self.etag_models,
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                count_stat('hits')
+                etag, data = cached
+                return self.etag_response(etag, client_etags, lambda: Response(data))
+            count_stat('misses')
+
+        etag = self.get_etag(request)
+        response = self.etag_response(etag, client_etags, lambda: handler(request, *args, **kwargs))
+        if cache_key and response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, (etag, response.data), timeout)
+        return response
+
+    def etag_response(self, etag, client_etags, build):
+        """304 se o cliente ja tem `etag`; senao a resposta de `build` com os cabecalhos."""
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in client_etags or '*' in client_etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,163 @@
+"""Leituras em replicas do Postgres para os ViewSets de consulta dos quadros.
+
+Cada replica vira um alias em `DATABASES`, listado em `REPLICA_DATABASES`
+(`DB_REPLICAS`, ver `app.settings`). Escritas, e toda leitura nao roteada,
+vao para o primario (`default`). Os ViewSets com `ReplicaReadMixin` leem de
+uma replica em metodos seguros, exceto quando:
+
+- o usuario gravou algo nos ultimos `REPLICA_PIN_SECONDS`
+  (`ReplicaPinMiddleware`): ele le o que acabou de escrever;
+- algum modelo do cache de respostas mudou nos ultimos
+  `REPLICA_MAX_LAG_SECONDS` (`app.response_cache.changed_recently`): a
+  replica talvez ainda nao tenha a mudanca, e a resposta antiga iria para o
+  cache de respostas ou para o snapshot do quadro publico sob a versao nova;
+- nenhuma replica esta com atraso de ate `REPLICA_MAX_LAG_SECONDS` (medido
+  por processo a cada `REPLICA_LAG_CHECK_SECONDS`).
+
+Com as duas ultimas regras, a replica escolhida ja tem tudo o que foi
+comitado (a menos do intervalo entre as medicoes de atraso), o que tambem
+mantem valido o cursor do delta-sync de tarefas.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .response_cache import changed_recently
+
+PIN_KEY_PREFIX = 'db-router:pin'
+
+# Em replicas do Postgres: segundos desde a ultima transacao reaplicada (0 se
+# ja reaplicou tudo o que recebeu ou se o banco nao e uma replica).
+LAG_SQL = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery()"
+    " OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Alias de leitura da requisicao atual (None: primario). ContextVar e local
+# a thread, greenlet e tarefa asyncio.
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+# alias -> (instante da medicao, atraso em segundos ou None), por processo.
+_lag_checks = {}
+
+
+class ReplicaRouter:
+    """Leituras no alias escolhido para a requisicao; escritas no primario."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario e replicas tem os mesmos dados.
+        return True
+
+
+def replica_lag(alias):
+    """Atraso da replica em segundos; 0 fora do Postgres, None se ela nao responder."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        return None
+
+
+def healthy_replicas():
+    """Replicas com atraso de ate `REPLICA_MAX_LAG_SECONDS` (medicao reaproveitada por processo)."""
+    now = time.monotonic()
+    healthy = []
+    for alias in settings.REPLICA_DATABASES:
+        checked_at, lag = _lag_checks.get(alias, (None, None))
+        if checked_at is None or now - checked_at >= settings.REPLICA_LAG_CHECK_SECONDS:
+            lag = replica_lag(alias)
+            _lag_checks[alias] = (now, lag)
+        if lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS:
+            healthy.append(alias)
+    return healthy
+
+
+def pin_key(user):
+    return f'{PIN_KEY_PREFIX}:{user.pk}'
+
+
+def pin_to_primary(user):
+    """Manda as leituras de `user` ao primario pelos proximos `REPLICA_PIN_SECONDS`."""
+    cache.set(pin_key(user), True, settings.REPLICA_PIN_SECONDS)
+
+
+def read_database(user):
+    """Replica para uma leitura de `user`, ou None para ler do primario."""
+    if not settings.REPLICA_DATABASES:
+        return None
+    if user is not None and user.is_authenticated and cache.get(pin_key(user)):
+        return None
+    if changed_recently(settings.REPLICA_MAX_LAG_SECONDS):
+        return None
+    replicas = healthy_replicas()
+    return random.choice(replicas) if replicas else None
+
+
+class ReplicaReadMixin:
+    """Le de uma replica em GET/HEAD/OPTIONS (ver `read_database`).
+
+    A escolha acontece depois da autenticacao (o usuario do JWT e lido no
+    primario) e vale ate `finalize_response`. O que for avaliado depois,
+    como o streaming da exportacao, le do primario.
+    """
+
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            alias = read_database(request.user)
+            if alias is not None:
+                self._replica_token = _read_alias.set(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            _read_alias.reset(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaPinMiddleware:
+    """Apos uma escrita bem-sucedida, fixa o usuario no primario (read-your-writes).
+
+    Vale para qualquer rota (subtarefas, mover, importar...). O usuario do
+    JWT e o que o DRF deixou em `request.user`. Requisicoes assincronas
+    (somente leitura) passam direto.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.get_response(request)
+        response = self.get_response(request)
+        if settings.REPLICA_DATABASES and request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user)
+        return response
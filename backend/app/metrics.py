@@ -0,0 +1,253 @@
+"""Metricas por rota: consultas, tempo de banco, serializacao, renderizacao, total e tamanho.
+
+`RequestMetricsMiddleware` (em `app.middleware`) mede cada requisicao e chama
+`record`. `serialize_ms` e o tempo dentro de `serializing()` (serializers com
+`TimedSerializerMixin` e o caminho rapido de `tasks.fast_serializers`), sem as
+consultas feitas ali; `render_ms` e so a codificacao do renderer (JSON/CSV). As amostras ficam em histogramas de baldes fixos, acumulados na
+memoria do processo e somados no cache a cada `REQUEST_METRICS_FLUSH_SECONDS`
+(como os contadores de `app.response_cache`), para que `/api/internal/metrics/`
+mostre todos os workers. As chaves usam um hash da rota (sem espacos, aceitas
+pelo memcached); cada rota nova ganha uma posicao numerada no cache por
+`add`/`incr`, sem ler e regravar uma lista compartilhada.
+
+Orcamentos por rota em `REQUEST_BUDGETS`; ao estourar, registra um aviso ou,
+com `REQUEST_BUDGET_ACTION = 'raise'` (testes), levanta `BudgetExceeded` para
+o limite de consultas. Limites de tempo so geram aviso: variam com a maquina.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'request-metrics'
+ROUTE_COUNT_KEY = f'{KEY_PREFIX}:route-count'
+
+# Limites superiores dos baldes (o ultimo balde e "acima do maior limite").
+BUCKETS = {
+    'queries': (1, 2, 5, 10, 20, 50, 100),
+    'db_ms': (1, 5, 10, 25, 50, 100, 250, 1000),
+    'serialize_ms': (1, 5, 10, 25, 50, 100, 250, 1000),
+    'render_ms': (1, 5, 10, 25, 50, 100, 250, 1000),
+    'total_ms': (5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+    'bytes': (1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+}
+
+# Tempos sao somados em microssegundos (o `incr` do cache so aceita inteiros).
+SUM_SCALE = {'db_ms': 1000, 'serialize_ms': 1000, 'render_ms': 1000, 'total_ms': 1000}
+
+
+class BudgetExceeded(AssertionError):
+    """Requisicao acima do orcamento de consultas da rota."""
+
+
+class SerializeClock:
+    """Tempo de serializacao de uma requisicao, sem o tempo de banco de `query_timer`."""
+
+    def __init__(self, query_timer):
+        self.query_timer = query_timer
+        self.seconds = 0.0
+        self.depth = 0
+
+
+# Relogio da requisicao em andamento (definido pelo middleware); None fora dela.
+serialize_clock = ContextVar('request_metrics_serialize_clock', default=None)
+
+
+@contextmanager
+def serializing():
+    """Conta o trecho como serializacao da requisicao atual (trechos aninhados contam uma vez)."""
+    clock = serialize_clock.get()
+    if clock is None or clock.depth:
+        yield
+        return
+    clock.depth += 1
+    start, db_start = time.perf_counter(), clock.query_timer.seconds
+    try:
+        yield
+    finally:
+        clock.depth -= 1
+        clock.seconds += time.perf_counter() - start - (clock.query_timer.seconds - db_start)
+
+
+class TimedSerializerMixin:
+    """Serializer cujo `to_representation` entra em `serialize_ms`."""
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+
+def _route_id(route):
+    return hashlib.sha256(route.encode()).hexdigest()[:16]
+
+
+def _key(route, metric, field):
+    return f'{KEY_PREFIX}:{_route_id(route)}:{metric}:{field}'
+
+
+def _slot_key(slot):
+    return f'{KEY_PREFIX}:route:{slot}'
+
+
+def register_routes(routes):
+    """Numera as rotas ainda desconhecidas no cache (cada uma uma unica vez)."""
+    markers = {_key(route, 'route', 'registered'): route for route in routes}
+    for marker in markers.keys() - cache.get_many(list(markers)).keys():
+        # `add` e atomico: so um worker numera a rota.
+        if not cache.add(marker, True, timeout=None):
+            continue
+        cache.add(ROUTE_COUNT_KEY, 0, timeout=None)
+        cache.set(_slot_key(cache.incr(ROUTE_COUNT_KEY)), markers[marker], timeout=None)
+
+
+def known_routes():
+    count = cache.get(ROUTE_COUNT_KEY, 0)
+    return sorted(set(cache.get_many([_slot_key(slot) for slot in range(1, count + 1)]).values()))
+
+
+class MetricsRegistry:
+    """Histogramas do processo, enviados ao cache periodicamente."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.routes = set()
+        self.last_flush = time.monotonic()
+
+    def record(self, route, sample):
+        with self.lock:
+            self.routes.add(route)
+            self.pending[_key(route, 'requests', 'count')] += 1
+            for metric, value in sample.items():
+                if value is None:
+                    continue
+                self.pending[_key(route, metric, 'sum')] += round(value * SUM_SCALE.get(metric, 1))
+                self.pending[_key(route, metric, bisect_left(BUCKETS[metric], value))] += 1
+            due = time.monotonic() - self.last_flush >= settings.REQUEST_METRICS_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            pending, routes = self.pending, self.routes
+            self.pending, self.routes = Counter(), set()
+            self.last_flush = time.monotonic()
+        if not pending:
+            return
+        register_routes(routes)
+        for key, amount in pending.items():
+            if not cache.add(key, amount, timeout=None):
+                try:
+                    cache.incr(key, amount)
+                except ValueError:
+                    cache.set(key, amount, timeout=None)
+
+
+registry = MetricsRegistry()
+
+
+def record(route, sample):
+    registry.record(route, sample)
+
+
+def budget_for(route):
+    """Orcamento da rota (`'GET task-list'`, depois `'task-list'`), ou o padrao `'*'`."""
+    budgets = settings.REQUEST_BUDGETS
+    name = route.split(' ', 1)[-1]
+    return budgets.get(route) or budgets.get(name) or budgets.get('*') or {}
+
+
+def check_budget(route, sample):
+    """Compara a amostra com o orcamento; avisa ou levanta `BudgetExceeded`."""
+    exceeded = {
+        metric: (sample[metric], limit)
+        for metric, limit in budget_for(route).items()
+        if sample.get(metric) is not None and sample[metric] > limit
+    }
+    if not exceeded:
+        return
+    details = ', '.join(f'{metric}={value:g} (limite {limit:g})' for metric, (value, limit) in exceeded.items())
+    if 'queries' in exceeded and settings.REQUEST_BUDGET_ACTION == 'raise':
+        raise BudgetExceeded(f'{route}: {details}')
+    logger.warning('Orcamento excedido em %s: %s', route, details)
+
+
+def _percentile(buckets, counts, total, p):
+    """Limite superior do balde onde cai o percentil `p` (None: acima do maior limite)."""
+    target = total * p / 100
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= target and count:
+            return buckets[index] if index < len(buckets) else None
+    return None
+
+
+def summary():
+    """Histogramas somados de todos os workers, por rota."""
+    registry.flush()
+    routes = known_routes()
+    keys = [_key(route, 'requests', 'count') for route in routes]
+    for route in routes:
+        for metric, buckets in BUCKETS.items():
+            keys.append(_key(route, metric, 'sum'))
+            keys += [_key(route, metric, index) for index in range(len(buckets) + 1)]
+    values = cache.get_many(keys)
+
+    data = {}
+    for route in routes:
+        total = values.get(_key(route, 'requests', 'count'), 0)
+        if not total:
+            continue
+        item = {'requests': total}
+        for metric, buckets in BUCKETS.items():
+            counts = [values.get(_key(route, metric, index), 0) for index in range(len(buckets) + 1)]
+            samples = sum(counts)
+            if not samples:
+                continue
+            mean = values.get(_key(route, metric, 'sum'), 0) / SUM_SCALE.get(metric, 1) / samples
+            item[metric] = {
+                'mean': round(mean, 2),
+                'p50': _percentile(buckets, counts, samples, 50),
+                'p95': _percentile(buckets, counts, samples, 95),
+                'buckets': dict(zip([*map(str, buckets), '+Inf'], counts)),
+            }
+        item['budget'] = budget_for(route)
+        data[route] = item
+    return data
+
+
+def reset():
+    registry.flush()
+    count = cache.get(ROUTE_COUNT_KEY, 0)
+    routes = known_routes()
+    keys = [ROUTE_COUNT_KEY, *(_slot_key(slot) for slot in range(1, count + 1))]
+    for route in routes:
+        keys += [_key(route, 'route', 'registered'), _key(route, 'requests', 'count')]
+        for metric, buckets in BUCKETS.items():
+            keys.append(_key(route, metric, 'sum'))
+            keys += [_key(route, metric, index) for index in range(len(buckets) + 1)]
+    cache.delete_many(keys)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """GET: histogramas por rota (`'METODO nome-da-url'`); DELETE: zera as metricas."""
+    if request.method == 'DELETE':
+        reset()
+        return Response(status=204)
+    return Response({'routes': summary()})
@@ -0,0 +1,93 @@
+"""Middlewares do projeto."""
+
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+
+class QueryTimer:
+    """`execute_wrapper` que conta as consultas e soma o tempo gasto no banco."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """Mede consultas, tempo de banco, serializacao, renderizacao, tempo total e tamanho por rota.
+
+    Responde com `Server-Timing` e envia a amostra para `app.metrics`
+    (histogramas e orcamentos). Requisicoes assincronas (stream SSE) passam
+    direto: as consultas rodam em outras threads e a duracao e a da conexao.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.get_response(request)
+        if not settings.REQUEST_METRICS:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        clock = metrics.SerializeClock(timer)
+        token = metrics.serialize_clock.set(clock)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            metrics.serialize_clock.reset(token)
+        total = time.perf_counter() - start
+
+        render_start = getattr(request, '_metrics_render_start', None)
+        sample = {
+            'queries': timer.count,
+            'db_ms': timer.seconds * 1000,
+            'serialize_ms': clock.seconds * 1000,
+            'render_ms': (time.perf_counter() - render_start) * 1000 if render_start else None,
+            'total_ms': total * 1000,
+            'bytes': None if response.streaming else len(response.content),
+        }
+        timings = [
+            f'db;dur={sample["db_ms"]:.1f};desc="{timer.count} queries"',
+            f'serialize;dur={sample["serialize_ms"]:.1f}',
+        ]
+        if sample['render_ms'] is not None:
+            timings.append(f'render;dur={sample["render_ms"]:.1f};desc="renderer"')
+        timings.append(f'total;dur={sample["total_ms"]:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        match = getattr(request, 'resolver_match', None)
+        route = f'{request.method} {match.view_name if match else "unresolved"}'
+        metrics.record(route, sample)
+        metrics.check_budget(route, sample)
+        return response
+
+    def process_template_response(self, request, response):
+        # Chamado logo antes de `response.render()` (respostas do DRF): `render_ms`
+        # mede so o renderer; os serializers rodaram antes, dentro da view.
+        request._metrics_render_start = time.perf_counter()
+        return response
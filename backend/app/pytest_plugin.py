@@ -0,0 +1,89 @@
+"""Plugin pytest do backend: limites de consultas e deteccao de N+1.
+
+Registrado em `conftest.py` (`pytest_plugins`). Oferece:
+
+- `@pytest.mark.max_queries(n)`: falha se o corpo do teste (sem as fixtures)
+  fizer mais de `n` consultas;
+- `assert_constant_queries`: faz o mesmo GET com duas quantidades de linhas
+  e falha se o numero de consultas crescer junto (N+1);
+- `request_budgets` (autouse): cada requisicao acima do orcamento de
+  consultas da rota (`REQUEST_BUDGETS`) levanta `BudgetExceeded`.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test.utils import CaptureQueriesContext
+
+# Quantidades de linhas comparadas por `assert_constant_queries` (abaixo do tamanho de pagina).
+N_PLUS_ONE_SIZES = (2, 12)
+
+
+def format_queries(queries, limit=20):
+    lines = [f"{index}. {query['sql'][:300]}" for index, query in enumerate(queries[:limit], start=1)]
+    if len(queries) > limit:
+        lines.append(f"... e mais {len(queries) - limit}")
+    return '\n'.join(lines)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'max_queries(n, using="default"): falha se o teste fizer mais de n consultas',
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker('max_queries')
+    if marker is None:
+        return (yield)
+    limit = marker.args[0]
+    with CaptureQueriesContext(connections[marker.kwargs.get('using', DEFAULT_DB_ALIAS)]) as context:
+        result = yield
+    if len(context) > limit:
+        pytest.fail(
+            f"{len(context)} consultas (limite {limit}):\n{format_queries(context.captured_queries)}",
+            pytrace=False,
+        )
+    return result
+
+
+@pytest.fixture(autouse=True)
+def request_budgets(settings):
+    """Falha o teste quando uma requisicao passa do orcamento de consultas da rota."""
+    settings.REQUEST_BUDGET_ACTION = "raise"
+
+
+@pytest.fixture
+def assert_constant_queries():
+    """Detecta N+1 numa listagem: `check(client, url, grow, params=None)`.
+
+    `grow(indices)` cria as linhas de cada indice (com as relacoes que o
+    payload mostra). O GET roda apos `N_PLUS_ONE_SIZES[0]` e apos
+    `N_PLUS_ONE_SIZES[1]` linhas criadas, com o cache limpo (respostas e
+    snapshots); as contagens de consultas precisam ser iguais. Retorna a
+    ultima resposta.
+    """
+    created = {}
+
+    def check(client, url, grow, params=None):
+        # Chamadas repetidas com o mesmo `grow` continuam a numeracao dos indices.
+        counts, response = [], None
+        start = created.get(grow, 0)
+        for size in N_PLUS_ONE_SIZES:
+            grow(range(created.get(grow, 0), start + size))
+            created[grow] = start + size
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, params)
+            assert response.status_code == 200, response.content[:500]
+            counts.append(len(context))
+        if len(set(counts)) > 1:
+            pytest.fail(
+                f"N+1 em {url}: {counts} consultas para {list(N_PLUS_ONE_SIZES)} linhas\n"
+                f"{format_queries(context.captured_queries)}",
+                pytrace=False,
+            )
+        return response
+
+    return check
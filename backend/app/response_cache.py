@@ -0,0 +1,99 @@
+"""Cache compartilhado de respostas de leitura da API.
+
+As chaves incluem a "versao" de cada modelo que compoe a resposta. As versoes
+ficam no proprio cache (Redis em producao, memoria local em dev/testes) e sao
+incrementadas pelos receivers de sinais quando um modelo muda, entao nenhuma
+entrada precisa ser apagada: as antigas deixam de ser lidas e expiram pelo TTL.
+O instante da ultima mudanca tambem fica no cache (`changed_recently`, usado
+pelo roteamento de leituras para replicas em `app.db_routers`).
+
+Contadores de acerto/falha/invalidacao ficam no cache para somar todos os
+workers (ver `cache_stats`).
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'response-cache'
+STATS = ('hits', 'misses', 'invalidations')
+CHANGED_AT_KEY = f'{KEY_PREFIX}:changed-at'
+
+
+def _version_key(model):
+    return f'{KEY_PREFIX}:version:{model._meta.label_lower}'
+
+
+def model_versions(models):
+    """Versoes atuais dos modelos, numa unica ida ao cache.
+
+    Versao ausente (primeiro uso ou despejo) recebe um valor novo baseado no
+    relogio, para nunca reaproveitar uma chave gravada antes do despejo.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*models):
+    """Invalida as respostas que dependem de `models`."""
+    for model in models:
+        key = _version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+    cache.set(CHANGED_AT_KEY, time.time(), timeout=None)
+    count_stat('invalidations', len(models))
+
+
+def changed_recently(seconds):
+    """True se algum modelo do cache mudou nos ultimos `seconds` segundos (em qualquer worker)."""
+    changed_at = cache.get(CHANGED_AT_KEY)
+    return changed_at is not None and time.time() - changed_at < seconds
+
+
+def response_cache_key(parts, models):
+    """Chave de uma resposta: partes da requisicao + versoes dos modelos."""
+    raw = '\n'.join([*parts, *map(str, model_versions(models))])
+    return f'{KEY_PREFIX}:entry:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+
+def count_stat(name, amount=1):
+    if not settings.RESPONSE_CACHE_STATS:
+        return
+    key = f'{KEY_PREFIX}:stats:{name}'
+    if not cache.add(key, amount, timeout=None):
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, timeout=None)
+
+
+def cache_stats():
+    """Contadores acumulados e, no Redis, as chaves despejadas por memoria."""
+    values = cache.get_many([f'{KEY_PREFIX}:stats:{name}' for name in STATS])
+    stats = {name: values.get(f'{KEY_PREFIX}:stats:{name}', 0) for name in STATS}
+    stats['evictions'] = _redis_evictions()
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([f'{KEY_PREFIX}:stats:{name}' for name in STATS])
+
+
+def _redis_evictions():
+    # Backends sem estatistica de despejo (memoria local) retornam None.
+    get_client = getattr(getattr(cache, '_cache', None), 'get_client', None)
+    if get_client is None:
+        return None
+    try:
+        return get_client(None).info('stats').get('evicted_keys')
+    except Exception:
+        return None
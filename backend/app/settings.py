@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     'collaborators',
     'departments',
     'tasks',
+    'realtime',
 ]
 
 
@@ -70,6 +71,7 @@ CORS_ALLOW_CREDENTIALS = True
 
 
 MIDDLEWARE = [
+    'app.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -79,6 +81,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'app.db_routers.ReplicaPinMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -103,6 +106,20 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 # Banco de dados:
 # Em DEBUG usa SQLite local; fora dele, espera Postgres por variaveis de ambiente.
+#
+# DB_POOL=True liga o pool nativo do psycopg 3 (Django 5.1+): cada processo
+# mantem entre DB_POOL_MIN_SIZE e DB_POOL_MAX_SIZE conexoes, emprestadas por
+# requisicao e devolvidas ao final (CONN_MAX_AGE fica em 0). Com 4 workers
+# gevent, o Postgres ve no maximo 4 x DB_POOL_MAX_SIZE conexoes; um greenlet
+# sem conexao livre espera DB_POOL_TIMEOUT segundos e falha com erro de banco.
+# Sem o pool, cada greenlet abre a sua conexao persistente (DB_CONN_MAX_AGE).
+#
+# DB_PGBOUNCER=True para o modo transacao do pgbouncer: sem cursores do
+# servidor (a exportacao passa a ler em lotes por id, ver `tasks.export`).
+# Prepared statements ja vem desligados pelo Django no psycopg 3.
+
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "False") == "True"
 
 if DEBUG:
     DATABASES = {
@@ -112,6 +129,15 @@ if DEBUG:
         }
     }
 else:
+    db_options = {}
+    if DB_POOL:
+        db_options['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '600')),
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),
+        }
     DATABASES = {
             'default': {
                 'ENGINE': 'django.db.backends.postgresql',
@@ -120,11 +146,43 @@ else:
                 'PASSWORD': os.getenv('DB_PASSWORD', ''),
                 'HOST': os.getenv('DB_HOST', 'db'),
                 'PORT': os.getenv('DB_PORT', '5432'),
-                'CONN_MAX_AGE': 600,
+                'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '600')),
+                # Com o pool, liga o `check` do psycopg_pool ao emprestar a conexao.
+                'CONN_HEALTH_CHECKS': os.getenv('DB_HEALTH_CHECKS', 'True') == 'True',
+                'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+                'OPTIONS': db_options,
             }
         }
 
 
+# Replicas de leitura (ver `app.db_routers`): DB_REPLICAS lista os hosts das
+# replicas do Postgres (`host` ou `host:porta`, mesmas credenciais) ou, em
+# DEBUG, arquivos SQLite em BASE_DIR para testar o roteamento localmente
+# (`cp db.sqlite3 db-replica.sqlite3`: uma replica parada no tempo). Cada uma
+# vira o alias `replica_N`.
+REPLICA_DATABASES = []
+for index, target in enumerate([r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()], start=1):
+    replica = {**DATABASES['default'], 'OPTIONS': {**DATABASES['default'].get('OPTIONS', {})}}
+    if DEBUG:
+        replica['NAME'] = BASE_DIR / target
+    else:
+        host, _, port = target.partition(':')
+        replica.update(HOST=host, PORT=port or replica['PORT'], TEST={'MIRROR': 'default'})
+    DATABASES[f'replica_{index}'] = replica
+    REPLICA_DATABASES.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['app.db_routers.ReplicaRouter']
+
+# Segundos em que um usuario le do primario depois de gravar algo.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+# Atraso maximo aceito numa replica; tambem e o tempo, apos qualquer mudanca,
+# em que todas as leituras ficam no primario. Mantenha abaixo da margem do
+# cursor do delta-sync (`tasks.views.DELTA_CURSOR_SAFETY_MARGIN`).
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "1"))
+# Intervalo (s) entre as medicoes de atraso de cada replica, por processo.
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+
+
 # Regras de tokens JWT (duracao e formato do header).
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
@@ -152,9 +210,79 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "20/minute", "user": "100/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "20/minute",
+        "user": "100/minute",
+        # Quadro publico (modo TV): servido do cache, aguenta varias TVs atras do mesmo NAT.
+        "tasks_public": "120/minute",
+    },
 }
 
+# Maximo aceito em `?page_size=` na listagem de tarefas (paginacao keyset).
+TASK_MAX_PAGE_SIZE = int(os.getenv("TASK_MAX_PAGE_SIZE", "500"))
+
+# Dias de retencao dos registros de exclusao do delta-sync (`prune_task_tombstones`);
+# cursores `?since=` mais antigos recebem 410 e precisam sincronizar do zero.
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Cache compartilhado: Redis quando REDIS_URL estiver definido; senao, memoria
+# local do processo (suficiente para dev/testes com um unico processo).
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+# Tempo maximo (s) do snapshot do quadro publico; os sinais o invalidam antes disso.
+PUBLIC_BOARD_CACHE_TIMEOUT = 300
+
+# Cache de respostas de leitura (ver `app.response_cache`): TTL padrao em
+# segundos (0 desliga) e contadores de acerto/falha.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "60"))
+RESPONSE_CACHE_STATS = True
+
+# Metricas por rota (`app.middleware.RequestMetricsMiddleware`, ver `app.metrics`):
+# intervalo (s) de envio dos histogramas ao cache.
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "True") == "True"
+REQUEST_METRICS_FLUSH_SECONDS = int(os.getenv("REQUEST_METRICS_FLUSH_SECONDS", "10"))
+
+# Orcamento por rota ('METODO nome-da-url', 'nome-da-url' ou '*'):
+# queries, db_ms, serialize_ms, render_ms, total_ms e bytes. 'log' registra um aviso;
+# 'raise' levanta `BudgetExceeded` quando o limite de consultas estoura.
+REQUEST_BUDGETS = {
+    '*': {'queries': 40, 'total_ms': 2000},
+    'GET task-list': {'queries': 6, 'total_ms': 500},
+    'GET task-detail': {'queries': 6},
+    'GET task-board': {'queries': 6, 'total_ms': 500},
+    'GET task-stats': {'queries': 12},
+    'GET task-public-list': {'queries': 4},
+    'GET projects-list': {'queries': 6},
+    'GET collaborator-list': {'queries': 4},
+    'GET department-list': {'queries': 6},
+}
+REQUEST_BUDGET_ACTION = os.getenv("REQUEST_BUDGET_ACTION", "log")
+
+# Push de eventos do quadro (SSE em /api/v1/events/, servido pelo ASGI).
+# Com REDIS_URL definido, usa Redis Pub/Sub para alcancar todos os processos;
+# sem ele, o broker em memoria atende apenas o proprio processo (dev/testes).
+if REDIS_URL:
+    REALTIME_BROKER = {
+        "BACKEND": "realtime.broker.RedisBroker",
+        "OPTIONS": {"url": REDIS_URL},
+    }
+else:
+    REALTIME_BROKER = {"BACKEND": "realtime.broker.InMemoryBroker"}
+REALTIME_HEARTBEAT_SECONDS = 15
+# Validade (s) do ticket de uso unico que abre o stream (`POST /api/v1/events/ticket/`).
+REALTIME_TICKET_SECONDS = 30
+
 # Configuracoes de seguranca para producao
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 if not DEBUG:
@@ -0,0 +1,109 @@
+"""Campos esparsos (`?fields=` / `?omit=`) e expansao (`?expand=`) nas respostas da API.
+
+- `?fields=id,title` devolve so esses campos; `?omit=description` remove campos.
+- `?expand=project` troca o id pelo objeto aninhado (campos de
+  `Meta.expandable_fields` de cada serializer).
+
+Vale para leituras (GET/HEAD); gravacoes validam e respondem com todos os
+campos. Nos ViewSets, `SparseQuerysetMixin` remonta `select_related`/
+`prefetch_related` so com as relacoes que os campos pedidos usam.
+"""
+
+from django.utils.module_loading import import_string
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def parse_names(value):
+    """`'a, b'` -> `{'a', 'b'}`; None quando o parametro nao veio."""
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def sparse_params(request):
+    """`(fields, omit, expand)` da query string; `fields` None significa todos."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set(), set()
+    params = request.query_params
+    return parse_names(params.get('fields')), parse_names(params.get('omit')) or set(), parse_names(params.get('expand')) or set()
+
+
+def kept_fields(names, fields=None, omit=()):
+    """Nomes de `names` (na mesma ordem) que sobram apos `fields`/`omit`."""
+    return [name for name in names if (fields is None or name in fields) and name not in omit]
+
+
+class SparseFieldsMixin:
+    """Serializer com `?fields=`, `?omit=` e `?expand=`.
+
+    Os mesmos ajustes podem vir como argumentos (`fields=`, `omit=`, `expand=`),
+    usados pelos serializers aninhados. `Meta.expandable_fields` mapeia o
+    campo para `(caminho do serializer, kwargs)`; o import e tardio para
+    evitar ciclos entre os apps.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None and omit is None and expand is None:
+            # Apenas o serializer raiz le a query string.
+            fields, omit, expand = sparse_params(self.context.get('request'))
+        self.apply_sparse_fields(fields, set(omit or ()), set(expand or ()))
+
+    def apply_sparse_fields(self, fields, omit, expand):
+        if fields is None and not omit and not expand:
+            return
+        for name in set(self.fields) - set(kept_fields(self.fields, fields, omit)):
+            self.fields.pop(name)
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in expand & set(expandable) & set(self.fields):
+            path, options = expandable[name]
+            self.fields[name] = import_string(path)(read_only=True, **options)
+
+
+class SparseQuerysetMixin:
+    """ViewSet que corta relacoes nao usadas quando ha `?fields=`, `?omit=` ou `?expand=`.
+
+    `select_related_fields`/`prefetch_related_fields` mapeiam cada relacao
+    para os campos do serializer que a usam; a relacao tambem entra quando o
+    proprio nome e expandido. Sem esses parametros o queryset fica intacto.
+    """
+
+    select_related_fields = {}
+    prefetch_related_fields = {}
+
+    def get_sparse_fields(self):
+        """Campos do serializer que serao devolvidos, ou None (todos)."""
+        fields, omit, _ = sparse_params(self.request)
+        if fields is None and not omit:
+            return None
+        return set(kept_fields(self.get_serializer_class().Meta.fields, fields, omit))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, omit, expand = sparse_params(self.request)
+        if fields is None and not omit and not expand:
+            return queryset
+        kept = set(kept_fields(self.get_serializer_class().Meta.fields, fields, omit))
+
+        def needed(mapping):
+            return [
+                lookup for lookup, names in mapping.items()
+                if (lookup in expand and lookup in kept) or kept & set(names)
+            ]
+
+        # Reaproveita os `Prefetch` (ordem/anotacoes) declarados no queryset.
+        declared = {getattr(lookup, 'prefetch_to', lookup): lookup for lookup in queryset._prefetch_related_lookups}
+        queryset = queryset.select_related(None).prefetch_related(None)
+        select = needed(self.select_related_fields)
+        prefetch = [declared.get(lookup, lookup) for lookup in needed(self.prefetch_related_fields)]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+def nested(path, many=False, **options):
+    """Entrada de `Meta.expandable_fields`: serializer aninhado com `options`."""
+    return path, {'many': many, **options}
@@ -9,6 +9,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .metrics import metrics_view
+
 
 def health_check(request):
     return JsonResponse({"status": "ok"})
@@ -17,6 +19,7 @@ def health_check(request):
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/health/', health_check, name='health_check'),
+    path('api/internal/metrics/', metrics_view, name='request_metrics'),
 
     # Endpoints de autenticacao (JWT, usuario atual, logout).
     path('api/', include('authentication.urls')),
@@ -26,6 +29,7 @@ urlpatterns = [
     path('api/v1/', include('collaborators.urls')),
     path('api/v1/', include('departments.urls')),
     path('api/v1/', include('tasks.urls')),
+    path('api/v1/', include('realtime.urls')),
 ]
 
 # Serve uploads quando SERVE_MEDIA=True (desenvolvimento/VPS sem Nginx).
@@ -4,10 +4,12 @@ Expoem nomes derivados e contagens uteis para reduzir logica no frontend.
 """
 
 from rest_framework import serializers
+from app.metrics import TimedSerializerMixin
+from app.sparse_fields import SparseFieldsMixin, nested
 from .models import Collaborator
 
 
-class CollaboratorSerializer(serializers.ModelSerializer):
+class CollaboratorSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializa `Collaborator` com campos derivados para a UI."""
     department_name = serializers.CharField(source='department.name', read_only=True)
 
@@ -20,3 +22,6 @@ class CollaboratorSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = {
+            'department': nested('departments.serializers.DepartmentSerializer', fields={'id', 'name', 'department_type'}),
+        }
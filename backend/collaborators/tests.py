@@ -23,6 +23,14 @@ class TestCollaboratorAPI:
         res = anon_client.get(self.url)
         assert res.status_code == 401
 
+    def test_list_without_n_plus_one(self, admin_client, department, assert_constant_queries):
+        def grow(indices):
+            for index in indices:
+                Collaborator.objects.create(name=f"Pessoa {index}", email=f"p{index}@test.com", department=department)
+
+        assert_constant_queries(admin_client, self.url, grow)
+        assert_constant_queries(admin_client, self.url, grow, {"expand": "department"})
+
     # ---- Filter
     def test_filter_active(self, admin_client, collaborator):
         res = admin_client.get(self.url, {"is_active": "true"})
@@ -2,16 +2,22 @@
 
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from app.conditional import ConditionalGetMixin
+from app.db_routers import ReplicaReadMixin
+from app.sparse_fields import SparseQuerysetMixin
+from departments.models import Department
 from .models import Collaborator
 from .serializers import CollaboratorSerializer
 
 
-class CollaboratorViewSet(viewsets.ModelViewSet):
+class CollaboratorViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD de colaboradores com otimizacoes e filtro por ativo/inativo."""
 
     queryset = Collaborator.objects.select_related('department')
     serializer_class = CollaboratorSerializer
     permission_classes = [IsAuthenticated]
+    etag_models = (Collaborator, Department)
+    select_related_fields = {'department': ('department_name',)}
 
     def get_queryset(self):
         """Aplica filtro opcional `?is_active=true|false` na listagem."""
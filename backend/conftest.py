@@ -2,6 +2,7 @@
 
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from departments.models import Department
@@ -9,6 +10,31 @@ from collaborators.models import Collaborator
 from projectsmanager.models import Project
 from tasks.models import Task
 
+# `max_queries`, `assert_constant_queries` e orcamentos de consultas por rota.
+pytest_plugins = ["app.pytest_plugin"]
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """Banco `replica` separado (nao espelho) para os testes de `app.db_routers`.
+
+    So e criado nos testes que o pedem (`django_db(databases=[..., "replica"])`);
+    como nao recebe as gravacoes do `default`, mostra de onde cada leitura veio.
+    As tabelas saem direto dos modelos (sem migrations, cujos RunPython leem
+    do `default`).
+    """
+    from django.conf import settings
+    default = settings.DATABASES["default"]
+    settings.DATABASES.setdefault("replica", {**default, "TEST": {**default.get("TEST", {}), "MIRROR": None, "MIGRATE": False}})
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Isola cada teste de snapshots e contadores de throttle em cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
 
 @pytest.fixture
 def admin_user(db):
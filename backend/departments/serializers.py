@@ -4,10 +4,12 @@ Expoem setores com contagem derivada de colaboradores ativos.
 """
 
 from rest_framework import serializers
+from app.metrics import TimedSerializerMixin
+from app.sparse_fields import SparseFieldsMixin, nested
 from .models import Department
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializa `Department` e adiciona campos calculados para a UI."""
 
     collaborators_count = serializers.SerializerMethodField()
@@ -21,6 +23,9 @@ class DepartmentSerializer(serializers.ModelSerializer):
             'collaborators_count', 'subdepartments', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = {
+            'parent_department': nested('departments.serializers.DepartmentSerializer', fields={'id', 'name'}),
+        }
 
     def get_collaborators_count(self, obj):
         """Conta apenas colaboradores ativos relacionados ao setor (via anotacao do ViewSet)."""
@@ -31,13 +36,15 @@ class DepartmentSerializer(serializers.ModelSerializer):
         if obj.department_type != Department.TYPE_MAIN:
             return []
 
-        children = obj.subdepartments.all().order_by("name")
+        # Ordem e contagem vem do `Prefetch` do ViewSet; `.order_by()` aqui
+        # ignoraria o prefetch e faria uma consulta por setor.
         return [
             {
                 "id": child.id,
                 "name": child.name,
                 "description": child.description or "",
                 "is_active": child.is_active,
+                "collaborators_count": self.get_collaborators_count(child),
             }
-            for child in children
+            for child in obj.subdepartments.all()
         ]
@@ -1,6 +1,7 @@
 """Testes de API para o app departments."""
 
 import pytest
+from collaborators.models import Collaborator
 from departments.models import Department
 
 
@@ -61,3 +62,35 @@ class TestDepartmentAPI:
         })
         assert res.status_code == 201
         assert res.data["parent_department"] == department.id
+
+    # ---- ETag
+    def test_collaborator_change_invalidates_etag(self, admin_client, department, collaborator):
+        etag = admin_client.get(self.url)["ETag"]
+        assert admin_client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        collaborator.delete()
+        res = admin_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200
+        assert res.data["results"][0]["collaborators_count"] == 0
+
+    def test_tree_query_count_is_constant(self, admin_client, assert_constant_queries):
+        """Subsetores ordenados e contagens vem de consultas fixas, nao uma por setor."""
+        def grow(indices):
+            for index in indices:
+                main = Department.objects.create(name=f"Setor {index:02}", department_type="main")
+                Department.objects.create(name=f"Z {index}", department_type="sub", parent_department=main)
+                Department.objects.create(name=f"A {index}", department_type="sub", parent_department=main)
+                Collaborator.objects.create(name=f"P {index}", email=f"p{index}@test.com", department=main)
+
+        res = assert_constant_queries(admin_client, self.url, grow, {"page_size": 100})
+        main = next(item for item in res.data["results"] if item["name"] == "Setor 00")
+        assert [child["name"] for child in main["subdepartments"]] == ["A 0", "Z 0"]
+        assert main["collaborators_count"] == 1
+        assert_constant_queries(admin_client, self.url, grow, {"expand": "parent_department"})
+
+    def test_subdepartments_with_active_collaborators_count(self, admin_client, department):
+        sub = Department.objects.create(name="Sub", department_type="sub", parent_department=department)
+        Collaborator.objects.create(name="Ativo", email="ativo@example.com", department=sub)
+        Collaborator.objects.create(name="Inativo", email="inativo@example.com", department=sub, is_active=False)
+        res = admin_client.get(self.url, {"fields": "id,subdepartments"})
+        main = next(item for item in res.data["results"] if item["id"] == department.id)
+        assert main["subdepartments"][0]["collaborators_count"] == 1
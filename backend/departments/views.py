@@ -1,24 +1,42 @@
 """Views do app departments."""
 
-from django.db.models import Count, Q
+from django.db.models import Count, Prefetch, Q
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from app.conditional import ConditionalGetMixin
+from app.db_routers import ReplicaReadMixin
+from app.sparse_fields import SparseQuerysetMixin
+from collaborators.models import Collaborator
 from .models import Department
 from .serializers import DepartmentSerializer
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
-    """CRUD de setores com filtro simples por ativo/inativo."""
+def with_active_collaborators_count(queryset):
+    """Anota `_active_collaborators_count` (lido por `DepartmentSerializer`)."""
+    return queryset.annotate(_active_collaborators_count=Count(
+        'collaborators', filter=Q(collaborators__is_active=True)
+    ))
 
-    queryset = (
-        Department.objects
-        .prefetch_related('collaborators', 'subdepartments')
-        .annotate(_active_collaborators_count=Count(
-            'collaborators', filter=Q(collaborators__is_active=True)
+
+class DepartmentViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    """CRUD de setores com filtro simples por ativo/inativo.
+
+    A arvore (setor -> subsetores ordenados, com contagem de ativos) sai em
+    numero fixo de consultas: a contagem e anotada e os subsetores vem de um
+    `Prefetch` ja ordenado e anotado.
+    """
+
+    queryset = with_active_collaborators_count(
+        Department.objects.prefetch_related(Prefetch(
+            'subdepartments',
+            queryset=with_active_collaborators_count(Department.objects.order_by('name', 'pk')),
         ))
     )
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated]
+    etag_models = (Department, Collaborator)
+    select_related_fields = {'parent_department': ()}
+    prefetch_related_fields = {'subdepartments': ('subdepartments',)}
 
     def get_queryset(self):
         """Aplica filtro opcional `?is_active=true|false` na listagem."""
@@ -1,4 +1,12 @@
-"""Configuracao do Gunicorn para producao."""
+"""Configuracao do Gunicorn para producao.
+
+Sem `post_fork`/psycogreen: o psycogreen so troca o wait callback do psycopg2.
+O psycopg 3 (>= 3.1) detecta o monkey patch do gevent e troca sozinho as
+funcoes de espera, entao aguarda o banco sem bloquear os demais greenlets. Com DB_POOL=True, os
+`worker_connections` greenlets de cada worker dividem as conexoes do pool do
+processo (ver DATABASES em `app.settings`). O servico ASGI usa o mesmo arquivo
+com `-k uvicorn_worker.UvicornWorker` (SSE e `/api/v1/async/`).
+"""
 
 bind = "0.0.0.0:8000"
 workers = 4
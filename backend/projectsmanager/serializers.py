@@ -1,9 +1,11 @@
 """Serializers do app projectsmanager."""
 
 from rest_framework import serializers
+from app.metrics import TimedSerializerMixin
+from app.sparse_fields import SparseFieldsMixin, nested
 from .models import Project
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializa `Project` e expoe nomes legiveis de relacoes M2M."""
     responsible_collaborators_names = serializers.SerializerMethodField()
     used_by_departments_names = serializers.SerializerMethodField()
@@ -22,6 +24,12 @@ class ProjectSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at',
             'responsible_collaborators_names', 'used_by_departments_names',
         )
+        expandable_fields = {
+            'responsible_collaborators': nested(
+                'collaborators.serializers.CollaboratorSerializer', many=True, fields={'id', 'name', 'email'},
+            ),
+            'used_by_departments': nested('departments.serializers.DepartmentSerializer', many=True, fields={'id', 'name'}),
+        }
 
     def get_responsible_collaborators_names(self, obj):
         """Retorna apenas os nomes para facilitar renderizacao no cliente."""
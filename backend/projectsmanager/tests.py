@@ -23,6 +23,17 @@ class TestProjectAPI:
         res = anon_client.get(self.url)
         assert res.status_code == 401
 
+    def test_list_without_n_plus_one(self, admin_client, collaborator, department, assert_constant_queries):
+        def grow(indices):
+            for index in indices:
+                project = Project.objects.create(name=f"Projeto {index}")
+                project.responsible_collaborators.add(collaborator)
+                project.used_by_departments.add(department)
+
+        res = assert_constant_queries(admin_client, self.url, grow)
+        assert all(item["responsible_collaborators"] == [collaborator.id] for item in res.data["results"])
+        assert_constant_queries(admin_client, self.url, grow, {"expand": "responsible_collaborators,used_by_departments"})
+
     def test_list_regular_user(self, auth_client, project):
         """Qualquer usuario autenticado pode listar projetos."""
         res = auth_client.get(self.url)
@@ -61,3 +72,21 @@ class TestProjectAPI:
         res = admin_client.get(self.detail_url(project.id))
         assert res.status_code == 200
         assert res.data["name"] == project.name
+
+    # ---- Campos esparsos
+    def test_sparse_fields_skip_prefetch(self, admin_client, project, collaborator):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        project.responsible_collaborators.add(collaborator)
+        with CaptureQueriesContext(connection) as queries:
+            res = admin_client.get(self.url, {"fields": "id,name"})
+        assert res.data["results"][0] == {"id": project.id, "name": project.name}
+        assert not any("responsible_collaborators" in query["sql"] for query in queries)
+
+    def test_expand_collaborators(self, admin_client, project, collaborator):
+        project.responsible_collaborators.add(collaborator)
+        res = admin_client.get(self.detail_url(project.id), {"expand": "responsible_collaborators", "omit": "readme"})
+        assert res.data["responsible_collaborators"] == [
+            {"id": collaborator.id, "name": collaborator.name, "email": collaborator.email},
+        ]
+        assert "readme" not in res.data
@@ -3,10 +3,15 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from app.conditional import ConditionalGetMixin
+from app.db_routers import ReplicaReadMixin
+from app.sparse_fields import SparseQuerysetMixin
+from collaborators.models import Collaborator
+from departments.models import Department
 from .models import Project
 from .serializers import ProjectSerializer
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD de projetos com filtro opcional por departamento."""
     queryset = Project.objects.prefetch_related(
         'responsible_collaborators',
@@ -15,6 +20,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     permission_classes = [IsAuthenticated]
+    etag_models = (Project, Collaborator, Department)
+    prefetch_related_fields = {
+        'responsible_collaborators': ('responsible_collaborators', 'responsible_collaborators_names'),
+        'used_by_departments': ('used_by_departments', 'used_by_departments_names'),
+    }
 
     def get_queryset(self):
         """Aplica filtro opcional por departamento via query param."""
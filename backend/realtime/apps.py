@@ -0,0 +1,15 @@
+"""Configuracao do app `realtime` no Django."""
+
+from django.apps import AppConfig
+
+
+class RealtimeConfig(AppConfig):
+    """Conecta os sinais dos modelos do quadro ao broker de eventos."""
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'realtime'
+    verbose_name = "Tempo real"
+
+    def ready(self):
+        """Registra os receivers de `post_save`/`post_delete` dos modelos do quadro."""
+        from .signals import connect_model_signals
+        connect_model_signals()
@@ -0,0 +1,131 @@
+"""Brokers de eventos do quadro (push em tempo real).
+
+Os sinais dos modelos publicam eventos no broker e o stream SSE os entrega aos
+clientes conectados. O backend e escolhido em `settings.REALTIME_BROKER`:
+
+- `realtime.broker.InMemoryBroker`: fan-out dentro do proprio processo
+  (desenvolvimento e testes).
+- `realtime.broker.RedisBroker`: Pub/Sub do Redis, necessario quando quem grava
+  (workers WSGI) e quem transmite (workers ASGI) rodam em processos diferentes.
+"""
+
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class BaseBroker:
+    """Interface do broker: `publish` sincrono e `listen` como gerador assincrono."""
+
+    def publish(self, event):
+        """Entrega `event` (dict serializavel em JSON) a todos os ouvintes."""
+        raise NotImplementedError
+
+    async def listen(self, heartbeat=None):
+        """Gera eventos recebidos; gera `None` a cada `heartbeat` segundos ocioso."""
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+class InMemoryBroker(BaseBroker):
+    """Fan-out em memoria entre threads e event loops do mesmo processo.
+
+    Cada ouvinte tem uma fila limitada; se um cliente lento enche a fila,
+    os eventos mais antigos sao descartados em vez de acumular memoria.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._listeners = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        with self._lock:
+            listeners = list(self._listeners)
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Loop ja encerrado: o ouvinte sera removido ao sair de `listen`.
+                continue
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def listen(self, heartbeat=None):
+        listener = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.max_queue_size))
+        with self._lock:
+            self._listeners.add(listener)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(listener[1].get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._listeners.discard(listener)
+
+
+class RedisBroker(BaseBroker):
+    """Broker sobre Redis Pub/Sub, compartilhado entre processos e servidores."""
+
+    def __init__(self, url='redis://localhost:6379/0', channel='kanban:board-events'):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requer o pacote `redis` instalado.") from exc
+        self.url = url
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, event):
+        self._client.publish(self.channel, json.dumps(event))
+
+    async def listen(self, heartbeat=None):
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            while True:
+                message = await pubsub.get_message(timeout=heartbeat)
+                yield json.loads(message['data']) if message else None
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Retorna a instancia unica do broker configurado em `REALTIME_BROKER`."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            config = getattr(settings, 'REALTIME_BROKER', {})
+            backend = import_string(config.get('BACKEND', 'realtime.broker.InMemoryBroker'))
+            _broker = backend(**config.get('OPTIONS', {}))
+        return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    """Descarta o broker em cache quando os testes trocam a configuracao."""
+    global _broker
+    if setting == 'REALTIME_BROKER':
+        with _broker_lock:
+            _broker = None
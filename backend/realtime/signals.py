@@ -0,0 +1,78 @@
+"""Publica eventos de mudanca dos modelos do quadro no broker.
+
+Os eventos sao enviados apenas apos o commit da transacao, para que nenhum
+cliente reaja a uma gravacao que ainda pode sofrer rollback. O payload e
+minimo (modelo, acao e id): o cliente decide o que buscar novamente.
+"""
+
+import logging
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from tasks.signals import bulk_updated
+from .broker import get_broker
+
+logger = logging.getLogger(__name__)
+
+# Modelos observados -> nome do modelo no payload do evento.
+EVENT_MODELS = {
+    'tasks.Task': 'task',
+    'tasks.Subtask': 'subtask',
+    'projectsmanager.Project': 'project',
+    'departments.Department': 'department',
+    'collaborators.Collaborator': 'collaborator',
+}
+
+
+def publish_event(event):
+    """Publica no broker sem deixar uma falha de infraestrutura quebrar a gravacao."""
+    try:
+        get_broker().publish(event)
+    except Exception:
+        logger.exception("Falha ao publicar evento do quadro: %s", event)
+
+
+def build_event(instance, action):
+    """Monta o payload do evento para `instance`."""
+    event = {
+        'model': EVENT_MODELS[instance._meta.label],
+        'action': action,
+        'id': instance.pk,
+    }
+    if event['model'] == 'subtask':
+        event['task'] = instance.task_id
+    return event
+
+
+def on_model_saved(sender, instance, created, raw=False, **kwargs):
+    """Agenda o evento `created`/`updated` para depois do commit."""
+    if raw:
+        return
+    event = build_event(instance, 'created' if created else 'updated')
+    transaction.on_commit(partial(publish_event, event))
+
+
+def on_model_deleted(sender, instance, **kwargs):
+    """Agenda o evento `deleted` para depois do commit."""
+    event = build_event(instance, 'deleted')
+    transaction.on_commit(partial(publish_event, event))
+
+
+def on_bulk_updated(sender, instances, **kwargs):
+    """Agenda um evento `updated` por objeto gravado em lote."""
+    if sender._meta.label not in EVENT_MODELS:
+        return
+    for instance in instances:
+        transaction.on_commit(partial(publish_event, build_event(instance, 'updated')))
+
+
+def connect_model_signals():
+    """Conecta os receivers a todos os modelos de `EVENT_MODELS`."""
+    for label in EVENT_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(on_model_saved, sender=model, dispatch_uid=f'realtime-save-{label}')
+        post_delete.connect(on_model_deleted, sender=model, dispatch_uid=f'realtime-delete-{label}')
+    bulk_updated.connect(on_bulk_updated, dispatch_uid='realtime-bulk-updated')
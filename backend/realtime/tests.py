@@ -0,0 +1,164 @@
+"""Testes do app realtime (broker e eventos dos modelos)."""
+
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from realtime.broker import InMemoryBroker
+from tasks.models import Subtask, Task
+
+
+class RecordingBroker:
+    """Broker de teste que apenas acumula os eventos publicados."""
+
+    events = []
+
+    def publish(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def recorded_events(settings):
+    RecordingBroker.events = []
+    settings.REALTIME_BROKER = {"BACKEND": "realtime.tests.RecordingBroker"}
+    return RecordingBroker.events
+
+
+# ========================
+# Broker em memoria
+# ========================
+class TestInMemoryBroker:
+    """Fan-out do broker em memoria."""
+
+    def test_fan_out_to_all_listeners(self):
+        broker = InMemoryBroker()
+
+        async def scenario():
+            first = broker.listen(heartbeat=0.01)
+            second = broker.listen(heartbeat=0.01)
+            # O primeiro `anext` registra o ouvinte (e devolve o heartbeat).
+            assert await first.__anext__() is None
+            assert await second.__anext__() is None
+            broker.publish({"model": "task", "action": "updated", "id": 1})
+            received = [await first.__anext__(), await second.__anext__()]
+            await first.aclose()
+            await second.aclose()
+            return received
+
+        received = asyncio.run(scenario())
+        assert received == [{"model": "task", "action": "updated", "id": 1}] * 2
+        assert broker._listeners == set()
+
+    def test_slow_listener_drops_oldest(self):
+        broker = InMemoryBroker(max_queue_size=2)
+
+        async def scenario():
+            stream = broker.listen(heartbeat=0.01)
+            await stream.__anext__()
+            for event_id in range(3):
+                broker.publish({"id": event_id})
+            await asyncio.sleep(0)
+            received = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return received
+
+        assert asyncio.run(scenario()) == [{"id": 1}, {"id": 2}]
+
+
+# ========================
+# Eventos dos modelos
+# ========================
+@pytest.mark.django_db
+class TestModelEvents:
+    """Sinais publicam eventos apenas apos o commit."""
+
+    def test_task_save_and_delete(self, recorded_events, project, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            task = Task.objects.create(title="Evento", project=project)
+        task_id = task.id
+        with django_capture_on_commit_callbacks(execute=True):
+            task.delete()
+        assert {"model": "task", "action": "created", "id": task_id} in recorded_events
+        assert recorded_events[-1] == {"model": "task", "action": "deleted", "id": task_id}
+
+    def test_subtask_event_carries_task(self, recorded_events, task, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            sub = Subtask.objects.create(task=task, title="Sub")
+        assert {"model": "subtask", "action": "created", "id": sub.id, "task": task.id} in recorded_events
+
+    def test_bulk_reorder_emits_events(self, recorded_events, admin_client, task, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post("/api/v1/tasks/bulk-reorder/", [{"id": task.id, "order": 3}], format="json")
+        assert {"model": "task", "action": "updated", "id": task.id} in recorded_events
+
+    def test_no_event_before_commit(self, recorded_events, project, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            Task.objects.create(title="Pendente", project=project)
+        assert recorded_events == []
+        assert callbacks
+
+
+# ========================
+# Stream SSE
+# ========================
+class TestEventStream:
+    """Testes do endpoint /api/v1/events/."""
+
+    def test_anonymous_stream_opens(self, settings):
+        settings.REALTIME_HEARTBEAT_SECONDS = 0.01
+
+        async def scenario():
+            response = await AsyncClient().get("/api/v1/events/")
+            chunks = response.streaming_content
+            first, second = await chunks.__anext__(), await chunks.__anext__()
+            await chunks.aclose()
+            return response, first, second
+
+        response, first, second = asyncio.run(scenario())
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert first.startswith(b"retry:")
+        assert second == b": ping\n\n"
+
+    def test_invalid_ticket_rejected(self):
+        response = asyncio.run(AsyncClient().get("/api/v1/events/", {"ticket": "invalido"}))
+        assert response.status_code == 401
+
+
+def open_stream(params=None, **headers):
+    """GET no stream pelo `async_to_sync` (as consultas enxergam a transacao do teste)."""
+    async def scenario():
+        response = await AsyncClient().get("/api/v1/events/", params or {}, headers=headers)
+        if response.status_code == 200:
+            await response.streaming_content.aclose()
+        return response
+
+    return async_to_sync(scenario)()
+
+
+@pytest.mark.django_db
+class TestStreamTicket:
+    """Ticket de uso unico de /api/v1/events/ticket/ (o JWT nao vai na URL)."""
+
+    url = "/api/v1/events/ticket/"
+
+    def test_ticket_opens_stream_once(self, admin_client):
+        res = admin_client.post(self.url)
+        assert res.status_code == 200
+        ticket = res.data["ticket"]
+        assert open_stream({"ticket": ticket}).status_code == 200
+        assert open_stream({"ticket": ticket}).status_code == 401
+
+    def test_ticket_requires_auth(self, anon_client):
+        assert anon_client.post(self.url).status_code == 401
+
+    def test_inactive_user_rejected(self, admin_client, admin_user):
+        from rest_framework_simplejwt.tokens import AccessToken
+        ticket = admin_client.post(self.url).data["ticket"]
+        token = str(AccessToken.for_user(admin_user))
+        admin_user.is_active = False
+        admin_user.save()
+        assert open_stream({"ticket": ticket}).status_code == 401
+        assert open_stream(Authorization=f"Bearer {token}").status_code == 401
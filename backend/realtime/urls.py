@@ -0,0 +1,10 @@
+"""Roteamento de URLs para o app realtime."""
+
+from django.urls import path
+
+from .views import StreamTicketView, board_events
+
+urlpatterns = [
+    path('events/', board_events, name='board_events'),
+    path('events/ticket/', StreamTicketView.as_view(), name='board_events_ticket'),
+]
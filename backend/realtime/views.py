@@ -0,0 +1,111 @@
+"""Views do app realtime.
+
+O stream de eventos e uma view assincrona (Server-Sent Events): precisa ser
+servida pelo ASGI (`app.asgi:application`), pois no WSGI a resposta
+assincrona seria consumida inteira antes de ser enviada. Clientes autenticados
+abrem o stream com um ticket de uso unico (`StreamTicketView`).
+"""
+
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from .broker import get_broker
+
+# Modelos cujos eventos chegam a clientes anonimos (modo TV): apenas o que o
+# quadro publico exibe.
+PUBLIC_EVENT_MODELS = {'task', 'project', 'collaborator'}
+
+TICKET_KEY_PREFIX = 'realtime:ticket'
+
+
+class InvalidTicket(Exception):
+    """Ticket do stream inexistente, expirado ou ja usado."""
+
+
+def issue_ticket(user):
+    """Ticket aleatorio de uso unico que abre o stream como `user`."""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(f'{TICKET_KEY_PREFIX}:{ticket}', user.pk, settings.REALTIME_TICKET_SECONDS)
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """Usuario do ticket, que deixa de valer; levanta `InvalidTicket`."""
+    key = f'{TICKET_KEY_PREFIX}:{ticket}'
+    user_id = cache.get(key)
+    # So quem consegue apagar a chave usa o ticket (duas conexoes com o mesmo ticket: uma falha).
+    if user_id is None or not cache.delete(key):
+        raise InvalidTicket
+    user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        raise InvalidTicket
+    return user
+
+
+def authenticate_stream(request):
+    """Autentica por `?ticket=` (EventSource nao envia headers) ou header `Authorization: Bearer`.
+
+    Retorna o usuario ou `None` para acesso anonimo; levanta `InvalidTicket`
+    ou os erros do simplejwt.
+    """
+    ticket = request.GET.get('ticket')
+    if ticket:
+        return redeem_ticket(ticket)
+    result = JWTAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+class StreamTicketView(APIView):
+    """`POST /api/v1/events/ticket/`: ticket curto para abrir o stream SSE.
+
+    O JWT nunca vai na URL do EventSource (e, portanto, nao aparece nos logs
+    de acesso do Nginx e do Gunicorn); o ticket vale uma conexao e expira em
+    `REALTIME_TICKET_SECONDS`.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({
+            'ticket': issue_ticket(request.user),
+            'expires_in': settings.REALTIME_TICKET_SECONDS,
+        })
+
+
+async def board_events(request):
+    """Stream SSE com eventos de tarefas, subtarefas, projetos, setores e colaboradores."""
+    try:
+        user = await sync_to_async(authenticate_stream)(request)
+    except InvalidTicket:
+        return JsonResponse({'detail': 'Ticket invalido, expirado ou ja usado.'}, status=401)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return JsonResponse({'detail': 'Token invalido ou expirado.'}, status=401)
+
+    allowed_models = None if user is not None else PUBLIC_EVENT_MODELS
+    heartbeat = getattr(settings, 'REALTIME_HEARTBEAT_SECONDS', 15)
+
+    async def stream():
+        # Sugere ao EventSource o intervalo de reconexao.
+        yield 'retry: 5000\n\n'
+        async for event in get_broker().listen(heartbeat=heartbeat):
+            if event is None:
+                yield ': ping\n\n'
+            elif allowed_models is None or event.get('model') in allowed_models:
+                yield f'data: {json.dumps(event)}\n\n'
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Impede o Nginx de bufferizar o stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -2,6 +2,7 @@
 
 from django.contrib import admin
 from .models import Subtask, Task
+from .search import match_tasks
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
@@ -11,15 +12,21 @@ class TaskAdmin(admin.ModelAdmin):
     search_fields = ('title', 'description')
     ordering = ('order', '-created_at')
 
+    def get_search_results(self, request, queryset, search_term):
+        """Busca pelo indice textual (ver `tasks.search`) em vez de ILIKE."""
+        if not search_term.strip():
+            return queryset, False
+        return match_tasks(queryset, search_term), False
+
     @admin.display(description="Assigned To")
     def assigned_to_list(self, obj):
         """Mostra responsaveis como texto simples na listagem."""
-        return ", ".join(obj.assigned_to.values_list("name", flat=True))
+        return ", ".join(obj.assigned_to_names)
 
     @admin.display(description="Department")
     def department_list(self, obj):
         """Mostra departamentos relacionados de forma legivel."""
-        return ", ".join(obj.department.values_list("name", flat=True))
+        return ", ".join(obj.department_names)
 
 
 @admin.register(Subtask)
@@ -0,0 +1,180 @@
+"""Metricas de fluxo sobre o historico de status (`TaskTransition`).
+
+O trabalho pesado fica no banco: agrupamentos por tarefa (`Min`/`Max`
+condicionais), por semana (`TruncWeek`) e por dia (`TruncDate`). O Python so
+recebe uma linha por tarefa concluida (lead/cycle time), por semana ou por
+dia/status, e calcula percentis e somas acumuladas.
+
+Tempos em dias (float). Janela `[since, until)` em datas locais.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, DateField, Max, Min, Q
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import Task, TaskTransition
+
+CODES = TaskTransition.STATUS_CODES
+STATUS_BY_CODE = {code: status for status, code in CODES.items()}
+WIP_STATUSES = ('IN_PROGRESS', 'IN_REVIEW')
+PERCENTILES = (50, 85, 95)
+
+# Agrupamentos aceitos em `throughput(group_by=...)`.
+GROUP_FIELDS = {'project': 'task__project_id', 'department': 'task__department'}
+
+
+def percentile(values, p):
+    """Percentil `p` (0-100) de uma lista ja ordenada, com interpolacao linear."""
+    if not values:
+        return None
+    position = (len(values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def distribution(values):
+    """Resumo de uma lista de duracoes (dias): contagem, media, percentis e maximo."""
+    values = sorted(values)
+    summary = {'count': len(values), 'mean': None, 'max': None}
+    if values:
+        summary['mean'] = round(sum(values) / len(values), 2)
+        summary['max'] = round(values[-1], 2)
+    for p in PERCENTILES:
+        value = percentile(values, p)
+        summary[f'p{p}'] = None if value is None else round(value, 2)
+    return summary
+
+
+def days(delta):
+    return delta.total_seconds() / 86400
+
+
+def window_bounds(since, until):
+    """Datas locais -> datetimes conscientes `[inicio, fim)`."""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(since, time.min), tz),
+        timezone.make_aware(datetime.combine(until, time.min), tz),
+    )
+
+
+def flow_times(transitions, since, until):
+    """Lead time (criacao -> DONE) e cycle time (1o IN_PROGRESS -> DONE).
+
+    Considera tarefas cuja ultima entrada em DONE caiu na janela.
+    """
+    start, end = window_bounds(since, until)
+    rows = (
+        transitions.order_by().values('task_id')
+        .annotate(
+            created=Min('at', filter=Q(from_status__isnull=True)),
+            started=Min('at', filter=Q(to_status=CODES['IN_PROGRESS'])),
+            done=Max('at', filter=Q(to_status=CODES['DONE'])),
+        )
+        .filter(done__gte=start, done__lt=end)
+        .values_list('created', 'started', 'done')
+    )
+    lead, cycle = [], []
+    for created, started, done in rows:
+        if created is not None:
+            lead.append(days(done - created))
+        if started is not None and started <= done:
+            cycle.append(days(done - started))
+    return {'lead_time': distribution(lead), 'cycle_time': distribution(cycle)}
+
+
+def throughput(transitions, since, until, group_by=None):
+    """Tarefas concluidas por semana (segunda-feira), opcionalmente por projeto/setor.
+
+    Sem agrupamento, todas as semanas da janela aparecem (inclusive com zero).
+    """
+    start, end = window_bounds(since, until)
+    fields = ['week'] + ([GROUP_FIELDS[group_by]] if group_by else [])
+    rows = (
+        transitions.order_by()
+        .filter(to_status=CODES['DONE'], at__gte=start, at__lt=end)
+        .annotate(week=TruncWeek('at', output_field=DateField()))
+        .values(*fields)
+        .annotate(count=Count('task_id', distinct=True))
+        .order_by(*fields)
+    )
+    if group_by:
+        return [
+            {'week': row['week'], group_by: row[GROUP_FIELDS[group_by]], 'count': row['count']}
+            for row in rows
+        ]
+    counts = {row['week']: row['count'] for row in rows}
+    week = since - timedelta(days=since.weekday())
+    series = []
+    while week < until:
+        series.append({'week': week, 'count': counts.get(week, 0)})
+        week += timedelta(days=7)
+    return series
+
+
+def _net_flow(transitions):
+    """Entradas menos saidas por status, agrupadas no banco."""
+    net = {}
+    for column, sign in (('to_status', 1), ('from_status', -1)):
+        rows = transitions.order_by().exclude(**{f'{column}__isnull': True}).values(column).annotate(n=Count('id'))
+        for row in rows:
+            status = STATUS_BY_CODE[row[column]]
+            net[status] = net.get(status, 0) + sign * row['n']
+    return net
+
+
+def cumulative_flow(transitions, since, until):
+    """Quantidade de tarefas em cada status ao fim de cada dia da janela."""
+    start, end = window_bounds(since, until)
+    running = {status: 0 for status, _ in Task.STATUS_CHOICES}
+    for status, value in _net_flow(transitions.filter(at__lt=start)).items():
+        running[status] += value
+
+    daily = {}
+    window = transitions.filter(at__gte=start, at__lt=end).annotate(day=TruncDate('at'))
+    for column, sign in (('to_status', 1), ('from_status', -1)):
+        rows = (
+            window.order_by().exclude(**{f'{column}__isnull': True})
+            .values('day', column).annotate(n=Count('id'))
+        )
+        for row in rows:
+            changes = daily.setdefault(row['day'], {})
+            status = STATUS_BY_CODE[row[column]]
+            changes[status] = changes.get(status, 0) + sign * row['n']
+
+    series = []
+    day = since
+    while day < until:
+        for status, value in daily.get(day, {}).items():
+            running[status] += value
+        series.append({'date': day, **running})
+        day += timedelta(days=1)
+    return series
+
+
+def wip_age(tasks, now=None, oldest=10):
+    """Idade do trabalho em andamento: desde o 1o IN_PROGRESS (ou a ultima transicao)."""
+    now = now or timezone.now()
+    rows = list(
+        tasks.order_by().filter(status__in=WIP_STATUSES)
+        .annotate(
+            started=Min('transitions__at', filter=Q(transitions__to_status=CODES['IN_PROGRESS'])),
+            entered=Max('transitions__at'),
+        )
+        .values_list('id', 'title', 'status', 'started', 'entered')
+    )
+    ages = []
+    for task_id, title, status, started, entered in rows:
+        since = started or entered
+        if since is not None:
+            ages.append((days(now - since), task_id, title, status))
+    ages.sort(reverse=True)
+    summary = distribution([age for age, *_ in ages])
+    summary['oldest'] = [
+        {'id': task_id, 'title': title, 'status': status, 'days': round(age, 2)}
+        for age, task_id, title, status in ages[:oldest]
+    ]
+    return summary
@@ -1,6 +1,7 @@
 """Configuracao do app `tasks` no Django."""
 
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TasksConfig(AppConfig):
@@ -8,3 +9,10 @@ class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
     verbose_name = "Kanban"
+
+    def ready(self):
+        """Conecta os receivers de sinais do app."""
+        from . import signals  # noqa: F401
+        from .search import restore_sqlite_triggers
+
+        post_migrate.connect(restore_sqlite_triggers, sender=self)
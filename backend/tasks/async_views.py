@@ -0,0 +1,173 @@
+"""Leitura assincrona de tarefas (ASGI) para clientes que fazem polling.
+
+No gevent/WSGI cada cliente lento ocupa uma das `worker_connections` do
+worker. Estas views rodam no servico ASGI (`events`, uvicorn), junto do
+stream SSE, e usam o ORM assincrono (`aiterator`, `afirst`). O JSON e o
+mesmo das rotas do DRF:
+
+- `/api/v1/async/tasks/`: filtros de `TaskViewSet`, `?fields=`/`?omit=`,
+  pagina por `?cursor=`/`?page_size=` ou delta-sync com `?since=`;
+- `/api/v1/async/tasks/<id>/`;
+- `/api/v1/async/tasks-public/`: snapshot do quadro publico.
+
+Sem `?expand=`, busca textual (`?q=`) nem throttles do DRF (o Nginx limita a
+taxa): esses parametros recebem 400 e devem ir para `/api/v1/tasks/`.
+O ORM assincrono do Django ainda executa as consultas numa thread por
+processo: o ganho e nao prender conexoes enquanto os clientes esperam, nao
+consultas em paralelo.
+"""
+
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from app.conditional import table_version
+from app.sparse_fields import kept_fields, parse_names
+from .fast_serializers import aserialize_task_rows, task_rows
+from .models import Task
+from .pagination import after_cursor, decode_cursor, encode_cursor, page_size_from
+from .public_board import get_public_board, snapshot_response
+from .serializers import TaskSerializer
+from .views import DELTA_CURSOR_SAFETY_MARGIN, TaskViewSet, deleted_task_ids, filter_tasks, parse_since
+
+
+# Parametros das rotas do DRF que estas views nao implementam.
+UNSUPPORTED_PARAMS = ('q', 'expand')
+
+
+def json_response(data, status=200):
+    """JSON renderizado como nas respostas do DRF (mesmos bytes)."""
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def authenticate_request(request):
+    """Usuario do header `Authorization: Bearer`, ou None sem credenciais."""
+    result = JWTAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+async def authenticated(request):
+    """None se autenticado; senao a resposta 401."""
+    try:
+        user = await sync_to_async(authenticate_request)(request)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return json_response({'detail': 'Token invalido ou expirado.'}, status=401)
+    if user is None:
+        return json_response({'detail': 'As credenciais de autenticacao nao foram fornecidas.'}, status=401)
+    return None
+
+
+def unsupported(params):
+    """Resposta 400 se `params` usa algo de `UNSUPPORTED_PARAMS`; senao None."""
+    names = [name for name in UNSUPPORTED_PARAMS if name in params]
+    if not names:
+        return None
+    return json_response(
+        {name: 'Nao suportado em /api/v1/async/; use /api/v1/tasks/.' for name in names}, status=400,
+    )
+
+
+def requested_fields(params):
+    """Campos de `?fields=`/`?omit=` (None: todos), como em `SparseQuerysetMixin`."""
+    fields, omit = parse_names(params.get('fields')), parse_names(params.get('omit')) or set()
+    if fields is None and not omit:
+        return None
+    return set(kept_fields(TaskSerializer.Meta.fields, fields, omit))
+
+
+async def conditional_json(request, build):
+    """JSON de `await build()` com ETag; 304 antes de consultar as tarefas se o cliente ja o tem."""
+    version = await sync_to_async(table_version)(TaskViewSet.etag_models)
+    raw = '\n'.join([request.get_full_path(), 'application/json', version])
+    etag = '"%s"' % hashlib.sha256(raw.encode()).hexdigest()[:40]
+    client_etags = {tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')}
+    if etag in client_etags or '*' in client_etags:
+        response = HttpResponse(status=304)
+    else:
+        response = await build()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@require_GET
+async def task_list(request):
+    """Lista de tarefas (mesmo JSON de `GET /api/v1/tasks/`)."""
+    if denied := await authenticated(request):
+        return denied
+    if rejected := unsupported(request.GET):
+        return rejected
+
+    params = request.GET
+    fields = requested_fields(params)
+    queryset = filter_tasks(Task.objects.order_by('order', '-id'), params)
+
+    if 'since' in params:
+        try:
+            since = parse_since(params['since'])
+        except APIException as exc:
+            return json_response(exc.detail, status=exc.status_code)
+        cursor = timezone.now() - DELTA_CURSOR_SAFETY_MARGIN
+        deleted = []
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+            deleted = [task_id async for task_id in deleted_task_ids(since, params)]
+        rows = [row async for row in task_rows(queryset, fields).aiterator()]
+        return json_response({
+            'cursor': cursor.isoformat(),
+            'results': await aserialize_task_rows(rows, fields),
+            'deleted': deleted,
+        })
+
+    async def page():
+        rows_queryset = task_rows(queryset, fields)
+        if token := params.get('cursor'):
+            try:
+                rows_queryset = after_cursor(rows_queryset, *decode_cursor(token))
+            except ValueError:
+                return json_response({'detail': 'Cursor invalido.'}, status=404)
+        page_size = page_size_from(params)
+        rows = [row async for row in rows_queryset[:page_size + 1].aiterator()]
+        next_link = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_link = replace_query_param(
+                request.build_absolute_uri(), 'cursor', encode_cursor(rows[-1]['order'], rows[-1]['id']),
+            )
+        return json_response({'next': next_link, 'results': await aserialize_task_rows(rows, fields)})
+
+    return await conditional_json(request, page)
+
+
+@require_GET
+async def task_detail(request, pk):
+    """Uma tarefa (mesmo JSON de `GET /api/v1/tasks/<id>/`)."""
+    if denied := await authenticated(request):
+        return denied
+    if rejected := unsupported(request.GET):
+        return rejected
+    fields = requested_fields(request.GET)
+
+    async def detail():
+        row = await task_rows(Task.objects.filter(pk=pk), fields).afirst()
+        if row is None:
+            return json_response({'detail': 'Nao encontrado.'}, status=404)
+        return json_response((await aserialize_task_rows([row], fields))[0])
+
+    return await conditional_json(request, detail)
+
+
+@require_GET
+async def public_task_list(request):
+    """Quadro publico (modo TV): mesmo snapshot de `GET /api/v1/tasks-public/`."""
+    snapshot = await sync_to_async(get_public_board)()
+    return snapshot_response(snapshot, request)
@@ -0,0 +1,107 @@
+"""Operacoes em lote de `POST /tasks/batch/` (selecao multipla no quadro).
+
+Cada `update` vira um unico UPDATE para todas as tarefas selecionadas, com a
+regra de `completed_at` de `TaskSerializer` expressa em SQL, e inserts/deletes
+em lote nas tabelas M2M. Como nada disso dispara `post_save`/`m2m_changed`,
+historico de status, nomes desnormalizados e rollup sao tratados aqui; quem
+chama envia `bulk_updated`. `create` e `delete` usam o ORM (sinais por objeto).
+"""
+
+from django.db.models import Case, DateTimeField, F, Value, When
+
+from .models import Task, TaskTransition
+from .relation_names import refresh_relation_names
+from .stats import STAT_FIELDS, track_task_stats
+
+# Coluna de cada tabela M2M de `Task`.
+RELATION_COLUMNS = {'assigned_to': 'collaborator_id', 'department': 'department_id'}
+
+
+def completed_at_for(status, now):
+    """`Task.completed_at_for` como expressao de UPDATE (usa o status anterior da linha)."""
+    if status != 'DONE':
+        return Case(When(status='DONE', then=Value(None)), default=F('completed_at'), output_field=DateTimeField())
+    return Case(When(status='DONE', then=F('completed_at')), default=Value(now), output_field=DateTimeField())
+
+
+def update_relation(field, task_ids, replace=None, add=(), remove=()):
+    """Substitui (`replace`), remove e acrescenta ids em `field` para todas as tarefas."""
+    through = getattr(Task, field).through
+    column = RELATION_COLUMNS[field]
+    add = {obj.pk for obj in add}
+    rows = through.objects.filter(task_id__in=task_ids)
+    if replace is not None:
+        keep = {obj.pk for obj in replace}
+        rows.exclude(**{f'{column}__in': keep}).delete()
+        add |= keep
+    if remove:
+        rows.filter(**{f'{column}__in': [obj.pk for obj in remove]}).delete()
+    if add:
+        through.objects.bulk_create(
+            [through(task_id=task_id, **{column: pk}) for task_id in task_ids for pk in sorted(add)],
+            ignore_conflicts=True,
+        )
+
+
+def apply_update(ids, values, add, remove, now):
+    """Aplica `set`/`add`/`remove` as tarefas `ids`; retorna `(atualizadas, inexistentes)`."""
+    current = dict(Task.objects.select_for_update().filter(pk__in=ids).values_list('id', 'status'))
+    found = [pk for pk in ids if pk in current]
+    missing = [pk for pk in ids if pk not in current]
+    if not found:
+        return found, missing
+
+    fields = {name: value for name, value in values.items() if name not in RELATION_COLUMNS}
+    relations = {name for name in RELATION_COLUMNS if name in values or name in add or name in remove}
+    tracked = found if relations or STAT_FIELDS & set(fields) else []
+    with track_task_stats(tracked):
+        if fields:
+            if 'status' in fields:
+                fields['completed_at'] = completed_at_for(fields['status'], now)
+            Task.objects.filter(pk__in=found).update(updated_at=now, **fields)
+        for name in relations:
+            update_relation(name, found, values.get(name), add.get(name, ()), remove.get(name, ()))
+        if relations:
+            refresh_relation_names(found)
+            if not fields:
+                # Ids de M2M mudam o card no delta-sync mesmo sem mudar os nomes.
+                Task.objects.filter(pk__in=found).update(updated_at=now)
+
+    if 'status' in fields:
+        TaskTransition.objects.bulk_create([
+            TaskTransition.build(pk, current[pk], fields['status'], now)
+            for pk in found if current[pk] != fields['status']
+        ])
+    return found, missing
+
+
+def apply_delete(ids):
+    """Exclui as tarefas `ids`; retorna `(excluidas, inexistentes)`."""
+    tasks = Task.objects.filter(pk__in=ids)
+    existing = set(tasks.values_list('id', flat=True))
+    tasks.delete()
+    return [pk for pk in ids if pk in existing], [pk for pk in ids if pk not in existing]
+
+
+def apply_operations(operations, now):
+    """Executa as operacoes validadas em ordem; retorna `(resultados, ids alterados)`.
+
+    Deve rodar dentro de uma transacao.
+    """
+    results, updated = [], set()
+    for operation in operations:
+        op = operation['op']
+        if op == 'create':
+            task = operation['serializer'].save()
+            results.append({'op': op, 'id': task.pk})
+        elif op == 'update':
+            found, missing = apply_update(
+                operation['ids'], operation.get('set', {}), operation.get('add', {}), operation.get('remove', {}), now,
+            )
+            updated.update(found)
+            results.append({'op': op, 'updated': found, 'missing': missing})
+        else:
+            deleted, missing = apply_delete(operation['ids'])
+            updated.difference_update(deleted)
+            results.append({'op': op, 'deleted': deleted, 'missing': missing})
+    return results, updated
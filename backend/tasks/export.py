@@ -0,0 +1,117 @@
+"""Exportacao de tarefas em streaming (CSV e JSON Lines).
+
+As linhas vem de um cursor do servidor (`.iterator(chunk_size=...)`) e sao
+convertidas e enviadas em lotes: a memoria usada nao depende do tamanho do
+quadro e o primeiro byte sai logo apos o primeiro lote. Sem cursores do
+servidor (`DISABLE_SERVER_SIDE_CURSORS`, pgbouncer em modo transacao), o
+`.iterator()` traria o resultado inteiro de uma vez: le os ids na ordem da
+exportacao e busca as linhas por lote de ids. CSV usa os nomes
+desnormalizados (nenhuma consulta M2M); JSON Lines reproduz o formato da API
+e busca ids M2M e subtarefas uma vez por lote.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+from .fast_serializers import assemble_tasks, fetch_relations, format_date, format_datetime, task_rows
+
+# Linhas lidas do cursor (e serializadas) por vez.
+EXPORT_CHUNK_SIZE = 2000
+
+CSV_COLUMNS = (
+    'id', 'title', 'description', 'solution', 'status', 'priority',
+    'project', 'project_name', 'responsavel', 'responsavel_name',
+    'assigned_to_names', 'department_names',
+    'order', 'start_date', 'deadline', 'completed_at', 'created_at', 'updated_at',
+)
+
+
+class CSVRenderer(BaseRenderer):
+    """Habilita `?format=csv`; respostas de erro viram pares chave/valor."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = Echo()
+        items = data.items() if isinstance(data, dict) else enumerate(data or ())
+        return ''.join(csv.writer(buffer).writerow([key, value]) for key, value in items)
+
+
+class JSONLRenderer(BaseRenderer):
+    """Habilita `?format=jsonl` (um objeto JSON por linha)."""
+    media_type = 'application/x-ndjson'
+    format = 'jsonl'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Arquivo falso para o `csv.writer`: devolve a linha em vez de guarda-la."""
+
+    def write(self, value):
+        return value
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def stream_rows(queryset):
+    """Lotes de linhas de `task_rows` lidos por cursor do servidor (ou por lotes de ids)."""
+    rows = task_rows(queryset)
+    if connections[rows.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        return rows_by_id_chunks(rows)
+    return chunked(rows.iterator(chunk_size=EXPORT_CHUNK_SIZE), EXPORT_CHUNK_SIZE)
+
+
+def rows_by_id_chunks(rows):
+    """Lotes de `rows` na ordem original, com uma consulta por lote de ids.
+
+    Cada consulta roda sozinha (sem transacao aberta durante o streaming);
+    tarefas apagadas no meio da exportacao sao omitidas.
+    """
+    ids = list(rows.values_list('id', flat=True))
+    for chunk in chunked(ids, EXPORT_CHUNK_SIZE):
+        by_id = {row['id']: row for row in rows.order_by().filter(id__in=chunk)}
+        yield [by_id[pk] for pk in chunk if pk in by_id]
+
+
+def csv_stream(queryset):
+    """Cabecalho e uma string por lote de linhas CSV."""
+    tz = timezone.get_current_timezone()
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for chunk in stream_rows(queryset):
+        yield ''.join(
+            writer.writerow([
+                row['id'], row['title'], row['description'], row['solution'],
+                row['status'], row['priority'],
+                row['project_id'], row['project__name'], row['responsavel_id'], row['responsavel__name'],
+                '; '.join(row['assigned_to_names']), '; '.join(row['department_names']),
+                row['order'], format_date(row['start_date']), format_date(row['deadline']),
+                format_datetime(row['completed_at'], tz), format_datetime(row['created_at'], tz),
+                format_datetime(row['updated_at'], tz),
+            ])
+            for row in chunk
+        )
+
+
+def jsonl_stream(queryset):
+    """Uma string por lote, cada tarefa no formato de `TaskSerializer` em uma linha."""
+    for chunk in stream_rows(queryset):
+        relations = fetch_relations([row['id'] for row in chunk])
+        yield ''.join(
+            json.dumps(item, ensure_ascii=False) + '\n'
+            for item in assemble_tasks(chunk, *relations)
+        )
@@ -0,0 +1,219 @@
+"""Caminho rapido de serializacao para listagens de tarefas.
+
+Produz exatamente o mesmo JSON de `TaskSerializer` (mesmas chaves, ordem e
+formatos), mas sem a maquinaria de campos do DRF: as linhas vem de
+`.values()` (inclusive os nomes desnormalizados de `assigned_to`/`department`),
+os ids M2M e as subtarefas chegam em uma consulta agrupada cada, e os dicts
+sao montados diretamente. Usado apenas para leitura;
+criacao e edicao continuam passando por `TaskSerializer`.
+"""
+
+from django.utils import timezone
+
+from app.metrics import serializing
+from .models import Subtask, Task
+
+# Colunas lidas da tabela de tarefas (com os nomes das FKs via JOIN).
+TASK_COLUMNS = (
+    'id', 'title', 'description', 'solution', 'status', 'priority',
+    'project_id', 'responsavel_id', 'order', 'start_date', 'deadline',
+    'completed_at', 'created_at', 'updated_at',
+    'project__name', 'responsavel__name', 'assigned_to_names', 'department_names',
+)
+
+# Colunas de `TASK_COLUMNS` usadas por cada campo da resposta (padrao: a coluna
+# de mesmo nome), para `?fields=`/`?omit=`. Os campos de `RELATION_FIELDS`
+# vem de `fetch_relations`.
+FIELD_COLUMNS = {
+    'project': ('project_id',),
+    'responsavel': ('responsavel_id',),
+    'project_name': ('project__name',),
+    'responsavel_name': ('responsavel__name',),
+    'assigned_to': (),
+    'department': (),
+    'subtasks': (),
+}
+RELATION_FIELDS = ('assigned_to', 'department', 'subtasks')
+
+SUBTASK_COLUMNS = ('id', 'task_id', 'title', 'is_done', 'order', 'created_at', 'updated_at')
+
+# Limite de ids por `IN (...)`, abaixo do maximo de parametros do SQLite.
+RELATION_CHUNK_SIZE = 5000
+
+
+def format_datetime(value, tz):
+    """Replica `serializers.DateTimeField.to_representation` (ISO 8601 no fuso atual)."""
+    if not value:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def format_date(value):
+    """Replica `serializers.DateField.to_representation`."""
+    return value.isoformat() if value else None
+
+
+def task_columns(fields=None):
+    """Colunas necessarias para os campos `fields` (None: todas); `id` e `order` sempre entram."""
+    if fields is None:
+        return TASK_COLUMNS
+    needed = {'id', 'order'}
+    for field in fields:
+        needed.update(FIELD_COLUMNS.get(field, (field,)))
+    return tuple(column for column in TASK_COLUMNS if column in needed)
+
+
+def task_rows(queryset, fields=None):
+    """Converte um queryset de tarefas (com filtros/ordem) em queryset de dicts."""
+    return queryset.select_related(None).prefetch_related(None).values(*task_columns(fields))
+
+
+def assigned_rows(task_ids):
+    return (
+        Task.assigned_to.through.objects
+        .filter(task_id__in=task_ids)
+        .order_by('collaborator__name', 'collaborator_id')
+        .values_list('task_id', 'collaborator_id')
+    )
+
+
+def department_rows(task_ids):
+    return (
+        Task.department.through.objects
+        .filter(task_id__in=task_ids)
+        .order_by('department__name', 'department_id')
+        .values_list('task_id', 'department_id')
+    )
+
+
+def subtask_rows(task_ids):
+    return (
+        Subtask.objects
+        .filter(task_id__in=task_ids)
+        .order_by('order', 'created_at', 'id')
+        .values_list(*SUBTASK_COLUMNS)
+    )
+
+
+# Consulta de cada relacao, na ordem de `RELATION_FIELDS`.
+RELATION_QUERIES = {'assigned_to': assigned_rows, 'department': department_rows, 'subtasks': subtask_rows}
+
+
+def _collect(name, row, related):
+    # Subtarefas guardam a linha inteira; M2M so o id relacionado.
+    if name == 'subtasks':
+        related.setdefault(row[1], []).append(row)
+    else:
+        related.setdefault(row[0], []).append(row[1])
+
+
+def fetch_relations(task_ids, relations=RELATION_FIELDS):
+    """Busca M2M e subtarefas das tarefas informadas: uma consulta por relacao.
+
+    Retorna `(assigned, departments, subtasks)`, cada um indexado por `task_id`.
+    A ordem segue a do prefetch padrao (ordering dos modelos relacionados).
+    Relacoes fora de `relations` nao sao consultadas (dicts vazios).
+    Listas muito grandes sao divididas em lotes de `RELATION_CHUNK_SIZE` ids.
+    """
+    related = {name: {} for name in RELATION_FIELDS}
+    for start in range(0, len(task_ids), RELATION_CHUNK_SIZE):
+        chunk = task_ids[start:start + RELATION_CHUNK_SIZE]
+        for name in RELATION_FIELDS:
+            if name in relations:
+                for row in RELATION_QUERIES[name](chunk):
+                    _collect(name, row, related[name])
+    return tuple(related.values())
+
+
+async def afetch_relations(task_ids, relations=RELATION_FIELDS):
+    """`fetch_relations` com o ORM assincrono.
+
+    Usa `async for` no queryset (um lote por consulta): no Django 5.2,
+    `aiterator()` de `values_list()` executa o SQL fora do `sync_to_async`.
+    """
+    related = {name: {} for name in RELATION_FIELDS}
+    for start in range(0, len(task_ids), RELATION_CHUNK_SIZE):
+        chunk = task_ids[start:start + RELATION_CHUNK_SIZE]
+        for name in RELATION_FIELDS:
+            if name in relations:
+                async for row in RELATION_QUERIES[name](chunk):
+                    _collect(name, row, related[name])
+    return tuple(related.values())
+
+
+def assemble_tasks(rows, assigned, departments, subtasks):
+    """Monta os dicts no mesmo formato (e ordem de chaves) de `TaskSerializer`."""
+    tz = timezone.get_current_timezone()
+    data = []
+    for row in rows:
+        task_id = row['id']
+        data.append({
+            'id': task_id,
+            'title': row['title'],
+            'description': row['description'],
+            'solution': row['solution'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'project': row['project_id'],
+            'responsavel': row['responsavel_id'],
+            'assigned_to': assigned.get(task_id, []),
+            'department': departments.get(task_id, []),
+            'order': row['order'],
+            'start_date': format_date(row['start_date']),
+            'deadline': format_date(row['deadline']),
+            'completed_at': format_datetime(row['completed_at'], tz),
+            'created_at': format_datetime(row['created_at'], tz),
+            'updated_at': format_datetime(row['updated_at'], tz),
+            'project_name': row['project__name'],
+            'responsavel_name': row['responsavel__name'],
+            'assigned_to_names': row['assigned_to_names'],
+            'department_names': row['department_names'],
+            'subtasks': [
+                {
+                    'id': sub_id,
+                    'task': sub_task_id,
+                    'title': title,
+                    'is_done': is_done,
+                    'order': order,
+                    'created_at': format_datetime(created_at, tz),
+                    'updated_at': format_datetime(updated_at, tz),
+                }
+                for sub_id, sub_task_id, title, is_done, order, created_at, updated_at
+                in subtasks.get(task_id, ())
+            ],
+        })
+    return data
+
+
+def serialize_task_rows(rows, fields=None):
+    """Serializa linhas de `task_rows` (ja paginadas) como `TaskSerializer(many=True)`.
+
+    Com `fields`, so esses campos saem e so as relacoes deles sao consultadas.
+    """
+    with serializing():
+        rows = list(rows)
+        relations = fetch_relations([row['id'] for row in rows], relation_fields(fields))
+        return assemble_fields(rows, relations, fields)
+
+
+async def aserialize_task_rows(rows, fields=None):
+    """`serialize_task_rows` para linhas ja lidas, com `afetch_relations`."""
+    relations = await afetch_relations([row['id'] for row in rows], relation_fields(fields))
+    return assemble_fields(rows, relations, fields)
+
+
+def relation_fields(fields):
+    if fields is None:
+        return RELATION_FIELDS
+    return [name for name in RELATION_FIELDS if name in fields]
+
+
+def assemble_fields(rows, relations, fields):
+    if fields is None:
+        return assemble_tasks(rows, *relations)
+    empty = dict.fromkeys(TASK_COLUMNS)
+    items = assemble_tasks([{**empty, **row} for row in rows], *relations)
+    return [{key: value for key, value in item.items() if key in fields} for item in items]
@@ -0,0 +1,346 @@
+"""Importacao em lote de setores, colaboradores e tarefas (com subtarefas).
+
+Le CSV, JSON Lines ou JSON (lista de objetos) em streaming e processa lotes
+de `IMPORT_BATCH_SIZE` linhas: valida cada linha com as regras dos modelos,
+resolve as referencias (projeto, pessoas e setores por nome, e-mail ou id)
+em dicionarios carregados uma unica vez e grava o lote com `bulk_create`,
+inclusive nas tabelas M2M, numa transacao propria. Linhas invalidas entram no
+relatorio e nao impedem as demais.
+
+`bulk_create` nao dispara `post_save`; o importador faz o trabalho dos
+receivers de `tasks.signals`: nomes desnormalizados, historico de status,
+rollup de `/tasks/stats/` e `bulk_updated` (cache de respostas e tempo real).
+
+Colunas (vazias sao ignoradas; listas em CSV separadas por `;`):
+
+- departments: name, description, department_type (main/sub), parent_department, is_active
+- collaborators: name, email, phone, position, department, is_active
+- tasks: title, description, solution, status, priority, project, responsavel,
+  assigned_to, department, start_date, deadline, completed_at, subtasks
+"""
+
+import csv
+import json
+import os
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from collaborators.models import Collaborator
+from departments.models import Department
+from projectsmanager.models import Project
+from . import stats
+from .export import chunked
+from .models import Subtask, Task, TaskTransition
+from .ordering import ORDER_GAP, rank_between
+from .signals import bulk_updated
+
+# Linhas validadas e gravadas por transacao.
+IMPORT_BATCH_SIZE = 1000
+
+# Erros detalhados no relatorio (`failed` conta todos).
+MAX_REPORTED_ERRORS = 1000
+
+LIST_SEPARATOR = ';'
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'json'}
+
+# Nome ambiguo (mais de um registro): precisa ser referenciado por id ou e-mail.
+AMBIGUOUS = object()
+
+
+def guess_format(filename):
+    """Formato pela extensao do arquivo, ou None."""
+    return FORMATS.get(os.path.splitext(filename or '')[1].lower())
+
+
+def read_rows(stream, file_format):
+    """`(linha, objeto)` de um arquivo texto; linhas JSON invalidas viram `(linha, None)`."""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == 'jsonl':
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, None
+    elif file_format == 'json':
+        data = json.load(stream)
+        if not isinstance(data, list):
+            raise ValueError('O arquivo JSON precisa conter uma lista de objetos.')
+        yield from enumerate(data, start=1)
+    else:
+        raise ValueError(f'Formato desconhecido: {file_format}.')
+
+
+def blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def split_list(value):
+    """Lista de um valor JSON (lista) ou CSV (`a; b`)."""
+    if blank(value):
+        return []
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if not blank(item)]
+    return [item.strip() for item in str(value).split(LIST_SEPARATOR) if item.strip()]
+
+
+def model_values(row, columns):
+    """Colunas preenchidas da linha (strings sem espacos nas pontas)."""
+    values = {}
+    for column in columns:
+        value = row.get(column)
+        if not blank(value):
+            values[column] = value.strip() if isinstance(value, str) else value
+    return values
+
+
+def _add(index, key, pk):
+    key = key.casefold()
+    index[key] = AMBIGUOUS if index.get(key, pk) != pk else pk
+
+
+class Lookups:
+    """Referencias por nome/e-mail/id, carregadas uma vez e completadas a cada lote."""
+
+    def __init__(self):
+        self.projects, self.project_ids = {}, set()
+        for pk, name in Project.objects.values_list('id', 'name'):
+            _add(self.projects, name, pk)
+            self.project_ids.add(pk)
+        self.collaborators, self.emails, self.collaborator_names = {}, {}, {}
+        self.register_collaborators(Collaborator.objects.only('id', 'name', 'email'))
+        self.departments, self.department_names, self.department_types = {}, {}, {}
+        self.register_departments(Department.objects.only('id', 'name', 'department_type'))
+        self.last_order = dict(Task.objects.order_by().values_list('status').annotate(last=Max('order')))
+        # Chaves reservadas pelo lote em validacao (duplicatas no proprio arquivo).
+        self.pending = {}
+        self.line = None
+
+    def register_collaborators(self, collaborators):
+        for collaborator in collaborators:
+            _add(self.collaborators, collaborator.name, collaborator.pk)
+            self.emails[collaborator.email.casefold()] = collaborator.pk
+            self.collaborator_names[collaborator.pk] = collaborator.name
+
+    def register_departments(self, departments):
+        for department in departments:
+            _add(self.departments, department.name, department.pk)
+            self.department_names[department.pk] = department.name
+            self.department_types[department.pk] = department.department_type
+
+    def resolve(self, value, index, ids, field, errors, by_email=False):
+        """Id referenciado por `value` (e-mail, nome ou id), ou None com erro em `errors`."""
+        key = str(value).strip().casefold()
+        pk = (self.emails.get(key) if by_email else None) or index.get(key)
+        if pk is None and str(value).strip().isdigit() and int(value) in ids:
+            pk = int(value)
+        if pk is AMBIGUOUS:
+            errors.setdefault(field, []).append(f'"{value}" e ambiguo; use o id.')
+            return None
+        if pk is None:
+            errors.setdefault(field, []).append(f'"{value}" nao encontrado.')
+        return pk
+
+    def project(self, value, errors):
+        return self.resolve(value, self.projects, self.project_ids, 'project', errors)
+
+    def collaborator(self, value, field, errors):
+        return self.resolve(value, self.collaborators, self.collaborator_names, field, errors, by_email=True)
+
+    def department(self, value, field, errors):
+        return self.resolve(value, self.departments, self.department_names, field, errors)
+
+    def reserve(self, kind, key, field, errors):
+        """Marca `key` como usado no lote; duplicata no arquivo vira erro."""
+        keys = self.pending.setdefault(kind, {})
+        if key in keys:
+            errors.setdefault(field, []).append(f'Repetido no arquivo (linha {keys[key]}).')
+        keys[key] = self.line
+
+    def next_order(self, status):
+        """`order` para acrescentar a tarefa no fim da coluna."""
+        self.last_order[status] = rank_between(self.last_order.get(status), None)
+        return self.last_order[status]
+
+    def names(self, ids, names):
+        return [names[pk] for pk in sorted(ids, key=lambda pk: (names[pk], pk))]
+
+
+def clean_instance(instance, exclude, errors):
+    """Valida os campos pelas regras do modelo (sem consultar FKs)."""
+    try:
+        instance.clean_fields(exclude=exclude)
+    except ValidationError as exc:
+        for field, messages in exc.message_dict.items():
+            errors.setdefault(field, []).extend(messages)
+
+
+def build_department(row, lookups):
+    errors = {}
+    department = Department(**model_values(row, ('name', 'description', 'department_type', 'is_active')))
+    clean_instance(department, ['parent_department'], errors)
+    if department.name:
+        if department.name.casefold() in lookups.departments:
+            errors.setdefault('name', []).append('Setor ja existe.')
+        lookups.reserve('department', department.name.casefold(), 'name', errors)
+    parent = row.get('parent_department')
+    if department.department_type == Department.TYPE_SUB:
+        parent_pending = lookups.pending.get('department_objects', {}).get(str(parent or '').strip().casefold())
+        if blank(parent):
+            errors.setdefault('parent_department', []).append('Subsetor precisa de um setor principal.')
+        elif parent_pending is not None:
+            # Setor principal do mesmo lote: gravado antes dos subsetores.
+            department.parent_department = parent_pending
+        else:
+            parent_id = lookups.department(parent, 'parent_department', errors)
+            if parent_id is not None and lookups.department_types[parent_id] != Department.TYPE_MAIN:
+                errors.setdefault('parent_department', []).append('O setor pai precisa ser um setor principal.')
+            department.parent_department_id = parent_id
+    if errors:
+        raise ValidationError(errors)
+    if department.department_type == Department.TYPE_MAIN:
+        lookups.pending.setdefault('department_objects', {})[department.name.casefold()] = department
+    return department
+
+
+def write_departments(departments, lookups):
+    # Principais primeiro: subsetores do lote apontam para eles.
+    for department_type in (Department.TYPE_MAIN, Department.TYPE_SUB):
+        Department.objects.bulk_create([d for d in departments if d.department_type == department_type])
+    bulk_updated.send(sender=Department, instances=departments)
+    return lambda: lookups.register_departments(departments)
+
+
+def build_collaborator(row, lookups):
+    errors = {}
+    collaborator = Collaborator(**model_values(row, ('name', 'email', 'phone', 'position', 'is_active')))
+    clean_instance(collaborator, ['department'], errors)
+    if collaborator.email:
+        email = collaborator.email.casefold()
+        if email in lookups.emails:
+            errors.setdefault('email', []).append('Colaborador com este e-mail ja existe.')
+        lookups.reserve('collaborator', email, 'email', errors)
+    if not blank(row.get('department')):
+        collaborator.department_id = lookups.department(row['department'], 'department', errors)
+    if errors:
+        raise ValidationError(errors)
+    return collaborator
+
+
+def write_collaborators(collaborators, lookups):
+    Collaborator.objects.bulk_create(collaborators)
+    bulk_updated.send(sender=Collaborator, instances=collaborators)
+    return lambda: lookups.register_collaborators(collaborators)
+
+
+TASK_FIELDS = ('title', 'description', 'solution', 'status', 'priority', 'start_date', 'deadline', 'completed_at')
+
+
+def build_task(row, lookups):
+    """`(tarefa, ids atribuidos, ids de setores, titulos das subtarefas)`."""
+    errors = {}
+    task = Task(**model_values(row, TASK_FIELDS))
+    clean_instance(task, ['project', 'responsavel', 'assigned_to_names', 'department_names'], errors)
+    if not blank(row.get('project')):
+        task.project_id = lookups.project(row['project'], errors)
+    if not blank(row.get('responsavel')):
+        task.responsavel_id = lookups.collaborator(row['responsavel'], 'responsavel', errors)
+    assigned = {lookups.collaborator(value, 'assigned_to', errors) for value in split_list(row.get('assigned_to'))}
+    departments = {lookups.department(value, 'department', errors) for value in split_list(row.get('department'))}
+    subtasks = [str(title).strip() for title in split_list(row.get('subtasks'))]
+    if errors:
+        raise ValidationError(errors)
+    return task, sorted(assigned), sorted(departments), subtasks
+
+
+def write_tasks(pending, lookups):
+    now = timezone.now()
+    tasks = []
+    for task, assigned, departments, _ in pending:
+        # Mesma regra de `TaskSerializer.create` para tarefas ja concluidas.
+        if task.status == 'DONE' and task.completed_at is None:
+            task.completed_at = now
+        task.order = lookups.next_order(task.status)
+        task.assigned_to_names = lookups.names(assigned, lookups.collaborator_names)
+        task.department_names = lookups.names(departments, lookups.department_names)
+        tasks.append(task)
+    Task.objects.bulk_create(tasks)
+
+    assigned_through, department_through = Task.assigned_to.through, Task.department.through
+    assigned_rows, department_rows, subtasks, transitions = [], [], [], []
+    keys = Counter()
+    for task, assigned, departments, titles in pending:
+        assigned_rows += [assigned_through(task_id=task.pk, collaborator_id=pk) for pk in assigned]
+        department_rows += [department_through(task_id=task.pk, department_id=pk) for pk in departments]
+        subtasks += [
+            Subtask(task_id=task.pk, title=title, order=index * ORDER_GAP)
+            for index, title in enumerate(titles, start=1)
+        ]
+        transitions.append(TaskTransition.build(task.pk, None, task.status, task.created_at))
+        keys.update(stats.task_keys(stats.instance_fields(task), assigned, departments))
+    assigned_through.objects.bulk_create(assigned_rows)
+    department_through.objects.bulk_create(department_rows)
+    Subtask.objects.bulk_create(subtasks)
+    TaskTransition.objects.bulk_create(transitions)
+    stats.apply_delta((), keys)
+    bulk_updated.send(sender=Task, instances=tasks)
+
+
+IMPORTERS = {
+    'departments': (build_department, write_departments),
+    'collaborators': (build_collaborator, write_collaborators),
+    'tasks': (build_task, write_tasks),
+}
+
+
+def _report_error(report, line, errors):
+    report['failed'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'line': line, 'errors': errors})
+
+
+def import_rows(kind, rows, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """Importa `(linha, objeto)` de `read_rows` em lotes.
+
+    Retorna `{'created', 'failed', 'errors': [{'line', 'errors': {campo: [mensagens]}}]}`.
+    `progress(report)` e chamado apos cada lote.
+    """
+    build, write = IMPORTERS[kind]
+    lookups = Lookups()
+    report = {'created': 0, 'failed': 0, 'errors': []}
+    for batch in chunked(rows, batch_size):
+        lookups.pending = {}
+        valid = []
+        for line, row in batch:
+            if not isinstance(row, dict):
+                _report_error(report, line, {'non_field_errors': ['Linha invalida: esperado um objeto.']})
+                continue
+            lookups.line = line
+            try:
+                valid.append((line, build(row, lookups)))
+            except ValidationError as exc:
+                _report_error(report, line, exc.message_dict)
+        if valid:
+            try:
+                with transaction.atomic():
+                    register = write([item for _, item in valid], lookups)
+            except IntegrityError as exc:
+                # Conflito com gravacao concorrente: o lote inteiro e desfeito.
+                for line, _ in valid:
+                    _report_error(report, line, {'non_field_errors': [f'Lote rejeitado pelo banco: {exc}']})
+            else:
+                if register:
+                    register()
+                report['created'] += len(valid)
+        if progress:
+            progress(report)
+    return report
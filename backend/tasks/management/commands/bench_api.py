@@ -0,0 +1,233 @@
+"""Benchmark das rotas GET de `/api/v1/`: latencia p50/p99, consultas e bytes.
+
+Descobre as rotas pelo resolver (todo ViewSet/acao que aceita GET, com
+algumas variacoes de query string em `VARIANTS`), mede cada uma com o
+`APIClient` autenticado como admin e grava o resultado em JSON. Com
+`--compare`, confronta com uma execucao anterior e falha se alguma rota
+piorou alem da tolerancia.
+
+    python manage.py bench_api --seed-tasks 50000 --output bench.json
+    python manage.py bench_api --seed-tasks 50000 --compare bench.json
+
+Tudo roda numa transacao desfeita ao final: o quadro sintetico de
+`--seed-tasks` (`tasks.seed`) e o usuario do benchmark nao ficam no banco; sem
+`--seed-tasks`, mede os dados existentes. Throttles ficam desligados e o
+cache de respostas tambem (mede a view), a menos que se passe `--warm-cache`.
+"""
+
+import json
+import math
+import time
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from projectsmanager.models import Project
+from tasks.models import Task
+from tasks.seed import seed_board
+
+API_PREFIX = 'api/v1/'
+
+
+def first_project_id():
+    """Primeiro projeto do banco (o quadro sintetico ja esta criado quando a rota e medida)."""
+    return Project.objects.order_by('id').values_list('id', flat=True).first() or 0
+
+
+# Query strings extras por rota (alem da chamada sem parametros).
+VARIANTS = {
+    'task-list': [
+        {'q': 'relatorio'},
+        {'since': lambda: (timezone.now() - timedelta(hours=1)).isoformat()},
+        {'fields': 'id,title,status,priority'},
+        {'expand': 'project,responsavel'},
+    ],
+    'task-export': [{'format': 'jsonl'}],
+    'task-stats': [{'project': first_project_id}],
+}
+
+# Tolerancias padrao do `--compare`.
+LATENCY_TOLERANCE = 0.25
+LATENCY_FLOOR_MS = 5.0
+BYTES_TOLERANCE = 0.10
+
+
+class Rollback(Exception):
+    """Desfaz os dados do benchmark ao final."""
+
+
+def api_routes(prefix=API_PREFIX):
+    """`(nome, padrao)` de cada rota GET sob `prefix`, sem sufixos de formato nem SSE."""
+    def walk(patterns, base):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, base + str(pattern.pattern))
+            else:
+                yield base + str(pattern.pattern), pattern
+
+    routes = {}
+    for path, pattern in walk(get_resolver().url_patterns, ''):
+        if not path.lstrip('^').startswith(prefix) or not pattern.name or pattern.name in routes:
+            continue
+        if 'format' in pattern.pattern.regex.groupindex or iscoroutinefunction(pattern.callback):
+            continue
+        actions = getattr(pattern.callback, 'actions', None)
+        view_class = getattr(pattern.callback, 'cls', None)
+        if actions is not None and 'get' not in actions:
+            continue
+        if actions is None and view_class is not None and not hasattr(view_class, 'get'):
+            continue
+        routes[pattern.name] = pattern
+    return list(routes.items())
+
+
+def route_url(name, pattern):
+    """URL da rota; rotas de detalhe usam o primeiro objeto do modelo do ViewSet."""
+    kwargs = {}
+    if 'pk' in pattern.pattern.regex.groupindex:
+        model = pattern.callback.cls.queryset.model
+        pk = model.objects.order_by('pk').values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+        kwargs['pk'] = pk
+    return reverse(name, kwargs=kwargs)
+
+
+def percentile(samples, p):
+    """Percentil por posicao mais proxima (`samples` ordenadas)."""
+    return samples[max(0, math.ceil(len(samples) * p / 100) - 1)]
+
+
+def measure(client, url, repeat, warmup):
+    """Executa `warmup + repeat` GETs; retorna status, latencias, consultas e bytes."""
+    timings = []
+    for index in range(warmup + repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            elapsed = (time.perf_counter() - start) * 1000
+        if index >= warmup:
+            timings.append(elapsed)
+    timings.sort()
+    return {
+        'url': url,
+        'status': response.status_code,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'queries': len(queries),
+        'bytes': len(body),
+    }
+
+
+def find_regressions(baseline, current, latency_tolerance=LATENCY_TOLERANCE, bytes_tolerance=BYTES_TOLERANCE):
+    """Regressoes de `current` em relacao a `baseline`: lista de `(rota, metrica, antes, depois)`.
+
+    Consultas nao tem tolerancia; latencia so conta acima de `LATENCY_FLOOR_MS`
+    de diferenca (ruido da maquina).
+    """
+    regressions = []
+    for route, after in current['routes'].items():
+        before = baseline['routes'].get(route)
+        if before is None:
+            continue
+        if after['queries'] > before['queries']:
+            regressions.append((route, 'queries', before['queries'], after['queries']))
+        for metric in ('p50_ms', 'p99_ms'):
+            limit = before[metric] * (1 + latency_tolerance)
+            if after[metric] > limit and after[metric] - before[metric] > LATENCY_FLOOR_MS:
+                regressions.append((route, metric, before[metric], after[metric]))
+        if after['bytes'] > before['bytes'] * (1 + bytes_tolerance):
+            regressions.append((route, 'bytes', before['bytes'], after['bytes']))
+    return regressions
+
+
+class Command(BaseCommand):
+    help = "Mede latencia, consultas e bytes das rotas GET de /api/v1/ e compara com execucoes anteriores."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-tasks', type=int, help="Cria um quadro sintetico com N tarefas (rollback ao final).")
+        parser.add_argument('--requests', type=int, default=20, help="Requisicoes medidas por rota.")
+        parser.add_argument('--warmup', type=int, default=2, help="Requisicoes descartadas antes da medicao.")
+        parser.add_argument('--routes', nargs='+', default=[], help="Mede so as rotas que contem estes trechos.")
+        parser.add_argument('--warm-cache', action='store_true', help="Mantem o cache de respostas ligado.")
+        parser.add_argument('--output', help="Grava o resultado em JSON.")
+        parser.add_argument('--compare', help="JSON de uma execucao anterior; falha se houver regressao.")
+        parser.add_argument('--tolerance', type=float, default=LATENCY_TOLERANCE, help="Piora de latencia aceita (0.25 = 25%%).")
+
+    def handle(self, *args, seed_tasks, requests, warmup, routes, warm_cache, output, compare, tolerance, **options):
+        if requests < 1:
+            raise CommandError("--requests precisa ser ao menos 1.")
+        baseline = None
+        if compare:
+            try:
+                with open(compare, encoding='utf-8') as stream:
+                    baseline = json.load(stream)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Nao foi possivel ler {compare}: {exc}")
+
+        try:
+            with transaction.atomic():
+                if seed_tasks:
+                    self.stdout.write(f"Criando quadro com {seed_tasks} tarefas...")
+                    seed_board(tasks=seed_tasks, collaborators=max(50, seed_tasks // 100), projects=max(10, seed_tasks // 1000))
+                client = APIClient()
+                client.force_authenticate(User.objects.create_superuser(username=f'bench-{time.time_ns()}'))
+                settings_override = {} if warm_cache else {'RESPONSE_CACHE_TIMEOUT': 0}
+                with override_settings(**settings_override), mock.patch.object(APIView, 'get_throttles', return_value=[]):
+                    result = self.run_routes(client, routes, requests, warmup)
+                result['tasks'] = Task.objects.count()
+                raise Rollback
+        except Rollback:
+            pass
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as stream:
+                json.dump(result, stream, indent=2, sort_keys=True)
+            self.stdout.write(f"Resultado gravado em {output}.")
+        if baseline is not None:
+            regressions = find_regressions(baseline, result, tolerance)
+            for route, metric, before, after in regressions:
+                self.stderr.write(f"{route}: {metric} {before:g} -> {after:g}")
+            if regressions:
+                raise CommandError(f"{len(regressions)} regressoes em relacao a {compare}.")
+            self.stdout.write(self.style.SUCCESS(f"Sem regressoes em relacao a {compare}."))
+
+    def run_routes(self, client, filters, requests, warmup):
+        result = {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'requests': requests,
+            'routes': {},
+        }
+        self.stdout.write(f"{'rota':<48} {'p50 ms':>8} {'p99 ms':>8} {'consultas':>9} {'bytes':>10}")
+        for name, pattern in api_routes():
+            url = route_url(name, pattern)
+            if url is None:
+                continue
+            for params in [{}, *VARIANTS.get(name, [])]:
+                query = urlencode({key: value() if callable(value) else value for key, value in params.items()})
+                # Valores calculados (ex.: `since`) ficam fora do rotulo para comparar execucoes.
+                shown = '&'.join(key if callable(value) else f'{key}={value}' for key, value in params.items())
+                label = f"GET {name}" + (f"?{shown}" if shown else '')
+                if filters and not any(text in label for text in filters):
+                    continue
+                item = measure(client, f"{url}?{query}" if query else url, requests, warmup)
+                result['routes'][label] = item
+                self.stdout.write(
+                    f"{label:<48} {item['p50_ms']:>8.1f} {item['p99_ms']:>8.1f} {item['queries']:>9} {item['bytes']:>10}"
+                    + ('' if item['status'] == 200 else f"  (HTTP {item['status']})")
+                )
+        return result
+
@@ -0,0 +1,147 @@
+"""Carga de conexoes: N clientes concorrentes disputando o banco.
+
+Simula os greenlets de um worker (aqui sao threads; sob o gevent o
+`threading.local` das conexoes do Django vira local de greenlet): cada
+cliente abre a conexao do Django, segura-a numa transacao por `--hold`
+segundos e a fecha, como no fim de cada requisicao. Uma conexao a parte conta
+as conexoes do banco em `pg_stat_activity` a cada `--interval` segundos:
+
+    DB_POOL=True DB_POOL_MAX_SIZE=10 python manage.py bench_connections \\
+        --clients 1000 --duration 30 --output conexoes.json
+
+Com o pool (DB_POOL), a contagem fica estavel em ate DB_POOL_MAX_SIZE e os
+clientes esperam a vez (latencia); sem ele, cresce com os clientes ate o
+`max_connections` do Postgres e as requisicoes seguintes falham. Em SQLite so
+mede vazao e erros.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+
+from .bench_api import percentile
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = []
+        self.errors = 0
+
+    def add(self, elapsed=None):
+        with self.lock:
+            if elapsed is None:
+                self.errors += 1
+            else:
+                self.timings.append(elapsed)
+
+
+def open_sampler():
+    """Conexao fora do Django (e do pool) para ler `pg_stat_activity`; None fora do Postgres."""
+    if connection.vendor != 'postgresql':
+        return None
+    raw = connection.Database.connect(**connection.get_connection_params())
+    # Em transacao, o Postgres congelaria a visao de `pg_stat_activity`.
+    raw.autocommit = True
+    return raw
+
+
+def count_connections(raw):
+    """Conexoes ao banco atual, sem a do amostrador."""
+    with raw.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity"
+            " WHERE datname = current_database() AND pid <> pg_backend_pid()"
+        )
+        return cursor.fetchone()[0]
+
+
+def client(deadline, hold, stats):
+    """Um cliente: requisicoes que seguram a conexao por `hold` segundos ate `deadline`."""
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                time.sleep(hold)
+        except DatabaseError:
+            stats.add()
+        else:
+            stats.add(time.monotonic() - started)
+        finally:
+            # Fim da requisicao: sem pool fecha a conexao, com pool a devolve.
+            connection.close()
+
+
+def run_load(clients, duration, hold, interval):
+    """Roda a carga e retorna vazao, latencia, erros e as amostras de conexoes."""
+    stats, samples = Stats(), []
+    sampler = open_sampler()
+    baseline = count_connections(sampler) if sampler else None
+    deadline = time.monotonic() + duration
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            futures = [executor.submit(client, deadline, hold, stats) for _ in range(clients)]
+            while not all(future.done() for future in futures):
+                if sampler:
+                    samples.append(count_connections(sampler))
+                time.sleep(interval)
+    finally:
+        if sampler:
+            sampler.close()
+
+    timings = sorted(stats.timings)
+    pool = connection.settings_dict['OPTIONS'].get('pool')
+    return {
+        'database': connection.vendor,
+        'pool': pool if isinstance(pool, dict) else bool(pool),
+        'clients': clients,
+        'duration_s': duration,
+        'hold_ms': round(hold * 1000, 2),
+        'requests': len(timings),
+        'rps': round(len(timings) / duration, 1),
+        'errors': stats.errors,
+        'p50_ms': round(percentile(timings, 50) * 1000, 2) if timings else None,
+        'p99_ms': round(percentile(timings, 99) * 1000, 2) if timings else None,
+        'connections': {
+            'baseline': baseline,
+            'min': min(samples) if samples else None,
+            'max': max(samples) if samples else None,
+            'samples': samples,
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = "Simula clientes concorrentes segurando conexoes e mede quantas o banco recebe."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200, help="Clientes concorrentes (threads).")
+        parser.add_argument('--duration', type=float, default=10, help="Segundos de carga.")
+        parser.add_argument('--hold', type=float, default=0.05, help="Segundos com a conexao em uso por requisicao.")
+        parser.add_argument('--interval', type=float, default=0.5, help="Segundos entre as amostras de conexoes.")
+        parser.add_argument('--output', help="Grava o resultado em JSON.")
+
+    def handle(self, *args, clients, duration, hold, interval, output, **options):
+        if clients < 1 or duration <= 0:
+            raise CommandError("--clients e --duration precisam ser positivos.")
+        result = run_load(clients, duration, hold, interval)
+        conns = result['connections']
+        self.stdout.write(
+            f"{result['requests']} requisicoes ({result['rps']:.1f}/s), {result['errors']} erros,"
+            f" p50 {result['p50_ms'] or 0:.1f} ms, p99 {result['p99_ms'] or 0:.1f} ms"
+        )
+        if conns['max'] is not None:
+            self.stdout.write(
+                f"Conexoes: {conns['baseline']} antes, {conns['min']}-{conns['max']} sob carga"
+                f" ({len(conns['samples'])} amostras)."
+            )
+        if output:
+            with open(output, 'w', encoding='utf-8') as stream:
+                json.dump(result, stream, indent=2, sort_keys=True)
+            self.stdout.write(f"Resultado gravado em {output}.")
@@ -0,0 +1,182 @@
+"""Carga de polling: N clientes concorrentes fazendo GET em intervalo fixo.
+
+Compara o gevent/WSGI (servico `web`) com o ASGI (`events`, rotas de
+`tasks.async_views`) sob muitos clientes lentos:
+
+    python manage.py bench_pollers --user admin --pollers 1000 --duration 60 \\
+        --target wsgi=http://web:8000/api/v1/tasks/?since= \\
+        --target asgi=http://events:8000/api/v1/async/tasks/?since= \\
+        --output pollers.json
+
+Cada cliente mantem uma conexao keep-alive, reenvia o ETag recebido, segue o
+`cursor` do delta-sync e espera `--interval` segundos entre as requisicoes.
+Os alvos rodam um depois do outro; o resultado traz requisicoes por segundo,
+latencia p50/p99, respostas 304 e erros (status >= 400, timeouts e conexoes
+recusadas). Rode contra os servidores reais (gunicorn com `gunicorn.conf.py`),
+de outra maquina ou container, e suba o `ulimit -n` do gerador e dos servidores.
+"""
+
+import asyncio
+import json
+import random
+import ssl
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .bench_api import percentile
+
+
+class Stats:
+    def __init__(self):
+        self.timings = []
+        self.not_modified = 0
+        self.errors = 0
+
+    def summary(self, url, pollers, duration):
+        timings = sorted(self.timings)
+        return {
+            'url': url,
+            'pollers': pollers,
+            'duration_s': duration,
+            'requests': len(timings),
+            'rps': round(len(timings) / duration, 1),
+            'not_modified': self.not_modified,
+            'errors': self.errors,
+            'p50_ms': round(percentile(timings, 50) * 1000, 2) if timings else None,
+            'p99_ms': round(percentile(timings, 99) * 1000, 2) if timings else None,
+        }
+
+
+async def read_response(reader):
+    """Le uma resposta HTTP/1.1; retorna `(status, headers, body)`."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('conexao encerrada pelo servidor')
+    status = int(status_line.split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = bytearray()
+        while size := int((await reader.readline()).split(b';')[0], 16):
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+    elif status in (204, 304):
+        body = b''
+    else:
+        body = await reader.read()
+        headers['connection'] = 'close'
+    return status, headers, bytes(body)
+
+
+async def poll(url, token, deadline, interval, timeout, stats):
+    """Um cliente: GETs em `interval` segundos ate `deadline` (relogio do loop)."""
+    loop = asyncio.get_running_loop()
+    etag, connection = None, None
+    await asyncio.sleep(random.uniform(0, interval))
+    while loop.time() < deadline:
+        started = loop.time()
+        parts = urlsplit(url)
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(asyncio.open_connection(
+                    parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80),
+                    ssl=ssl.create_default_context() if parts.scheme == 'https' else None,
+                ), timeout)
+            reader, writer = connection
+            lines = [
+                f"GET {parts.path}{'?' + parts.query if parts.query else ''} HTTP/1.1",
+                f"Host: {parts.netloc}",
+                "Accept: application/json",
+                f"Authorization: Bearer {token}",
+            ]
+            if etag:
+                lines.append(f"If-None-Match: {etag}")
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+            await writer.drain()
+            status, headers, body = await asyncio.wait_for(read_response(reader), timeout)
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            stats.errors += 1
+            if connection is not None:
+                connection[1].close()
+            connection = None
+        else:
+            stats.timings.append(loop.time() - started)
+            if status == 304:
+                stats.not_modified += 1
+            elif status >= 400:
+                stats.errors += 1
+            elif status == 200 and 'since' in parts.query:
+                try:
+                    url = replace_query_param(url, 'since', json.loads(body)['cursor'])
+                except (ValueError, KeyError, TypeError):
+                    pass
+            etag = headers.get('etag', etag)
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                connection = None
+        await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+    if connection is not None:
+        connection[1].close()
+
+
+async def run_target(url, token, pollers, duration, interval, timeout):
+    stats = Stats()
+    deadline = asyncio.get_running_loop().time() + duration
+    await asyncio.gather(*(poll(url, token, deadline, interval, timeout, stats) for _ in range(pollers)))
+    return stats.summary(url, pollers, duration)
+
+
+class Command(BaseCommand):
+    help = "Simula clientes de polling concorrentes e compara a vazao de servidores WSGI e ASGI."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True,
+            help="nome=url (repita para comparar servidores).",
+        )
+        parser.add_argument('--pollers', type=int, default=1000, help="Clientes concorrentes.")
+        parser.add_argument('--duration', type=float, default=60, help="Segundos por alvo.")
+        parser.add_argument('--interval', type=float, default=1, help="Segundos entre as requisicoes de cada cliente.")
+        parser.add_argument('--timeout', type=float, default=30, help="Timeout de cada requisicao (s).")
+        credentials = parser.add_mutually_exclusive_group(required=True)
+        credentials.add_argument('--user', help="Gera um token de acesso para este usuario.")
+        credentials.add_argument('--token', help="Token de acesso JWT.")
+        parser.add_argument('--output', help="Grava o resultado em JSON.")
+
+    def handle(self, *args, target, pollers, duration, interval, timeout, user, token, output, **options):
+        targets = {}
+        for item in target:
+            name, _, url = item.partition('=')
+            if not url.startswith(('http://', 'https://')):
+                raise CommandError(f"Alvo invalido: {item!r} (use nome=http://host:porta/caminho).")
+            targets[name] = url
+        if user:
+            try:
+                token = str(AccessToken.for_user(User.objects.get(username=user)))
+            except User.DoesNotExist:
+                raise CommandError(f"Usuario {user!r} nao encontrado.")
+
+        results = {}
+        self.stdout.write(f"{'alvo':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'304':>7} {'erros':>7}")
+        for name, url in targets.items():
+            item = asyncio.run(run_target(url, token, pollers, duration, interval, timeout))
+            results[name] = item
+            self.stdout.write(
+                f"{name:<10} {item['rps']:>8.1f} {item['p50_ms'] or 0:>8.1f} {item['p99_ms'] or 0:>8.1f}"
+                f" {item['not_modified']:>7} {item['errors']:>7}"
+            )
+        if output:
+            with open(output, 'w', encoding='utf-8') as stream:
+                json.dump({'targets': results}, stream, indent=2, sort_keys=True)
+            self.stdout.write(f"Resultado gravado em {output}.")
@@ -0,0 +1,72 @@
+"""Benchmark: `TaskSerializer` (DRF) x caminho rapido de `fast_serializers`.
+
+Cria quadros sinteticos (`tasks.seed`) dentro de uma transacao que sofre rollback ao final,
+mede as duas serializacoes da listagem (consulta + serializacao + render JSON)
+e confirma que os bytes gerados sao identicos. Com 50k tarefas, rode contra o
+Postgres: o prefetch do DRF estoura o limite de parametros do SQLite.
+
+    python manage.py bench_task_serializer --sizes 1000 10000 50000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from tasks.fast_serializers import serialize_task_rows, task_rows
+from tasks.models import Task
+from tasks.seed import seed_board
+from tasks.serializers import TaskSerializer
+
+
+class Rollback(Exception):
+    """Forca o rollback dos dados sinteticos."""
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+class Command(BaseCommand):
+    help = "Compara TaskSerializer e o caminho rapido de listagem em quadros sinteticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 50000])
+        parser.add_argument('--repeat', type=int, default=3, help="Rodadas por tamanho (usa a melhor).")
+
+    def handle(self, *args, sizes, repeat, **options):
+        renderer = JSONRenderer()
+        base_queryset = (
+            Task.objects.select_related('project', 'responsavel')
+            .prefetch_related('assigned_to', 'department', 'subtasks')
+            .order_by('order', '-id')
+        )
+
+        self.stdout.write(f"{'tarefas':>8} {'drf (s)':>9} {'rapido (s)':>11} {'ganho':>7}")
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    seed_board(tasks=size, prefix='Bench')
+                    drf_times, fast_times = [], []
+                    for _ in range(repeat):
+                        drf_time, drf_body = timed(
+                            lambda: renderer.render(TaskSerializer(base_queryset.all(), many=True).data)
+                        )
+                        fast_time, fast_body = timed(
+                            lambda: renderer.render(serialize_task_rows(task_rows(base_queryset.all())))
+                        )
+                        drf_times.append(drf_time)
+                        fast_times.append(fast_time)
+                    if drf_body != fast_body:
+                        raise CommandError(f"Saidas diferentes com {size} tarefas.")
+                    raise Rollback
+            except Rollback:
+                pass
+
+            drf_best, fast_best = min(drf_times), min(fast_times)
+            self.stdout.write(
+                f"{size:>8} {drf_best:>9.3f} {fast_best:>11.3f} {drf_best / fast_best:>6.1f}x"
+            )
@@ -0,0 +1,25 @@
+"""Mostra os contadores do cache de respostas da API (somados entre workers).
+
+    python manage.py cache_stats [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+
+from app.response_cache import cache_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Exibe acertos, falhas, invalidacoes e despejos do cache de respostas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Zera os contadores depois de exibir.")
+
+    def handle(self, *args, reset, **options):
+        stats = cache_stats()
+        lookups = stats['hits'] + stats['misses']
+        ratio = f"{stats['hits'] / lookups:.1%}" if lookups else '-'
+        for name, value in stats.items():
+            self.stdout.write(f"{name}: {'-' if value is None else value}")
+        self.stdout.write(f"hit_ratio: {ratio}")
+        if reset:
+            reset_stats()
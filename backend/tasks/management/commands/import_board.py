@@ -0,0 +1,48 @@
+"""Importa setores, colaboradores ou tarefas de um arquivo CSV, JSON Lines ou JSON.
+
+Para migrar quadros de outras ferramentas sem milhares de POSTs na API
+(colunas em `tasks.importer`). Importe na ordem das dependencias:
+
+    python manage.py import_board departments setores.csv
+    python manage.py import_board collaborators pessoas.csv
+    python manage.py import_board tasks tarefas.jsonl --batch-size 2000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import IMPORT_BATCH_SIZE, IMPORTERS, guess_format, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = "Importa em lote (bulk_create) setores, colaboradores ou tarefas e relata os erros por linha."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', dest='file_format', choices=['csv', 'jsonl', 'json'],
+            help="Formato do arquivo (padrao: pela extensao).",
+        )
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help="Linhas por transacao.")
+
+    def handle(self, *args, kind, path, file_format, batch_size, **options):
+        file_format = file_format or guess_format(path)
+        if file_format is None:
+            raise CommandError("Informe --format (csv, jsonl ou json).")
+
+        def progress(report):
+            self.stdout.write(f"{report['created']} importadas, {report['failed']} com erro...")
+
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as stream:
+                report = import_rows(kind, read_rows(stream, file_format), batch_size, progress)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors']:
+            for field, messages in error['errors'].items():
+                self.stderr.write(f"linha {error['line']}: {field}: {' '.join(messages)}")
+        if report['failed'] > len(report['errors']):
+            self.stderr.write(f"... e mais {report['failed'] - len(report['errors'])} linhas com erro.")
+        style = self.style.WARNING if report['failed'] else self.style.SUCCESS
+        self.stdout.write(style(f"{report['created']} importadas, {report['failed']} com erro."))
@@ -0,0 +1,31 @@
+"""Apaga registros de exclusao de tarefas fora da retencao do delta-sync.
+
+Pensado para rodar periodicamente (cron). Cursores `?since=` mais antigos que
+a retencao ja recebem 410, entao esses registros nao sao mais lidos:
+
+    python manage.py prune_task_tombstones
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    help = "Apaga os registros de tarefas excluidas mais antigos que TASK_TOMBSTONE_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help="Retencao em dias (padrao: TASK_TOMBSTONE_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, days, **options):
+        days = settings.TASK_TOMBSTONE_RETENTION_DAYS if days is None else days
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"{deleted} registros de exclusao anteriores a {cutoff:%Y-%m-%d %H:%M} apagados.")
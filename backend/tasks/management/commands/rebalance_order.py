@@ -0,0 +1,47 @@
+"""Renumera colunas do kanban cujas lacunas de `order` estao se esgotando.
+
+Pensado para rodar periodicamente (cron), mantendo os movimentos de card
+sempre em uma unica gravacao:
+
+    python manage.py rebalance_order --min-gap 16
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.models import Subtask, Task
+from tasks.ordering import (
+    SUBTASK_COLUMN_ORDERING, TASK_COLUMN_ORDERING, TASK_COLUMN_SCOPE, needs_rebalance, rebalance,
+)
+from tasks.signals import bulk_updated
+
+
+class Command(BaseCommand):
+    help = "Renumera (com lacunas) as colunas de tarefas e as listas de subtarefas apertadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-gap', type=int, default=16,
+            help="Renumera a coluna se houver vizinhos com lacuna menor que este valor.",
+        )
+        parser.add_argument('--force', action='store_true', help="Renumera todas as colunas.")
+
+    def handle(self, *args, min_gap, force, **options):
+        scopes = Task.objects.order_by().values(*TASK_COLUMN_SCOPE).distinct()
+        columns = [(Task, Task.objects.filter(**scope), TASK_COLUMN_ORDERING) for scope in scopes]
+        task_ids = Subtask.objects.order_by().values_list('task_id', flat=True).distinct()
+        columns += [
+            (Subtask, Subtask.objects.filter(task_id=task_id), SUBTASK_COLUMN_ORDERING)
+            for task_id in task_ids
+        ]
+
+        total = 0
+        for model, siblings, ordering in columns:
+            if not force and not needs_rebalance(siblings, min_gap):
+                continue
+            with transaction.atomic():
+                changed = rebalance(siblings, ordering)
+                if changed:
+                    bulk_updated.send(sender=model, instances=changed)
+            total += len(changed)
+        self.stdout.write(self.style.SUCCESS(f"{total} posicoes renumeradas."))
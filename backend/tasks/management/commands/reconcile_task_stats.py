@@ -0,0 +1,23 @@
+"""Recalcula o rollup `TaskStat` a partir das tarefas.
+
+Os sinais mantem o rollup incrementalmente; este comando (cron) corrige
+desvios de gravacoes concorrentes ou de alteracoes feitas fora do ORM:
+
+    python manage.py reconcile_task_stats [--check]
+"""
+
+from django.core.management.base import BaseCommand
+
+from tasks.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcula as contagens de /tasks/stats/ e informa quantas chaves divergiam."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Apenas conta as divergencias, sem gravar.")
+
+    def handle(self, *args, check, **options):
+        drift = rebuild_stats(dry_run=check)
+        verb = "divergentes" if check else "corrigidas"
+        self.stdout.write(self.style.SUCCESS(f"{drift} chaves {verb}."))
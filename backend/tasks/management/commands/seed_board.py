@@ -0,0 +1,46 @@
+"""Popula o banco com um quadro sintetico realista (carga, benchmarks, demos).
+
+Gera setores com subsetores, colaboradores, projetos e tarefas com
+responsaveis, setores e subtarefas (ver `tasks.seed`):
+
+    python manage.py seed_board --tasks 50000 --projects 40 --collaborators 300
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.seed import seed_board
+
+
+class Command(BaseCommand):
+    help = "Cria setores, colaboradores, projetos e tarefas sinteticos em lote."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=10)
+        parser.add_argument('--departments', type=int, default=5, help="Setores principais.")
+        parser.add_argument('--subdepartments', type=int, default=3, help="Maximo de subsetores por setor.")
+        parser.add_argument('--collaborators', type=int, default=50)
+        parser.add_argument('--max-assignees', type=int, default=3, help="Maximo de responsaveis por tarefa.")
+        parser.add_argument('--max-subtasks', type=int, default=4, help="Maximo de subtarefas por tarefa.")
+        parser.add_argument('--seed', type=int, default=0, help="Semente do gerador (mesmo quadro a cada execucao).")
+        parser.add_argument('--prefix', default='Seed', help="Prefixo dos nomes gerados.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with transaction.atomic():
+            created = seed_board(
+                tasks=options['tasks'],
+                projects=options['projects'],
+                departments=options['departments'],
+                subdepartments=options['subdepartments'],
+                collaborators=options['collaborators'],
+                max_assignees=options['max_assignees'],
+                max_subtasks=options['max_subtasks'],
+                seed=options['seed'],
+                prefix=options['prefix'],
+            )
+        summary = ', '.join(f"{total} {name}" for name, total in created.items())
+        self.stdout.write(self.style.SUCCESS(f"Criados: {summary} ({time.perf_counter() - start:.1f}s)."))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_add_composite_index_project_status_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField(verbose_name='Tarefa')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Excluida Em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa Excluida',
+                'verbose_name_plural': 'Tarefas Excluidas',
+                'ordering': ['deleted_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Atualizado Em'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:33
+
+from django.db import migrations, models
+from django.db.models import F
+
+# Lacuna entre posicoes consecutivas (mesmo valor de `tasks.ordering.ORDER_GAP`).
+ORDER_GAP = 1024
+
+
+def spread_orders(apps, schema_editor):
+    """Converte as posicoes densas em esparsas mantendo a ordem e os empates."""
+    for model_name in ('Task', 'Subtask'):
+        model = apps.get_model('tasks', model_name)
+        model.objects.update(order=F('order') * ORDER_GAP)
+
+
+def compact_orders(apps, schema_editor):
+    for model_name in ('Task', 'Subtask'):
+        model = apps.get_model('tasks', model_name)
+        model.objects.update(order=F('order') / ORDER_GAP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_task_tombstone_and_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subtask',
+            name='order',
+            field=models.BigIntegerField(db_index=True, default=0, verbose_name='Ordem'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='order',
+            field=models.BigIntegerField(db_index=True, default=0, verbose_name='Ordem'),
+        ),
+        migrations.RunPython(spread_orders, compact_orders),
+    ]
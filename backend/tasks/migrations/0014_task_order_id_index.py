@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_sparse_order'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['order', '-id'], name='tasks_task_order_id_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations
+
+# SQL copiado de `tasks.search` na epoca desta migracao: mudancas futuras na
+# busca vao em novas migracoes, sem alterar o que ja foi aplicado.
+PG_INSTALL = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('portuguese', coalesce(solution, '')), 'C')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS tasks_task_search_idx ON tasks_task USING GIN (search_vector)',
+]
+
+PG_UNINSTALL = [
+    'DROP INDEX IF EXISTS tasks_task_search_idx',
+    'ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        title, description, solution,
+        content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description, solution)
+        VALUES (new.id, new.title, new.description, new.solution);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description, solution)
+        VALUES ('delete', old.id, old.title, old.description, old.solution);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description, solution ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description, solution)
+        VALUES ('delete', old.id, old.title, old.description, old.solution);
+        INSERT INTO tasks_task_fts(rowid, title, description, solution)
+        VALUES (new.id, new.title, new.description, new.solution);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ai',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ad',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_au',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """Indice de busca textual: tsvector + GIN no PostgreSQL, FTS5 no SQLite."""
+
+    dependencies = [
+        ('tasks', '0014_task_order_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'postgresql': PG_INSTALL, 'sqlite': SQLITE_INSTALL}),
+            run({'postgresql': PG_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}),
+        ),
+    ]
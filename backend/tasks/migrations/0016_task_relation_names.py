@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:48
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def fill_relation_names(apps, schema_editor):
+    """Preenche os nomes desnormalizados das tarefas existentes, em lotes."""
+    Task = apps.get_model('tasks', 'Task')
+    db = schema_editor.connection.alias
+    names = {}
+    relations = (
+        ('assigned_to_names', Task.assigned_to.through, 'collaborator'),
+        ('department_names', Task.department.through, 'department'),
+    )
+    for column, through, target in relations:
+        rows = (
+            through.objects.using(db).order_by(f'{target}__name', f'{target}_id')
+            .values_list('task_id', f'{target}__name')
+        )
+        for task_id, name in rows.iterator(chunk_size=BATCH_SIZE):
+            names.setdefault(task_id, {}).setdefault(column, []).append(name)
+    # Um UPDATE por lote (CASE por id) em vez de um por tarefa.
+    task_ids = sorted(names)
+    for start in range(0, len(task_ids), BATCH_SIZE):
+        tasks = [
+            Task(pk=task_id, **{'assigned_to_names': [], 'department_names': [], **names[task_id]})
+            for task_id in task_ids[start:start + BATCH_SIZE]
+        ]
+        Task.objects.using(db).bulk_update(tasks, ['assigned_to_names', 'department_names'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0015_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='assigned_to_names',
+            field=models.JSONField(default=list, editable=False, verbose_name='Nomes dos Atribuídos'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='department_names',
+            field=models.JSONField(default=list, editable=False, verbose_name='Nomes dos Setores'),
+        ),
+        migrations.RunPython(fill_relation_names, migrations.RunPython.noop),
+    ]
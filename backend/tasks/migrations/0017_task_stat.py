@@ -0,0 +1,70 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:52
+
+from datetime import date
+
+from django.db import migrations, models
+from django.db.models import Case, Count, DateField, F, Q, Value, When
+
+# Copia do rollup de `tasks.stats` na epoca desta migracao (recorte `all` numa
+# unica linha, `scope_id = 0`); a reparticao veio depois, em 0020.
+NO_DEADLINE = date.max
+
+
+def fill_task_stats(apps, schema_editor):
+    """Calcula o rollup inicial a partir das tarefas existentes."""
+    Task = apps.get_model('tasks', 'Task')
+    TaskStat = apps.get_model('tasks', 'TaskStat')
+    db = schema_editor.connection.alias
+    deadline = Case(
+        When(Q(status='DONE') | Q(deadline__isnull=True), then=Value(NO_DEADLINE)),
+        default=F('deadline'),
+        output_field=DateField(),
+    )
+    tasks = Task.objects.using(db).order_by().annotate(stat_deadline=deadline)
+    scopes = (
+        ('all', tasks.annotate(stat_scope_id=Value(0))),
+        ('project', tasks.filter(project__isnull=False).annotate(stat_scope_id=F('project_id'))),
+        ('responsavel', tasks.filter(responsavel__isnull=False).annotate(stat_scope_id=F('responsavel_id'))),
+        ('assigned_to', tasks.filter(assigned_to__isnull=False).annotate(stat_scope_id=F('assigned_to'))),
+        ('department', tasks.filter(department__isnull=False).annotate(stat_scope_id=F('department'))),
+    )
+    rows = []
+    for scope, queryset in scopes:
+        groups = (
+            queryset.values('stat_scope_id', 'status', 'priority', 'stat_deadline')
+            .annotate(total=Count('id'))
+            .values_list('stat_scope_id', 'status', 'priority', 'stat_deadline', 'total')
+        )
+        rows += [
+            TaskStat(scope=scope, scope_id=scope_id, status=status, priority=priority, deadline=day, count=total)
+            for scope_id, status, priority, day, total in groups
+        ]
+    TaskStat.objects.using(db).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0016_task_relation_names'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'Todas'), ('project', 'Projeto'), ('responsavel', 'Responsável'), ('assigned_to', 'Atribuído a'), ('department', 'Setor')], max_length=20, verbose_name='Recorte')),
+                ('scope_id', models.BigIntegerField(default=0, verbose_name='Id do Recorte')),
+                ('status', models.CharField(choices=[('TODO', 'A Fazer'), ('IN_PROGRESS', 'Em Progresso'), ('IN_REVIEW', 'Em Revisão'), ('DONE', 'Concluída')], max_length=20, verbose_name='Status')),
+                ('priority', models.CharField(choices=[('LOW', 'Baixa'), ('MEDIUM', 'Média'), ('HIGH', 'Alta'), ('URGENT', 'Urgente')], max_length=20, verbose_name='Prioridade')),
+                ('deadline', models.DateField(verbose_name='Prazo')),
+                ('count', models.IntegerField(default=0, verbose_name='Quantidade')),
+            ],
+            options={
+                'verbose_name': 'Estatística de Tarefas',
+                'verbose_name_plural': 'Estatísticas de Tarefas',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'scope_id', 'status', 'priority', 'deadline'), name='tasks_taskstat_key')],
+            },
+        ),
+        migrations.RunPython(fill_task_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+# Mesmos valores de `TaskTransition.STATUS_CODES`.
+STATUS_CODES = {'TODO': 1, 'IN_PROGRESS': 2, 'IN_REVIEW': 3, 'DONE': 4}
+
+
+def seed_transitions(apps, schema_editor):
+    """Historico aproximado das tarefas existentes: criacao e status atual.
+
+    A entrada no status atual usa `completed_at` (DONE) ou `updated_at`.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    TaskTransition = apps.get_model('tasks', 'TaskTransition')
+    batch = []
+    rows = Task.objects.order_by('pk').values_list('pk', 'status', 'created_at', 'completed_at', 'updated_at')
+    for pk, status, created_at, completed_at, updated_at in rows.iterator(chunk_size=2000):
+        batch.append(TaskTransition(task_id=pk, from_status=None, to_status=STATUS_CODES['TODO'], at=created_at))
+        if status != 'TODO':
+            batch.append(TaskTransition(
+                task_id=pk, from_status=STATUS_CODES['TODO'], to_status=STATUS_CODES[status],
+                at=completed_at or updated_at,
+            ))
+        if len(batch) >= 2000:
+            TaskTransition.objects.bulk_create(batch)
+            batch = []
+    TaskTransition.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0017_task_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.PositiveSmallIntegerField(choices=[(1, 'A Fazer'), (2, 'Em Progresso'), (3, 'Em Revisão'), (4, 'Concluída')], null=True, verbose_name='De')),
+                ('to_status', models.PositiveSmallIntegerField(choices=[(1, 'A Fazer'), (2, 'Em Progresso'), (3, 'Em Revisão'), (4, 'Concluída')], verbose_name='Para')),
+                ('at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Em')),
+                ('task', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='transitions', to='tasks.task', verbose_name='Tarefa')),
+            ],
+            options={
+                'verbose_name': 'Transição de Status',
+                'verbose_name_plural': 'Transições de Status',
+                'indexes': [models.Index(fields=['task', 'at'], name='tasks_taskt_task_id_437ec8_idx')],
+            },
+        ),
+        migrations.RunPython(seed_transitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0018_task_transition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='project_id',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True, verbose_name='Projeto'),
+        ),
+    ]
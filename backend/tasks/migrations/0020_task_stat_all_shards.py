@@ -0,0 +1,54 @@
+from datetime import date
+
+from django.db import migrations
+from django.db.models import Case, Count, DateField, F, Q, Value, When
+
+# Valor de `tasks.stats.ALL_SHARDS` nesta migracao: o recorte `all` do rollup
+# passa de uma linha por chave (`scope_id = 0`) para `scope_id = id % 16`.
+# Mudar a reparticao exige uma nova migracao.
+ALL_SHARDS = 16
+NO_DEADLINE = date.max
+
+
+def rebuild_all_scope(apps, schema_editor, scope_id):
+    """Recalcula as linhas do recorte `all` com `scope_id` (expressao por tarefa)."""
+    Task = apps.get_model('tasks', 'Task')
+    TaskStat = apps.get_model('tasks', 'TaskStat')
+    db = schema_editor.connection.alias
+    deadline = Case(
+        When(Q(status='DONE') | Q(deadline__isnull=True), then=Value(NO_DEADLINE)),
+        default=F('deadline'),
+        output_field=DateField(),
+    )
+    groups = (
+        Task.objects.using(db).order_by()
+        .annotate(stat_scope_id=scope_id, stat_deadline=deadline)
+        .values('stat_scope_id', 'status', 'priority', 'stat_deadline')
+        .annotate(total=Count('id'))
+        .values_list('stat_scope_id', 'status', 'priority', 'stat_deadline', 'total')
+    )
+    rows = [
+        TaskStat(scope='all', scope_id=shard, status=status, priority=priority, deadline=day, count=total)
+        for shard, status, priority, day, total in groups
+    ]
+    TaskStat.objects.using(db).filter(scope='all').delete()
+    TaskStat.objects.using(db).bulk_create(rows, batch_size=1000)
+
+
+def shard_all_scope(apps, schema_editor):
+    rebuild_all_scope(apps, schema_editor, F('id') % ALL_SHARDS)
+
+
+def merge_all_scope(apps, schema_editor):
+    rebuild_all_scope(apps, schema_editor, Value(0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0019_task_tombstone_project'),
+    ]
+
+    operations = [
+        migrations.RunPython(shard_all_scope, merge_all_scope),
+    ]
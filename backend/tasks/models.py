@@ -4,6 +4,7 @@ Define tarefas (cards do kanban), subtarefas e seus vinculos com responsaveis.
 """
 
 from django.db import models
+from django.utils import timezone
 
 
 class Task(models.Model):
@@ -72,14 +73,18 @@ class Task(models.Model):
         related_name="department_tasks",
         verbose_name="Setor",
     )
+    # Nomes de `assigned_to`/`department` (ordem alfabetica), mantidos pelos
+    # sinais em `tasks.signals` para listar sem consultar as tabelas M2M.
+    assigned_to_names = models.JSONField(default=list, editable=False, verbose_name="Nomes dos Atribuídos")
+    department_names = models.JSONField(default=list, editable=False, verbose_name="Nomes dos Setores")
 
-    # Ordenação e datas
-    order = models.IntegerField(default=0, verbose_name="Ordem", db_index=True)
+    # Ordenação e datas (`order` esparso, ver `tasks.ordering`)
+    order = models.BigIntegerField(default=0, verbose_name="Ordem", db_index=True)
     start_date = models.DateField(null=True, blank=True, verbose_name="Data de Início")
     deadline = models.DateField(null=True, blank=True, verbose_name="Prazo")
     completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Concluída Em")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado Em")
-    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado Em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado Em", db_index=True)
 
     class Meta:
         """Ordena por `order` e, em empate, pelas mais recentes."""
@@ -88,11 +93,25 @@ class Task(models.Model):
         ordering = ["order", "-created_at"]
         indexes = [
             models.Index(fields=["project", "status", "order"]),
+            # Paginacao keyset da API (`order, -id`).
+            models.Index(fields=["order", "-id"], name="tasks_task_order_id_idx"),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
+    def completed_at_for(self, next_status):
+        """Retorna o `completed_at` coerente com a mudanca para `next_status`.
+
+        Entrar em DONE registra o momento da conclusao; sair de DONE limpa a data.
+        Nos demais casos mantem o valor atual.
+        """
+        if self.status != "DONE" and next_status == "DONE":
+            return timezone.now()
+        if self.status == "DONE" and next_status != "DONE":
+            return None
+        return self.completed_at
+
 
 class Subtask(models.Model):
     """Representa uma subtarefa vinculada a uma `Task`."""
@@ -106,7 +125,7 @@ class Subtask(models.Model):
     )
     title = models.TextField(verbose_name="Título")
     is_done = models.BooleanField(default=False, verbose_name="Concluída", db_index=True)
-    order = models.IntegerField(default=0, verbose_name="Ordem", db_index=True)
+    order = models.BigIntegerField(default=0, verbose_name="Ordem", db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criada Em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizada Em")
 
@@ -118,3 +137,103 @@ class Subtask(models.Model):
 
     def __str__(self):
         return f"{self.title} ({'OK' if self.is_done else 'Pendente'})"
+
+
+class TaskTombstone(models.Model):
+    """Registra a exclusao de uma `Task` para o delta-sync (`?since=`).
+
+    Guarda o id removido e o projeto (para o delta-sync filtrado por
+    projeto), ja que a linha original nao existe mais. Registros mais antigos
+    que `TASK_TOMBSTONE_RETENTION_DAYS` sao apagados por `prune_task_tombstones`.
+    """
+
+    task_id = models.BigIntegerField(verbose_name="Tarefa")
+    project_id = models.BigIntegerField(null=True, blank=True, db_index=True, verbose_name="Projeto")
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name="Excluida Em", db_index=True)
+
+    class Meta:
+        verbose_name = "Tarefa Excluida"
+        verbose_name_plural = "Tarefas Excluidas"
+        ordering = ["deleted_at"]
+
+    def __str__(self):
+        return f"Tarefa {self.task_id} excluida em {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class TaskTransition(models.Model):
+    """Historico (somente insercao) das mudancas de status de uma tarefa.
+
+    Status gravados como inteiros curtos (`STATUS_CODES`). A FK nao tem
+    restricao no banco: o historico sobrevive a exclusao da tarefa.
+    """
+
+    STATUS_CODES = {code: index for index, (code, _) in enumerate(Task.STATUS_CHOICES, start=1)}
+    CODE_CHOICES = [(index, label) for index, (_, label) in enumerate(Task.STATUS_CHOICES, start=1)]
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="transitions",
+        verbose_name="Tarefa",
+    )
+    # Nulo na criacao da tarefa.
+    from_status = models.PositiveSmallIntegerField(null=True, choices=CODE_CHOICES, verbose_name="De")
+    to_status = models.PositiveSmallIntegerField(choices=CODE_CHOICES, verbose_name="Para")
+    at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Em")
+
+    class Meta:
+        verbose_name = "Transição de Status"
+        verbose_name_plural = "Transições de Status"
+        indexes = [models.Index(fields=["task", "at"])]
+
+    def __str__(self):
+        return f"Tarefa {self.task_id}: {self.from_status} -> {self.to_status} em {self.at:%Y-%m-%d %H:%M}"
+
+    @classmethod
+    def build(cls, task_id, from_status, to_status, at=None):
+        """Transicao (nao salva) a partir dos codigos de `Task.STATUS_CHOICES`."""
+        return cls(
+            task_id=task_id,
+            from_status=cls.STATUS_CODES.get(from_status),
+            to_status=cls.STATUS_CODES[to_status],
+            at=at or timezone.now(),
+        )
+
+
+class TaskStat(models.Model):
+    """Contagem agregada (rollup) de tarefas para `/tasks/stats/`.
+
+    Cada linha conta as tarefas de um recorte (`scope`/`scope_id`) com a mesma
+    combinacao de status, prioridade e prazo. Mantida incrementalmente por
+    `tasks.stats` e reconciliada pelo comando `reconcile_task_stats`.
+    """
+
+    SCOPE_CHOICES = [
+        ("all", "Todas"),
+        ("project", "Projeto"),
+        ("responsavel", "Responsável"),
+        ("assigned_to", "Atribuído a"),
+        ("department", "Setor"),
+    ]
+
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES, verbose_name="Recorte")
+    scope_id = models.BigIntegerField(default=0, verbose_name="Id do Recorte")
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, verbose_name="Status")
+    priority = models.CharField(max_length=20, choices=Task.PRIORITY_CHOICES, verbose_name="Prioridade")
+    # `date.max` quando a tarefa nao tem prazo ou ja foi concluida (nunca vencida).
+    deadline = models.DateField(verbose_name="Prazo")
+    count = models.IntegerField(default=0, verbose_name="Quantidade")
+
+    class Meta:
+        verbose_name = "Estatística de Tarefas"
+        verbose_name_plural = "Estatísticas de Tarefas"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "scope_id", "status", "priority", "deadline"],
+                name="tasks_taskstat_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id} {self.status}/{self.priority} = {self.count}"
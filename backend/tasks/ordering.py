@@ -0,0 +1,109 @@
+"""Ordenacao esparsa (com lacunas) de `Task.order` e `Subtask.order`.
+
+Os valores de `order` sao espacados de `ORDER_GAP`, entao mover um card grava
+apenas a linha movida: o novo valor fica no meio da lacuna entre os vizinhos.
+Quando a lacuna se esgota (vizinhos consecutivos ou empatados), a coluna e
+renumerada uma vez (`rebalance`) e o movimento segue normalmente. O comando
+`rebalance_order` faz a mesma renumeracao de forma preventiva, fora do
+horario de uso.
+
+Uma coluna de tarefas e um status dentro de um projeto (`TASK_COLUMN_SCOPE`),
+o recorte em que o quadro e exibido (`?project=`, indice
+`project, status, order`); subtarefas sao ordenadas dentro da tarefa.
+"""
+
+from django.db.models import Max, Min
+from django.utils import timezone
+
+ORDER_GAP = 1024
+
+# Campos que definem a coluna de uma tarefa.
+TASK_COLUMN_SCOPE = ('project_id', 'status')
+
+# Ordenacao visivel de cada coluna (desempate igual ao da API).
+TASK_COLUMN_ORDERING = ('order', '-id')
+SUBTASK_COLUMN_ORDERING = ('order', 'created_at', 'id')
+
+
+def rank_between(previous, following):
+    """Retorna um `order` estritamente entre `previous` e `following`.
+
+    `None` em uma das pontas significa inicio/fim da coluna. Retorna `None`
+    quando nao ha inteiro livre entre os dois vizinhos.
+    """
+    if previous is None and following is None:
+        return 0
+    if previous is None:
+        return following - ORDER_GAP
+    if following is None:
+        return previous + ORDER_GAP
+    if following - previous < 2:
+        return None
+    return (previous + following) // 2
+
+
+def append_rank(siblings):
+    """`order` para inserir no fim da coluna."""
+    last = siblings.aggregate(last=Max('order'))['last']
+    return rank_between(last, None)
+
+
+def rebalance(siblings, ordering):
+    """Renumera a coluna com lacunas de `ORDER_GAP`, preservando a ordem visivel.
+
+    Deve rodar dentro de `transaction.atomic()`: trava as linhas da coluna
+    (sempre na mesma ordem, sem deadlock entre renumeracoes concorrentes)
+    antes de le-las, entao duas renumeracoes da mesma coluna nao se
+    intercalam. Grava apenas as linhas cujo `order` muda e retorna esses
+    objetos.
+    """
+    locked = {obj.pk: obj for obj in siblings.select_for_update().order_by('order', 'id')}
+    visible = siblings.order_by(*ordering).values_list('pk', flat=True)
+    now = timezone.now()
+    changed = []
+    for index, obj in enumerate((locked[pk] for pk in visible if pk in locked), start=1):
+        if obj.order != index * ORDER_GAP:
+            obj.order = index * ORDER_GAP
+            obj.updated_at = now
+            changed.append(obj)
+    if changed:
+        siblings.model.objects.bulk_update(changed, ['order', 'updated_at'], batch_size=500)
+    return changed
+
+
+def needs_rebalance(siblings, min_gap=2):
+    """Indica se alguma lacuna entre vizinhos ficou menor que `min_gap`.
+
+    Usado pelo comando de manutencao; faz uma leitura de `order` da coluna.
+    """
+    orders = list(siblings.order_by('order').values_list('order', flat=True))
+    return any(b - a < min_gap for a, b in zip(orders, orders[1:]))
+
+
+def place_after(instance, siblings, after, ordering):
+    """Calcula o novo `order` de `instance` logo apos `after` (ou no topo se `None`).
+
+    `siblings` e a coluna de destino sem `instance`. Se a lacuna estiver
+    esgotada, renumera a coluna antes. Retorna `(order, rebalanced)`, onde
+    `rebalanced` sao os vizinhos regravados pela renumeracao.
+    """
+    rebalanced = []
+    for attempt in range(2):
+        if after is None:
+            previous = None
+            following = siblings.aggregate(first=Min('order'))['first']
+        else:
+            previous = after.order
+            if siblings.filter(order=previous).exclude(pk=after.pk).exists():
+                # Empate com o vizinho de cima: so a renumeracao define a posicao exata.
+                following = previous
+            else:
+                following = siblings.filter(order__gt=previous).aggregate(next=Min('order'))['next']
+
+        rank = rank_between(previous, following)
+        if rank is not None or attempt:
+            break
+        rebalanced = rebalance(siblings, ordering)
+        if after is not None:
+            after.refresh_from_db(fields=['order'])
+    return rank, rebalanced
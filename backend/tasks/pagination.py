@@ -0,0 +1,105 @@
+"""Paginacao por cursor (keyset) da listagem de tarefas.
+
+Em vez de `COUNT(*)` + `OFFSET`, cada pagina filtra a partir da ultima linha
+da pagina anterior na ordenacao `order, -id`. O custo de qualquer pagina e o
+mesmo da primeira, usando o indice composto `(order, -id)`.
+"""
+
+from base64 import b64decode, b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(order, pk):
+    """Codifica a posicao `(order, id)` como token opaco para a URL."""
+    return b64encode(f"{order}:{pk}".encode()).decode()
+
+
+def decode_cursor(token):
+    """Decodifica o token de `encode_cursor`; levanta `ValueError` se invalido.
+
+    Erros de base64 e de decodificacao tambem sao subclasses de `ValueError`.
+    """
+    order, pk = b64decode(token.encode(), validate=True).decode().split(':')
+    return int(order), int(pk)
+
+
+def page_size_from(params, name='page_size'):
+    """`?page_size=` limitado a `settings.TASK_MAX_PAGE_SIZE` (padrao: `PAGE_SIZE`)."""
+    try:
+        requested = int(params[name])
+    except (KeyError, ValueError):
+        return settings.REST_FRAMEWORK['PAGE_SIZE']
+    return max(1, min(requested, settings.TASK_MAX_PAGE_SIZE))
+
+
+def after_cursor(queryset, order, pk):
+    """Linhas depois da posicao `(order, id)` na ordenacao `order, -id`.
+
+    O `order >= ...` redundante da ao planejador um limite inferior no
+    inicio do indice `(order, -id)`; so com o OR ele costuma varrer o indice
+    (ou a tabela) desde o comeco, e o custo cresceria com a profundidade.
+    As direcoes mistas (`order` crescente, `id` decrescente) impedem a
+    comparacao de tuplas `(order, id) > (...)`.
+    """
+    return queryset.filter(Q(order__gte=order) & (Q(order__gt=order) | Q(order=order, id__lt=pk)))
+
+
+class TaskKeysetPagination(BasePagination):
+    """Pagina tarefas ordenadas por `order, -id` a partir de `?cursor=`.
+
+    O tamanho da pagina pode ser escolhido com `?page_size=`, limitado por
+    `settings.TASK_MAX_PAGE_SIZE`. A resposta traz apenas `next` e `results`:
+    sem contagem total, que exigiria percorrer a tabela inteira.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Cursor invalido.'
+
+    def get_page_size(self, request):
+        return page_size_from(request.query_params, self.page_size_query_param)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            try:
+                order, pk = decode_cursor(token)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+            queryset = after_cursor(queryset, order, pk)
+
+        rows = list(queryset[:page_size + 1])
+        self.next_position = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            self.next_position = (last['order'], last['id']) if isinstance(last, dict) else (last.order, last.pk)
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(*self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,85 @@
+"""Snapshot pre-serializado do quadro publico (modo TV).
+
+O quadro publico e o mesmo para todos os clientes, entao e renderizado uma
+unica vez por mudanca: o JSON final e comprimido com gzip e guardado no cache
+junto com o ETag. A chave inclui as versoes de `Task`, `Project` e
+`Collaborator` do cache de respostas (`app.response_cache`), incrementadas
+pelos sinais na gravacao e de novo apos o commit: um snapshot montado com
+dados antigos fica sob uma versao que nao e mais lida, sem corrida entre
+apagar a chave e uma reconstrucao concorrente.
+"""
+
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from app.response_cache import model_versions
+from collaborators.models import Collaborator
+from projectsmanager.models import Project
+from .models import Task
+from .serializers import PublicTaskSerializer
+
+PUBLIC_BOARD_CACHE_KEY = 'tasks:public-board'
+PUBLIC_BOARD_MODELS = (Task, Project, Collaborator)
+
+
+def public_board_key():
+    """Chave do snapshot para as versoes atuais dos modelos exibidos."""
+    versions = model_versions(PUBLIC_BOARD_MODELS)
+    return ':'.join([PUBLIC_BOARD_CACHE_KEY, *map(str, versions)])
+
+
+def build_public_board():
+    """Serializa o quadro publico inteiro e devolve `{'etag', 'gzip'}`.
+
+    Mantem o envelope paginado do DRF (`count`/`next`/`previous`/`results`)
+    para que os clientes existentes continuem funcionando.
+    """
+    queryset = (
+        Task.objects.select_related('project', 'responsavel')
+        .order_by('order', '-id')
+    )
+    results = PublicTaskSerializer(queryset, many=True).data
+    body = JSONRenderer().render({
+        'count': len(results),
+        'next': None,
+        'previous': None,
+        'results': results,
+    })
+    return {
+        'etag': '"%s"' % hashlib.sha256(body).hexdigest()[:40],
+        'gzip': gzip.compress(body, compresslevel=6),
+    }
+
+
+def get_public_board():
+    """Retorna o snapshot do cache, reconstruindo-o quando ausente.
+
+    A chave e lida antes da consulta: se a mudanca for comitada no meio da
+    reconstrucao, o snapshot fica sob a versao anterior.
+    """
+    key = public_board_key()
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_public_board()
+        cache.set(key, snapshot, settings.PUBLIC_BOARD_CACHE_TIMEOUT)
+    return snapshot
+
+
+def snapshot_response(snapshot, request):
+    """Resposta do snapshot: 304 pelo ETag, gzip se o cliente aceitar, senao JSON puro."""
+    if snapshot['etag'] in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(snapshot['gzip'], content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(snapshot['gzip']), content_type='application/json')
+    response['ETag'] = snapshot['etag']
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'public, no-cache'
+    return response
@@ -0,0 +1,64 @@
+"""Manutencao das colunas desnormalizadas `assigned_to_names`/`department_names`.
+
+Os nomes seguem a ordem dos modelos relacionados (nome, depois id), a mesma
+dos ids em `assigned_to`/`department` nas respostas da API.
+"""
+
+from django.utils import timezone
+
+from .models import Task
+
+
+def relation_names(task_ids):
+    """Nomes atuais de `assigned_to` e `department` por tarefa: duas consultas."""
+    assigned = {task_id: [] for task_id in task_ids}
+    departments = {task_id: [] for task_id in task_ids}
+    rows = (
+        Task.assigned_to.through.objects
+        .filter(task_id__in=task_ids)
+        .order_by('collaborator__name', 'collaborator_id')
+        .values_list('task_id', 'collaborator__name')
+    )
+    for task_id, name in rows:
+        assigned[task_id].append(name)
+    rows = (
+        Task.department.through.objects
+        .filter(task_id__in=task_ids)
+        .order_by('department__name', 'department_id')
+        .values_list('task_id', 'department__name')
+    )
+    for task_id, name in rows:
+        departments[task_id].append(name)
+    return assigned, departments
+
+
+def refresh_relation_names(task_ids, instances=()):
+    """Recalcula os nomes das tarefas e grava (num `bulk_update`) as que mudaram.
+
+    `instances` sao objetos em memoria que tambem devem refletir os novos
+    valores (ex.: a tarefa que o serializer ainda vai devolver). Retorna as
+    tarefas gravadas, com `updated_at` novo para o delta-sync.
+    """
+    task_ids = list(set(task_ids))
+    if not task_ids:
+        return []
+    assigned, departments = relation_names(task_ids)
+    now = timezone.now()
+    changed = []
+    tasks = Task.objects.filter(pk__in=task_ids).only('id', 'assigned_to_names', 'department_names')
+    for task in tasks:
+        names = (assigned[task.pk], departments[task.pk])
+        if (task.assigned_to_names, task.department_names) == names:
+            continue
+        task.assigned_to_names, task.department_names = names
+        task.updated_at = now
+        changed.append(task)
+    if changed:
+        Task.objects.bulk_update(changed, ['assigned_to_names', 'department_names', 'updated_at'])
+    changed_ids = {task.pk for task in changed}
+    for instance in instances:
+        if instance.pk in changed_ids:
+            instance.assigned_to_names = assigned[instance.pk]
+            instance.department_names = departments[instance.pk]
+            instance.updated_at = now
+    return changed
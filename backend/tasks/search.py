@@ -0,0 +1,164 @@
+"""Busca textual em tarefas (`title`, `description`, `solution`).
+
+PostgreSQL: coluna gerada `search_vector` (tsvector com pesos A/B/C) e indice
+GIN, consultada com `to_tsquery` e ranqueada por `ts_rank_cd`.
+
+SQLite (DEBUG/testes): tabela FTS5 `tasks_task_fts` com conteudo externo em
+`tasks_task`, mantida por triggers e ranqueada por `bm25`.
+
+Nos dois bancos cada termo casa por prefixo e os termos sao combinados com
+AND (ver `prefix_query`). Nenhuma das duas estruturas aparece no modelo: sao
+criadas pela migracao `0015_task_search` (que tem sua propria copia do SQL)
+conforme o banco em uso.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+# Dicionario do PostgreSQL usado no tsvector (fixo: faz parte da coluna gerada).
+SEARCH_CONFIG = 'portuguese'
+
+# Delimitadores de destaque vindos do banco; trocados por <mark> apos o escape.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+# Colunas extras de `search_tasks`, para uso em `.values()`.
+SEARCH_COLUMNS = ('search_rank', 'search_title', 'search_description')
+
+FTS_TABLE = 'tasks_task_fts'
+
+# Triggers da FTS5 (criados pela migracao 0015), recriados apos cada `migrate`:
+# o SQLite os descarta quando o Django reconstroi `tasks_task` (AlterField e afins).
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, solution)
+        VALUES (new.id, new.title, new.description, new.solution);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, solution)
+        VALUES ('delete', old.id, old.title, old.description, old.solution);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description, solution ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, solution)
+        VALUES ('delete', old.id, old.title, old.description, old.solution);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, solution)
+        VALUES (new.id, new.title, new.description, new.solution);
+    END
+    """,
+]
+
+
+def restore_sqlite_triggers(using, **kwargs):
+    """Receiver de `post_migrate`: garante os triggers da FTS5 no SQLite."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if FTS_TABLE not in tables or 'tasks_task' not in tables:
+            return
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
+
+
+def search_terms(query):
+    """Palavras da busca, sem operadores: evita erros de sintaxe do MATCH."""
+    return re.findall(r'\w+', query or '')
+
+
+def prefix_query(terms, vendor):
+    """Consulta em que cada termo casa por prefixo, termos combinados com AND.
+
+    PostgreSQL: `term:* & ...` para `to_tsquery`. SQLite: frases com prefixo
+    `"term"* ...` para o MATCH da FTS5.
+    """
+    if vendor == 'postgresql':
+        return ' & '.join(f'{term}:*' for term in terms)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def match_tasks(queryset, query):
+    """Filtra o queryset pelas tarefas que casam com `query` (sem ranking)."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.filter(RawSQL(
+            f"tasks_task.search_vector @@ to_tsquery('{SEARCH_CONFIG}', %s)",
+            [prefix_query(terms, vendor)], output_field=BooleanField(),
+        ))
+    if vendor == 'sqlite':
+        return queryset.filter(RawSQL(
+            f'tasks_task.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+            [prefix_query(terms, vendor)], output_field=BooleanField(),
+        ))
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description__icontains=term) | Q(solution__icontains=term)
+    return queryset.filter(condition)
+
+
+def search_tasks(queryset, query):
+    """Tarefas que casam com `query`, da mais relevante para a menos relevante.
+
+    Anota `search_rank` e os trechos destacados `search_title` e
+    `search_description` (delimitados por `MARK_START`/`MARK_END`; use
+    `render_highlight` antes de devolver ao cliente).
+    """
+    terms = search_terms(query)
+    queryset = match_tasks(queryset, query)
+    vendor = connections[queryset.db].vendor
+    if not terms or vendor not in ('postgresql', 'sqlite'):
+        return queryset.annotate(
+            search_rank=RawSQL('0', [], output_field=FloatField()),
+            search_title=RawSQL('tasks_task.title', [], output_field=TextField()),
+            search_description=RawSQL("coalesce(tasks_task.description, '')", [], output_field=TextField()),
+        ).order_by('order', '-id')
+
+    if vendor == 'postgresql':
+        text = prefix_query(terms, vendor)
+        tsquery = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+        marks = f'StartSel={MARK_START}, StopSel={MARK_END}'
+        annotations = {
+            'search_rank': RawSQL(f'ts_rank_cd(tasks_task.search_vector, {tsquery})', [text], output_field=FloatField()),
+            'search_title': RawSQL(
+                f"ts_headline('{SEARCH_CONFIG}', tasks_task.title, {tsquery}, %s)",
+                [text, f'{marks}, HighlightAll=true'], output_field=TextField(),
+            ),
+            'search_description': RawSQL(
+                f"ts_headline('{SEARCH_CONFIG}', coalesce(tasks_task.description, ''), {tsquery}, %s)",
+                [text, f'{marks}, MaxFragments=2, MaxWords=20, MinWords=5'], output_field=TextField(),
+            ),
+        }
+    else:
+        match = f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = tasks_task.id'
+        fts = [prefix_query(terms, vendor)]
+        annotations = {
+            # bm25 e negativo (menor = melhor); pesos por coluna como no tsvector.
+            'search_rank': RawSQL(f'(SELECT -bm25({FTS_TABLE}, 10.0, 4.0, 2.0) {match})', fts, output_field=FloatField()),
+            'search_title': RawSQL(
+                f"(SELECT highlight({FTS_TABLE}, 0, char(2), char(3)) {match})", fts, output_field=TextField(),
+            ),
+            'search_description': RawSQL(
+                f"(SELECT coalesce(snippet({FTS_TABLE}, 1, char(2), char(3), '...', 24), '') {match})",
+                fts, output_field=TextField(),
+            ),
+        }
+    return queryset.annotate(**annotations).order_by('-search_rank', '-id')
+
+
+def render_highlight(text):
+    """Escapa o trecho e troca os delimitadores do banco por `<mark>`."""
+    if not text:
+        return ''
+    return str(escape(text)).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
@@ -0,0 +1,190 @@
+"""Quadros sinteticos para testes de carga e benchmarks.
+
+`seed_board` cria projetos, setores (principais e subsetores), colaboradores e
+tarefas com responsaveis, setores e subtarefas via `bulk_create`. As escolhas
+vem de um `random.Random(seed)`: a mesma semente gera o mesmo quadro (so os
+e-mails levam um sufixo unico, para rodar varias vezes no mesmo banco).
+
+Como `bulk_create` nao dispara sinais, nomes desnormalizados e historico de
+status vao prontos; o rollup de `/tasks/stats/` e recalculado ao final e as
+versoes do cache de respostas sao incrementadas.
+"""
+
+import random
+import uuid
+from datetime import timedelta
+
+from django.utils import timezone
+
+from app.response_cache import bump_versions
+from collaborators.models import Collaborator
+from departments.models import Department
+from projectsmanager.models import Project
+from .export import chunked
+from .models import Subtask, Task, TaskTransition
+from .ordering import ORDER_GAP
+from .stats import rebuild_stats
+
+SEED_BATCH_SIZE = 2000
+
+# Pesos de status e prioridade de um quadro em uso (maioria a fazer ou concluida).
+STATUS_WEIGHTS = {'TODO': 35, 'IN_PROGRESS': 20, 'IN_REVIEW': 10, 'DONE': 35}
+PRIORITY_WEIGHTS = {'LOW': 25, 'MEDIUM': 45, 'HIGH': 22, 'URGENT': 8}
+# Fracao das tarefas com prazo (entre 30 dias atras e 60 a frente).
+DEADLINE_RATIO = 0.6
+
+FIRST_NAMES = (
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fabio', 'Gabriela', 'Heitor', 'Isabela', 'Joao',
+    'Larissa', 'Marcos', 'Natalia', 'Otavio', 'Paula', 'Rafael', 'Sofia', 'Tiago', 'Vanessa', 'Wagner',
+)
+LAST_NAMES = (
+    'Almeida', 'Barbosa', 'Costa', 'Dias', 'Ferreira', 'Gomes', 'Lima', 'Martins', 'Nunes', 'Oliveira',
+    'Pereira', 'Ribeiro', 'Santos', 'Silva', 'Souza',
+)
+AREAS = ('Tecnologia', 'Financeiro', 'Comercial', 'Operacoes', 'Pessoas', 'Juridico', 'Marketing', 'Suporte')
+TEAMS = ('Infraestrutura', 'Sistemas', 'Dados', 'Atendimento', 'Qualidade', 'Compras', 'Contas', 'Projetos')
+VERBS = ('Revisar', 'Corrigir', 'Implantar', 'Documentar', 'Migrar', 'Testar', 'Configurar', 'Atualizar', 'Analisar')
+OBJECTS = (
+    'relatorio mensal', 'backup do servidor', 'integracao com ERP', 'fluxo de aprovacao', 'tela de cadastro',
+    'contrato de fornecedor', 'painel de indicadores', 'rotina de faturamento', 'acesso VPN', 'chamados pendentes',
+)
+STEPS = ('Levantar requisitos', 'Executar', 'Validar com a area', 'Publicar', 'Comunicar equipe', 'Registrar evidencias')
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def seed_departments(rng, mains, subs_per_main, prefix):
+    """Cria `mains` setores principais com ate `subs_per_main` subsetores cada."""
+    main_objs = Department.objects.bulk_create([
+        Department(
+            name=f"{prefix} {AREAS[i % len(AREAS)]} {i // len(AREAS) + 1}",
+            department_type=Department.TYPE_MAIN,
+        )
+        for i in range(mains)
+    ])
+    sub_objs = Department.objects.bulk_create([
+        Department(
+            name=f"{main.name} / {TEAMS[(i + k) % len(TEAMS)]}",
+            department_type=Department.TYPE_SUB,
+            parent_department=main,
+            is_active=rng.random() > 0.1,
+        )
+        for i, main in enumerate(main_objs)
+        for k in range(rng.randint(1, subs_per_main) if subs_per_main else 0)
+    ])
+    return main_objs + sub_objs
+
+
+def seed_collaborators(rng, count, departments, prefix):
+    suffix = uuid.uuid4().hex[:8]
+    return Collaborator.objects.bulk_create([
+        Collaborator(
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            email=f"{prefix.lower()}.{i}.{suffix}@example.com",
+            position=rng.choice(('Analista', 'Desenvolvedor', 'Coordenador', 'Tecnico', 'Gerente')),
+            department=rng.choice(departments) if departments else None,
+            is_active=rng.random() > 0.08,
+        )
+        for i in range(count)
+    ], batch_size=SEED_BATCH_SIZE)
+
+
+def seed_projects(rng, count, collaborators, departments, prefix):
+    projects = Project.objects.bulk_create([
+        Project(name=f"{prefix} Projeto {i}", description=f"Projeto sintetico {i}", is_online=rng.random() > 0.3)
+        for i in range(count)
+    ])
+    responsible, used_by = Project.responsible_collaborators.through, Project.used_by_departments.through
+    responsible.objects.bulk_create([
+        responsible(project_id=project.pk, collaborator_id=collaborator.pk)
+        for project in projects
+        for collaborator in rng.sample(collaborators, min(len(collaborators), rng.randint(1, 3)))
+    ])
+    used_by.objects.bulk_create([
+        used_by(project_id=project.pk, department_id=department.pk)
+        for project in projects
+        for department in rng.sample(departments, min(len(departments), rng.randint(1, 2)))
+    ])
+    return projects
+
+
+def seed_tasks(rng, count, projects, collaborators, departments, max_assignees, max_subtasks):
+    """Cria `count` tarefas em lotes; retorna quantas subtarefas foram criadas."""
+    today = timezone.localdate()
+    now = timezone.now()
+    columns = dict.fromkeys(STATUS_WEIGHTS, 0)
+    assigned_through, department_through = Task.assigned_to.through, Task.department.through
+    subtask_count = 0
+
+    for batch in chunked(range(count), SEED_BATCH_SIZE):
+        tasks, relations = [], []
+        for i in batch:
+            status = _weighted(rng, STATUS_WEIGHTS)
+            columns[status] += 1
+            assigned = rng.sample(collaborators, min(len(collaborators), rng.randint(0, max_assignees)))
+            sectors = rng.sample(departments, min(len(departments), rng.choice((1, 1, 1, 2))))
+            has_deadline = rng.random() < DEADLINE_RATIO
+            tasks.append(Task(
+                title=f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} #{i}",
+                description=f"Tarefa sintetica {i}. " * rng.randint(1, 6),
+                status=status,
+                priority=_weighted(rng, PRIORITY_WEIGHTS),
+                project=rng.choice(projects) if projects and rng.random() > 0.1 else None,
+                responsavel=rng.choice(collaborators) if collaborators and rng.random() > 0.2 else None,
+                order=columns[status] * ORDER_GAP,
+                deadline=today + timedelta(days=rng.randint(-30, 60)) if has_deadline else None,
+                completed_at=now - timedelta(hours=rng.randint(1, 24 * 60)) if status == 'DONE' else None,
+                assigned_to_names=sorted(c.name for c in assigned),
+                department_names=sorted(d.name for d in sectors),
+            ))
+            relations.append((assigned, sectors, rng.randint(0, max_subtasks)))
+        Task.objects.bulk_create(tasks)
+
+        assigned_through.objects.bulk_create([
+            assigned_through(task_id=task.pk, collaborator_id=collaborator.pk)
+            for task, (assigned, _, _) in zip(tasks, relations) for collaborator in assigned
+        ])
+        department_through.objects.bulk_create([
+            department_through(task_id=task.pk, department_id=department.pk)
+            for task, (_, sectors, _) in zip(tasks, relations) for department in sectors
+        ])
+        subtasks = [
+            Subtask(task_id=task.pk, title=STEPS[k % len(STEPS)], order=(k + 1) * ORDER_GAP, is_done=rng.random() < 0.4)
+            for task, (_, _, steps) in zip(tasks, relations) for k in range(steps)
+        ]
+        Subtask.objects.bulk_create(subtasks, batch_size=SEED_BATCH_SIZE)
+        subtask_count += len(subtasks)
+        TaskTransition.objects.bulk_create([
+            TaskTransition.build(task.pk, None, task.status, task.created_at) for task in tasks
+        ])
+    return subtask_count
+
+
+def seed_board(
+    tasks=1000, projects=10, departments=5, subdepartments=3, collaborators=50,
+    max_assignees=3, max_subtasks=4, seed=0, prefix='Seed',
+):
+    """Cria um quadro sintetico; retorna as quantidades criadas por modelo.
+
+    Deve rodar dentro de uma transacao (o comando `seed_board` e os
+    benchmarks cuidam disso).
+    """
+    rng = random.Random(seed)
+    department_objs = seed_departments(rng, departments, subdepartments, prefix)
+    collaborator_objs = seed_collaborators(rng, collaborators, department_objs, prefix)
+    project_objs = seed_projects(rng, projects, collaborator_objs, department_objs, prefix)
+    subtask_count = seed_tasks(
+        rng, tasks, project_objs, collaborator_objs, department_objs, max_assignees, max_subtasks,
+    )
+
+    rebuild_stats()
+    bump_versions(Department, Collaborator, Project, Task, Subtask)
+    return {
+        'departments': len(department_objs),
+        'collaborators': len(collaborator_objs),
+        'projects': len(project_objs),
+        'tasks': tasks,
+        'subtasks': subtask_count,
+    }
@@ -5,10 +5,13 @@ Expoem campos derivados e garantem consistencia de datas de conclusao.
 
 from django.utils import timezone
 from rest_framework import serializers
+from app.metrics import TimedSerializerMixin
+from app.sparse_fields import SparseFieldsMixin, nested
 from .models import Subtask, Task
+from .ordering import append_rank
 
 
-class SubtaskSerializer(serializers.ModelSerializer):
+class SubtaskSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializa subtarefas sem regras adicionais."""
     class Meta:
         """Mantem o serializer simples, espelhando o modelo."""
@@ -19,12 +22,18 @@ class SubtaskSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
 
-class TaskSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        """Sem `order` explicito, a subtarefa entra no fim da lista da tarefa."""
+        if 'order' not in validated_data:
+            validated_data['order'] = append_rank(Subtask.objects.filter(task=validated_data['task']))
+        return super().create(validated_data)
+
+class TaskSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializa tarefas (cards do kanban) com nomes derivados e regras de status/conclusao."""
     project_name = serializers.CharField(source='project.name', read_only=True, allow_null=True, default=None)
     responsavel_name = serializers.CharField(source='responsavel.name', read_only=True, allow_null=True, default=None)
-    assigned_to_names = serializers.SerializerMethodField()
-    department_names = serializers.SerializerMethodField()
+    assigned_to_names = serializers.ListField(child=serializers.CharField(), read_only=True)
+    department_names = serializers.ListField(child=serializers.CharField(), read_only=True)
     subtasks = SubtaskSerializer(many=True, read_only=True)
 
     class Meta:
@@ -39,14 +48,12 @@ class TaskSerializer(serializers.ModelSerializer):
             'department_names', 'subtasks',
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
-
-    def get_assigned_to_names(self, obj):
-        """Retorna nomes dos responsaveis para evitar logica no frontend."""
-        return [c.name for c in obj.assigned_to.all()]
-
-    def get_department_names(self, obj):
-        """Retorna nomes dos departamentos relacionados a tarefa."""
-        return [d.name for d in obj.department.all()]
+        expandable_fields = {
+            'project': nested('projectsmanager.serializers.ProjectSerializer', fields={'id', 'name'}),
+            'responsavel': nested('collaborators.serializers.CollaboratorSerializer', fields={'id', 'name', 'email'}),
+            'assigned_to': nested('collaborators.serializers.CollaboratorSerializer', many=True, fields={'id', 'name', 'email'}),
+            'department': nested('departments.serializers.DepartmentSerializer', many=True, fields={'id', 'name'}),
+        }
 
     def create(self, validated_data):
         """Define `completed_at` quando a tarefa ja nasce como DONE."""
@@ -60,18 +67,89 @@ class TaskSerializer(serializers.ModelSerializer):
         """Mantem `completed_at` coerente com transicoes de status."""
         next_status = validated_data.get("status", instance.status)
         # Atualiza campo de conclusao conforme transicao de status.
-        if instance.status != "DONE" and next_status == "DONE":
-            validated_data["completed_at"] = timezone.now()
-        elif instance.status == "DONE" and next_status != "DONE":
-            validated_data["completed_at"] = None
+        if (instance.status == "DONE") != (next_status == "DONE"):
+            validated_data["completed_at"] = instance.completed_at_for(next_status)
         return super().update(instance, validated_data)
 
 
-class PublicTaskSerializer(serializers.ModelSerializer):
+class TaskReorderSerializer(serializers.Serializer):
+    """Item de `POST /tasks/bulk-reorder/`: nova posicao e, opcionalmente, nova coluna."""
+    id = serializers.IntegerField()
+    order = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    completed_at = serializers.DateTimeField(read_only=True)
+
+
+class SubtaskReorderSerializer(serializers.Serializer):
+    """Item de `POST /subtasks/bulk-reorder/`."""
+    id = serializers.IntegerField()
+    order = serializers.IntegerField()
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Corpo de `POST /tasks/<id>/move/`: posiciona o card logo apos `after` (ou no topo)."""
+    after = serializers.IntegerField(allow_null=True, required=False, default=None)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+
+
+class SubtaskMoveSerializer(serializers.Serializer):
+    """Corpo de `POST /subtasks/<id>/move/`."""
+    after = serializers.IntegerField(allow_null=True, required=False, default=None)
+
+
+class TaskBatchOperationSerializer(serializers.Serializer):
+    """Operacao de `POST /tasks/batch/`.
+
+    - `create`: `data` no formato de `TaskSerializer`.
+    - `update`: `ids` e ao menos um de `set` (campos; M2M sao substituidos),
+      `add` e `remove` (ids de `assigned_to`/`department`).
+    - `delete`: `ids`.
+    """
+    UPDATE_FIELDS = (
+        'title', 'description', 'solution', 'status', 'priority', 'project', 'responsavel',
+        'start_date', 'deadline', 'assigned_to', 'department',
+    )
+    RELATION_FIELDS = ('assigned_to', 'department')
+
+    op = serializers.ChoiceField(choices=('create', 'update', 'delete'))
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    data = serializers.DictField(required=False)
+    set = serializers.DictField(required=False)
+    add = serializers.DictField(required=False)
+    remove = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        """Valida os valores com `TaskSerializer`; `data`/`set`/`add`/`remove` saem validados."""
+        op = attrs['op']
+        if op == 'create':
+            serializer = TaskSerializer(data=attrs.get('data', {}))
+            if not serializer.is_valid():
+                raise serializers.ValidationError({'data': serializer.errors})
+            return {'op': op, 'serializer': serializer}
+        if 'ids' not in attrs:
+            raise serializers.ValidationError({'ids': 'Informe os ids das tarefas.'})
+        attrs['ids'] = list(dict.fromkeys(attrs['ids']))
+        if op == 'delete':
+            return {'op': op, 'ids': attrs['ids']}
+        if not any(attrs.get(name) for name in ('set', 'add', 'remove')):
+            raise serializers.ValidationError({'set': 'Informe set, add ou remove.'})
+        for name, allowed in (('set', self.UPDATE_FIELDS), ('add', self.RELATION_FIELDS), ('remove', self.RELATION_FIELDS)):
+            values = attrs.get(name) or {}
+            unknown = sorted(set(values) - set(allowed))
+            if unknown:
+                raise serializers.ValidationError({name: f"Campos nao permitidos: {', '.join(unknown)}."})
+            serializer = TaskSerializer(data=values, partial=True)
+            if not serializer.is_valid():
+                raise serializers.ValidationError({name: serializer.errors})
+            attrs[name] = serializer.validated_data
+        return attrs
+
+
+class PublicTaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Versao publica com campos restritos — sem dados sensiveis."""
     project_name = serializers.CharField(source='project.name', read_only=True, allow_null=True, default=None)
     responsavel_name = serializers.CharField(source='responsavel.name', read_only=True, allow_null=True, default=None)
-    assigned_to_names = serializers.SerializerMethodField()
+    assigned_to_names = serializers.ListField(child=serializers.CharField(), read_only=True)
 
     class Meta:
         model = Task
@@ -80,6 +158,3 @@ class PublicTaskSerializer(serializers.ModelSerializer):
             'deadline', 'completed_at',
             'project_name', 'responsavel_name', 'assigned_to_names',
         )
-
-    def get_assigned_to_names(self, obj):
-        return [c.name for c in obj.assigned_to.all()]
@@ -0,0 +1,207 @@
+"""Receivers de sinais do app tasks: mantem os dados derivados das tarefas.
+
+Tombstones e `updated_at` do delta-sync, historico de status, nomes
+desnormalizados de `assigned_to`/`department`, rollup de `/tasks/stats/` e
+versoes do cache de respostas (que tambem versionam o quadro publico).
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from app.response_cache import bump_versions
+from collaborators.models import Collaborator
+from departments.models import Department
+from projectsmanager.models import Project
+from .models import Subtask, Task, TaskStat, TaskTombstone, TaskTransition
+from .relation_names import refresh_relation_names
+from . import stats
+
+# Enviado por operacoes em lote que gravam via `bulk_update` (sem `post_save`).
+# Argumentos: `sender` (modelo) e `instances` (objetos ja atualizados).
+bulk_updated = Signal()
+
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, **kwargs):
+    """Registra o id removido para que clientes em delta-sync descartem o card."""
+    TaskTombstone.objects.create(task_id=instance.pk, project_id=instance.project_id)
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def touch_parent_task(sender, instance, **kwargs):
+    """Atualiza `updated_at` da tarefa pai sem disparar novos sinais."""
+    Task.objects.filter(pk=instance.task_id).update(updated_at=timezone.now())
+
+
+# Tabela M2M de cada modelo cujos nomes sao copiados para `Task`.
+NAMED_RELATIONS = {
+    Collaborator: (Task.assigned_to.through, 'collaborator_id'),
+    Department: (Task.department.through, 'department_id'),
+}
+
+
+def related_task_ids(instance):
+    through, column = NAMED_RELATIONS[type(instance)]
+    return list(through.objects.filter(**{column: instance.pk}).values_list('task_id', flat=True))
+
+
+def sync_relation_names(task_ids, instances=()):
+    changed = refresh_relation_names(task_ids, instances)
+    if changed:
+        bulk_updated.send(sender=Task, instances=changed)
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+@receiver(m2m_changed, sender=Task.department.through)
+def relation_names_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    """Atualiza os nomes das tarefas afetadas por `add`/`remove`/`clear`."""
+    if reverse and action == 'pre_clear':
+        instance._cleared_task_ids = related_task_ids(instance)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_relation_names([instance.pk], [instance])
+    elif action == 'post_clear':
+        sync_relation_names(instance.__dict__.pop('_cleared_task_ids', []))
+    else:
+        sync_relation_names(pk_set)
+
+
+@receiver(post_save, sender=Collaborator)
+@receiver(post_save, sender=Department)
+def relation_names_on_rename(sender, instance, created, **kwargs):
+    """Propaga renomeacoes (so as tarefas cujo nome mudou sao gravadas)."""
+    if not created:
+        sync_relation_names(related_task_ids(instance))
+
+
+@receiver(pre_delete, sender=Collaborator)
+@receiver(pre_delete, sender=Department)
+def remember_related_tasks(sender, instance, **kwargs):
+    instance._related_task_ids = related_task_ids(instance)
+
+
+@receiver(post_delete, sender=Collaborator)
+@receiver(post_delete, sender=Department)
+def relation_names_on_delete(sender, instance, **kwargs):
+    """A exclusao apaga as linhas M2M sem `m2m_changed`: recalcula aqui."""
+    sync_relation_names(instance.__dict__.pop('_related_task_ids', []))
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender, instance, update_fields=None, **kwargs):
+    """Guarda o estado no banco (status e chaves do rollup) antes de uma gravacao que pode altera-lo."""
+    instance._previous_state = None
+    if instance._state.adding:
+        return
+    if update_fields is not None and not stats.STAT_FIELDS & set(update_fields):
+        return
+    instance._previous_state = stats.task_state(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+def record_status_transition(sender, instance, created, **kwargs):
+    """Acrescenta ao historico a criacao e cada troca de status."""
+    if created:
+        TaskTransition.build(instance.pk, None, instance.status).save()
+        return
+    state = getattr(instance, '_previous_state', None)
+    if state is not None and state[0]['status'] != instance.status:
+        TaskTransition.build(instance.pk, state[0]['status'], instance.status).save()
+
+
+@receiver(post_save, sender=Task)
+def update_task_stats(sender, instance, created, **kwargs):
+    """Aplica a diferenca das chaves (M2M nao muda num `save`)."""
+    if created:
+        stats.apply_delta((), stats.task_keys(stats.instance_fields(instance)))
+        return
+    state = getattr(instance, '_previous_state', None)
+    if state is None:
+        return
+    _, old_keys, assigned, departments = state
+    stats.apply_delta(old_keys, stats.task_keys(stats.instance_fields(instance), assigned, departments))
+
+
+@receiver(pre_delete, sender=Task)
+def remember_deleted_task_stats(sender, instance, **kwargs):
+    instance._stat_state = stats.task_state(instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_stats(sender, instance, **kwargs):
+    state = instance.__dict__.pop('_stat_state', None)
+    if state is not None:
+        stats.apply_delta(state[1], ())
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+@receiver(m2m_changed, sender=Task.department.through)
+def task_stats_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    """Soma/subtrai as chaves `assigned_to`/`department` dos vinculos alterados."""
+    scope = 'assigned_to' if sender is Task.assigned_to.through else 'department'
+    through, column = stats.RELATION_SCOPES[scope]
+    if action == 'pre_clear':
+        owner, other = ('task_id', column) if not reverse else (column, 'task_id')
+        instance._stat_cleared = list(through.objects.filter(**{owner: instance.pk}).values_list(other, flat=True))
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_stat_cleared', [])
+    elif action not in ('post_add', 'post_remove'):
+        return
+    if not reverse:
+        pairs = [(stats.instance_fields(instance), pk) for pk in pk_set]
+    else:
+        pairs = [(fields, instance.pk) for fields in stats.task_fields(pk_set).values()]
+    keys = []
+    for fields, related_id in pairs:
+        keys += [key for key in stats.task_keys(fields, **{f'{scope}_ids': [related_id]}) if key[0] == scope]
+    if action == 'post_add':
+        stats.apply_delta((), keys)
+    else:
+        stats.apply_delta(keys, ())
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Collaborator)
+@receiver(post_delete, sender=Department)
+def drop_scope_stats(sender, instance, **kwargs):
+    """`SET_NULL`/cascata nas tarefas nao disparam sinais: o recorte sai do rollup."""
+    scopes = {Project: ['project'], Collaborator: ['responsavel', 'assigned_to'], Department: ['department']}[sender]
+    TaskStat.objects.filter(scope__in=scopes, scope_id=instance.pk).delete()
+
+
+# Modelos cujas respostas ficam no cache, e o modelo "dono" de cada tabela M2M.
+CACHED_MODELS = (Task, Subtask, Project, Collaborator, Department)
+M2M_OWNERS = {
+    Task.assigned_to.through: Task,
+    Task.department.through: Task,
+    Project.responsible_collaborators.through: Project,
+    Project.used_by_departments.through: Project,
+}
+
+
+def expire_cached_responses(sender, **kwargs):
+    """Incrementa a versao do modelo alterado: ja e de novo apos o commit.
+
+    O incremento imediato vale para leituras na propria transacao; o segundo
+    descarta o que outro worker tenha gravado com dados ainda nao comitados.
+    Subtarefas tambem alteram a tarefa pai (`touch_parent_task` usa `update`,
+    que nao dispara sinais).
+    """
+    model = M2M_OWNERS.get(sender, sender)
+    models = (Subtask, Task) if model is Subtask else (model,)
+    bump_versions(*models)
+    transaction.on_commit(lambda: bump_versions(*models))
+
+
+for _model in CACHED_MODELS:
+    post_save.connect(expire_cached_responses, sender=_model, dispatch_uid=f'response-cache-save-{_model.__name__}')
+    post_delete.connect(expire_cached_responses, sender=_model, dispatch_uid=f'response-cache-delete-{_model.__name__}')
+    bulk_updated.connect(expire_cached_responses, sender=_model, dispatch_uid=f'response-cache-bulk-{_model.__name__}')
+for _through in M2M_OWNERS:
+    m2m_changed.connect(expire_cached_responses, sender=_through, dispatch_uid=f'response-cache-m2m-{_through.__name__}')
@@ -0,0 +1,266 @@
+"""Rollup de contagens de tarefas (`TaskStat`) e leitura de `/tasks/stats/`.
+
+Cada tarefa contribui com uma unidade para uma chave
+`(scope, scope_id, status, priority, deadline)` por recorte: `all`, seu
+projeto, seu responsavel, cada colaborador atribuido e cada setor. O recorte
+`all` e repartido em `ALL_SHARDS` linhas pelo id da tarefa (ver abaixo). Os sinais
+de `Task` e das tabelas M2M aplicam a diferenca entre as chaves antigas e as
+novas; operacoes em lote usam `track_task_stats`. O comando
+`reconcile_task_stats` recalcula a tabela a partir de `Task` e corrige
+qualquer desvio (ex.: gravacoes concorrentes da mesma tarefa).
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Case, Count, DateField, F, Q, Sum, Value, When
+
+from .models import Task, TaskStat
+
+# Prazo gravado para tarefas sem prazo ou concluidas: nunca entram em "vencidas".
+NO_DEADLINE = date.max
+
+KEY_FIELDS = ('scope', 'scope_id', 'status', 'priority', 'deadline')
+
+# Toda gravacao de tarefa atualiza o recorte `all`; com uma unica linha por
+# (status, prioridade, prazo), gravacoes concorrentes de tarefas diferentes
+# disputariam o mesmo lock. A linha de cada tarefa e `scope_id = id % ALL_SHARDS`
+# e a leitura soma as partes. Mudar o valor exige uma migracao como a 0020.
+ALL_SHARDS = 16
+
+# Chaves por comando em `apply_delta` (6 parametros cada; abaixo do limite do SQLite).
+UPSERT_BATCH_SIZE = 500
+
+# Campos de `Task` que alteram as chaves; outros `save(update_fields=...)` sao ignorados.
+STAT_FIELDS = {'status', 'priority', 'deadline', 'project', 'project_id', 'responsavel', 'responsavel_id'}
+
+# Recortes filtraveis em `/tasks/stats/` (mesmos parametros de `TaskViewSet`).
+SCOPE_PARAMS = ('project', 'responsavel', 'assigned_to', 'department')
+
+RELATION_SCOPES = {
+    'assigned_to': (Task.assigned_to.through, 'collaborator_id'),
+    'department': (Task.department.through, 'department_id'),
+}
+
+
+def effective_deadline(status, deadline):
+    if status == 'DONE' or deadline is None:
+        return NO_DEADLINE
+    return deadline
+
+
+def task_keys(fields, assigned_to_ids=(), department_ids=()):
+    """Chaves de uma tarefa; `fields` tem id, status, priority, deadline, project_id e responsavel_id."""
+    base = (fields['status'], fields['priority'], effective_deadline(fields['status'], fields['deadline']))
+    keys = [('all', fields['id'] % ALL_SHARDS, *base)]
+    if fields['project_id']:
+        keys.append(('project', fields['project_id'], *base))
+    if fields['responsavel_id']:
+        keys.append(('responsavel', fields['responsavel_id'], *base))
+    keys += [('assigned_to', pk, *base) for pk in assigned_to_ids]
+    keys += [('department', pk, *base) for pk in department_ids]
+    return keys
+
+
+def instance_fields(task):
+    return {
+        'id': task.pk,
+        'status': task.status,
+        'priority': task.priority,
+        'deadline': task.deadline,
+        'project_id': task.project_id,
+        'responsavel_id': task.responsavel_id,
+    }
+
+
+def task_fields(task_ids):
+    """Campos relevantes das tarefas, lidos do banco: uma consulta."""
+    rows = Task.objects.filter(pk__in=task_ids).values('id', 'status', 'priority', 'deadline', 'project_id', 'responsavel_id')
+    return {row['id']: row for row in rows}
+
+
+def relation_ids(task_ids):
+    """Ids de `assigned_to` e `department` por tarefa: uma consulta por relacao."""
+    related = {}
+    for scope, (through, column) in RELATION_SCOPES.items():
+        ids = {task_id: [] for task_id in task_ids}
+        for task_id, pk in through.objects.filter(task_id__in=task_ids).values_list('task_id', column):
+            ids[task_id].append(pk)
+        related[scope] = ids
+    return related
+
+
+def task_state(task_id):
+    """`(campos, chaves, assigned_to_ids, department_ids)` de uma tarefa no banco, ou None."""
+    fields = task_fields([task_id]).get(task_id)
+    if fields is None:
+        return None
+    related = relation_ids([task_id])
+    assigned, departments = related['assigned_to'][task_id], related['department'][task_id]
+    return fields, task_keys(fields, assigned, departments), assigned, departments
+
+
+def snapshot(task_ids):
+    """Chaves atuais (no banco) de cada tarefa, como `Counter`."""
+    task_ids = list(task_ids)
+    fields = task_fields(task_ids)
+    related = relation_ids(list(fields))
+    keys = Counter()
+    for task_id, row in fields.items():
+        keys.update(task_keys(row, related['assigned_to'][task_id], related['department'][task_id]))
+    return keys
+
+
+def apply_delta(old, new):
+    """Soma `new - old` nas linhas do rollup (criando as que faltarem).
+
+    Um unico `INSERT ... ON CONFLICT DO UPDATE` (PostgreSQL e SQLite) por
+    lote de chaves, em vez de UPDATE/INSERT por chave.
+    """
+    delta = Counter(new)
+    delta.subtract(old)
+    rows = [(*key, amount) for key, amount in delta.items() if amount]
+    if not rows:
+        return
+    connection = transaction.get_connection()
+    quote = connection.ops.quote_name
+    table = quote(TaskStat._meta.db_table)
+    columns = [*KEY_FIELDS, 'count']
+    deadline = TaskStat._meta.get_field('deadline')
+    keys = ', '.join(quote(column) for column in KEY_FIELDS)
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        placeholders = ', '.join(['(%s)' % ', '.join(['%s'] * len(columns))] * len(batch))
+        params = []
+        for scope, scope_id, status, priority, day, amount in batch:
+            params += [scope, scope_id, status, priority, deadline.get_db_prep_value(day, connection), amount]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(quote(column) for column in columns)}) VALUES {placeholders} '
+                f'ON CONFLICT ({keys}) DO UPDATE SET {quote("count")} = {table}.{quote("count")} + excluded.{quote("count")}',
+                params,
+            )
+
+
+@contextmanager
+def track_task_stats(task_ids):
+    """Atualiza o rollup em operacoes que nao disparam `post_save` (ex.: `bulk_update`)."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        yield
+        return
+    before = snapshot(task_ids)
+    yield
+    apply_delta(before, snapshot(task_ids))
+
+
+def _scope_rows(task_model):
+    """Consultas agregadas (uma por recorte) que reconstroem o rollup."""
+    deadline = Case(
+        When(Q(status='DONE') | Q(deadline__isnull=True), then=Value(NO_DEADLINE)),
+        default=F('deadline'),
+        output_field=DateField(),
+    )
+    tasks = task_model.objects.order_by().annotate(stat_deadline=deadline)
+    yield 'all', tasks.annotate(stat_scope_id=F('id') % ALL_SHARDS)
+    yield 'project', tasks.filter(project__isnull=False).annotate(stat_scope_id=F('project_id'))
+    yield 'responsavel', tasks.filter(responsavel__isnull=False).annotate(stat_scope_id=F('responsavel_id'))
+    yield 'assigned_to', tasks.filter(assigned_to__isnull=False).annotate(stat_scope_id=F('assigned_to'))
+    yield 'department', tasks.filter(department__isnull=False).annotate(stat_scope_id=F('department'))
+
+
+def compute_stats(task_model=Task):
+    """Rollup completo calculado no banco: `{chave: quantidade}`.
+
+    Aceita o modelo historico nas migracoes.
+    """
+    counts = {}
+    for scope, queryset in _scope_rows(task_model):
+        rows = (
+            queryset.values('stat_scope_id', 'status', 'priority', 'stat_deadline')
+            .annotate(total=Count('id'))
+            .values_list('stat_scope_id', 'status', 'priority', 'stat_deadline', 'total')
+        )
+        for scope_id, status, priority, deadline, total in rows:
+            counts[(scope, scope_id, status, priority, deadline)] = total
+    return counts
+
+
+def rebuild_stats(stat_model=TaskStat, task_model=Task, dry_run=False):
+    """Substitui o rollup pelo valor recalculado; retorna quantas chaves divergiam.
+
+    No PostgreSQL a tabela fica travada durante o recalculo: deltas de outras
+    transacoes esperam e sao aplicados sobre o valor novo.
+    """
+    with transaction.atomic():
+        connection = transaction.get_connection()
+        if connection.vendor == 'postgresql' and not dry_run:
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {stat_model._meta.db_table} IN EXCLUSIVE MODE')
+        expected = compute_stats(task_model)
+        current = {
+            tuple(row[:-1]): row[-1]
+            for row in stat_model.objects.values_list(*KEY_FIELDS, 'count')
+            if row[-1]
+        }
+        drift = sum(1 for key in expected.keys() | current.keys() if expected.get(key) != current.get(key))
+        if dry_run:
+            return drift
+        stat_model.objects.all().delete()
+        stat_model.objects.bulk_create(
+            [stat_model(count=total, **dict(zip(KEY_FIELDS, key))) for key, total in expected.items()],
+            batch_size=1000,
+        )
+    return drift
+
+
+def rollup_groups(queryset, today):
+    """`(status, priority, total, overdue)` das linhas do rollup, agrupadas no banco."""
+    return list(
+        queryset.values('status', 'priority')
+        .annotate(total=Sum('count'), overdue=Sum('count', filter=Q(deadline__lt=today), default=0))
+        .values_list('status', 'priority', 'total', 'overdue')
+    )
+
+
+def live_groups(queryset, today):
+    """Mesmo formato de `rollup_groups`, contado direto em `Task` (filtros combinados)."""
+    overdue = Q(deadline__lt=today) & ~Q(status='DONE')
+    return list(
+        queryset.order_by().values('status', 'priority')
+        .annotate(total=Count('id', distinct=True), overdue=Count('id', distinct=True, filter=overdue))
+        .values_list('status', 'priority', 'total', 'overdue')
+    )
+
+
+def summarize(groups):
+    """Payload de `/tasks/stats/` a partir de grupos `(status, priority, total, overdue)`."""
+    by_status = {code: 0 for code, _ in Task.STATUS_CHOICES}
+    by_priority = {code: 0 for code, _ in Task.PRIORITY_CHOICES}
+    overdue = 0
+    for status, priority, total, group_overdue in groups:
+        by_status[status] += total
+        by_priority[priority] += total
+        overdue += group_overdue
+    return {
+        'total': sum(by_status.values()),
+        'overdue': overdue,
+        'by_status': by_status,
+        'by_priority': by_priority,
+    }
+
+
+def scope_breakdown(scope, status, today):
+    """`[{id, total, overdue}]` de cada projeto/pessoa/setor, agrupado no banco."""
+    queryset = TaskStat.objects.filter(scope=scope)
+    if status:
+        queryset = queryset.filter(status=status)
+    rows = (
+        queryset.values('scope_id')
+        .annotate(total=Sum('count'), overdue=Sum('count', filter=Q(deadline__lt=today), default=0))
+        .filter(total__gt=0)
+        .order_by('scope_id')
+    )
+    return [{'id': row['scope_id'], 'total': row['total'], 'overdue': row['overdue']} for row in rows]
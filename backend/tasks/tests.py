@@ -1,7 +1,40 @@
 """Testes de API para o app tasks (Task e Subtask)."""
 
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
 import pytest
-from tasks.models import Subtask, Task
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from collaborators.models import Collaborator
+from departments.models import Department
+from tasks.fast_serializers import serialize_task_rows, task_rows
+from tasks.models import Subtask, Task, TaskTombstone
+from tasks.ordering import ORDER_GAP, TASK_COLUMN_ORDERING, rank_between
+from tasks.public_board import build_public_board, public_board_key
+from tasks.search import prefix_query
+from tasks.serializers import TaskSerializer
+from tasks.views import TaskViewSet
+
+
+@pytest.fixture
+def grow_tasks(project, collaborator, department):
+    """`grow` de `assert_constant_queries`: tarefas com todas as relacoes do card."""
+    def grow(indices):
+        for index in indices:
+            task = Task.objects.create(
+                title=f"Tarefa {index}", status="TODO", project=project, responsavel=collaborator,
+            )
+            other = Collaborator.objects.create(name=f"Pessoa {index}", email=f"pessoa{index}@test.com")
+            task.assigned_to.add(collaborator, other)
+            task.department.add(department)
+            Subtask.objects.create(task=task, title="Passo 1")
+            Subtask.objects.create(task=task, title="Passo 2")
+    return grow
 
 
 # ========================
@@ -20,12 +53,29 @@ class TestTaskAPI:
     def test_list_authenticated(self, admin_client, task):
         res = admin_client.get(self.url)
         assert res.status_code == 200
-        assert res.data["count"] >= 1
+        assert len(res.data["results"]) >= 1
 
     def test_list_anonymous_forbidden(self, anon_client):
         res = anon_client.get(self.url)
         assert res.status_code == 401
 
+    @pytest.mark.parametrize("params", [
+        {},
+        {"expand": "project,responsavel,assigned_to,department,subtasks"},
+        {"q": "tarefa"},
+        {"since": (timezone.now() - timedelta(days=1)).isoformat()},
+    ])
+    def test_list_without_n_plus_one(self, admin_client, grow_tasks, assert_constant_queries, params):
+        assert_constant_queries(admin_client, self.url, grow_tasks, params)
+
+    def test_board_without_n_plus_one(self, admin_client, grow_tasks, assert_constant_queries):
+        assert_constant_queries(admin_client, f"{self.url}board/", grow_tasks)
+
+    @pytest.mark.max_queries(5)
+    def test_retrieve_query_budget(self, admin_client, task):
+        res = admin_client.get(self.detail_url(task.id))
+        assert res.status_code == 200
+
     # ---- Create
     def test_create(self, admin_client, project):
         res = admin_client.post(self.url, {
@@ -65,6 +115,1444 @@ class TestTaskAPI:
         assert res.status_code == 200
         assert all(t["status"] == "TODO" for t in res.data["results"])
 
+    # ---- Paginacao keyset
+    def test_keyset_pages_cover_board(self, admin_client, project):
+        for i in range(7):
+            # Empates de `order` sao desempatados por `-id`.
+            Task.objects.create(title=f"T{i}", project=project, order=i // 2)
+        seen = []
+        url, params = self.url, {"page_size": 3}
+        while url:
+            res = admin_client.get(url, params)
+            assert res.status_code == 200
+            assert "count" not in res.data
+            seen += [t["id"] for t in res.data["results"]]
+            url, params = res.data["next"], None
+        expected = list(Task.objects.order_by("order", "-id").values_list("id", flat=True))
+        assert seen == expected
+
+    def test_page_size_is_capped(self, admin_client, project, settings):
+        settings.TASK_MAX_PAGE_SIZE = 2
+        for i in range(3):
+            Task.objects.create(title=f"T{i}", project=project)
+        res = admin_client.get(self.url, {"page_size": 100})
+        assert len(res.data["results"]) == 2
+        assert res.data["next"]
+
+    def test_deep_page_has_constant_queries(self, admin_client, project, django_assert_max_num_queries):
+        for i in range(10):
+            Task.objects.create(title=f"T{i}", project=project, order=i)
+        res = admin_client.get(self.url, {"page_size": 2})
+        while res.data["next"]:
+            # ETag + pagina + assigned_to + department + subtasks; sem COUNT(*).
+            with django_assert_max_num_queries(5):
+                res = admin_client.get(res.data["next"])
+
+    def test_deep_page_seeks_the_index(self, project):
+        from django.db import connection
+        from tasks.pagination import after_cursor
+        Task.objects.bulk_create([Task(title=f"T{i}", project=project, order=i) for i in range(500)])
+        last = Task.objects.order_by("order", "-id")[400]
+        page = after_cursor(task_rows(Task.objects.order_by("order", "-id"), None), last.order, last.id)
+        if connection.vendor == "sqlite":
+            # Busca a partir do cursor no indice, em vez de percorre-lo desde o inicio.
+            assert "SEARCH tasks_task USING INDEX tasks_task_order_id_idx (order>?)" in page[:20].explain()
+        assert [row["id"] for row in page[:2]] == list(Task.objects.filter(order__gt=400).order_by("order").values_list("id", flat=True)[:2])
+
+    def test_invalid_cursor(self, admin_client):
+        res = admin_client.get(self.url, {"cursor": "nao-e-cursor"})
+        assert res.status_code == 404
+
+
+# ========================
+# Reordenacao em lote
+# ========================
+@pytest.mark.django_db
+class TestBulkReorder:
+    """Testes de POST /api/v1/tasks/bulk-reorder/ e /api/v1/subtasks/bulk-reorder/."""
+
+    url = "/api/v1/tasks/bulk-reorder/"
+    subtask_url = "/api/v1/subtasks/bulk-reorder/"
+
+    def test_reorder_and_move_to_done(self, admin_client, task, project):
+        other = Task.objects.create(title="Outra", project=project, order=1)
+        res = admin_client.post(self.url, [
+            {"id": task.id, "order": 5, "status": "DONE"},
+            {"id": other.id, "order": 0},
+        ], format="json")
+        assert res.status_code == 200
+        task.refresh_from_db()
+        other.refresh_from_db()
+        assert (task.order, task.status) == (5, "DONE")
+        assert task.completed_at is not None
+        assert other.order == 0
+        assert res.data[0]["completed_at"] is not None
+
+    def test_leaving_done_clears_completed_at(self, admin_client, project):
+        done = Task.objects.create(title="Feita", project=project, status="DONE", completed_at=timezone.now())
+        res = admin_client.post(self.url, [{"id": done.id, "order": 0, "status": "IN_REVIEW"}], format="json")
+        assert res.status_code == 200
+        done.refresh_from_db()
+        assert done.completed_at is None
+
+    def test_single_update_statement(self, admin_client, project, django_assert_max_num_queries):
+        tasks = [Task.objects.create(title=f"T{i}", project=project, order=i) for i in range(30)]
+        payload = [{"id": t.id, "order": 29 - i} for i, t in enumerate(tasks)]
+        # SELECT ... FOR UPDATE + UPDATE (+ savepoints da transacao).
+        with django_assert_max_num_queries(4):
+            res = admin_client.post(self.url, payload, format="json")
+        assert res.status_code == 200
+        assert Task.objects.get(pk=tasks[0].pk).order == 29
+
+    def test_unknown_id_rolls_back(self, admin_client, task):
+        res = admin_client.post(self.url, [
+            {"id": task.id, "order": 9},
+            {"id": 999999, "order": 1},
+        ], format="json")
+        assert res.status_code == 400
+        task.refresh_from_db()
+        assert task.order == 0
+
+    def test_duplicate_ids_rejected(self, admin_client, task):
+        res = admin_client.post(self.url, [
+            {"id": task.id, "order": 1}, {"id": task.id, "order": 2},
+        ], format="json")
+        assert res.status_code == 400
+
+    def test_reorder_subtasks(self, admin_client, task):
+        first = Subtask.objects.create(task=task, title="A", order=0)
+        second = Subtask.objects.create(task=task, title="B", order=1)
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        res = admin_client.post(self.subtask_url, [
+            {"id": first.id, "order": 1}, {"id": second.id, "order": 0},
+        ], format="json")
+        assert res.status_code == 200
+        assert list(task.subtasks.values_list("title", flat=True)) == ["B", "A"]
+        task.refresh_from_db()
+        assert task.updated_at > timezone.now() - timedelta(minutes=1)
+
+
+# ========================
+# Ordenacao esparsa (move)
+# ========================
+@pytest.mark.django_db
+class TestMove:
+    """Testes de POST /api/v1/tasks/<id>/move/ e /api/v1/subtasks/<id>/move/."""
+
+    def move_url(self, pk):
+        return f"/api/v1/tasks/{pk}/move/"
+
+    def column(self, status="TODO"):
+        return list(Task.objects.filter(status=status).order_by(*TASK_COLUMN_ORDERING).values_list("title", flat=True))
+
+    def test_rank_between(self):
+        assert rank_between(None, None) == 0
+        assert rank_between(None, 1024) == 0
+        assert rank_between(1024, None) == 2048
+        assert rank_between(1024, 2048) == 1536
+        assert rank_between(7, 8) is None
+
+    def test_move_touches_single_row(self, admin_client, project):
+        a, b, c = (Task.objects.create(title=t, project=project, order=(i + 1) * ORDER_GAP) for i, t in enumerate("ABC"))
+        res = admin_client.post(self.move_url(c.id), {"after": a.id}, format="json")
+        assert res.status_code == 200
+        assert [item["id"] for item in res.data] == [c.id]
+        assert self.column() == ["A", "C", "B"]
+        assert Task.objects.get(pk=b.pk).order == 2 * ORDER_GAP
+
+    def test_move_to_top_and_other_column(self, admin_client, project):
+        a = Task.objects.create(title="A", project=project, order=ORDER_GAP)
+        done = Task.objects.create(title="D", project=project, status="DONE", order=ORDER_GAP)
+        res = admin_client.post(self.move_url(a.id), {"after": None, "status": "DONE"}, format="json")
+        assert res.status_code == 200
+        assert self.column("DONE") == ["A", "D"]
+        assert res.data[0]["completed_at"] is not None
+        assert Task.objects.get(pk=done.pk).order == ORDER_GAP
+
+    def test_exhausted_gap_rebalances_column(self, admin_client, project):
+        # Ordens densas/empatadas como as antigas: nao ha lacuna entre A e B.
+        b = Task.objects.create(title="B", project=project, order=0)
+        a = Task.objects.create(title="A", project=project, order=0)
+        c = Task.objects.create(title="C", project=project, order=1)
+        res = admin_client.post(self.move_url(c.id), {"after": a.id}, format="json")
+        assert res.status_code == 200
+        assert self.column() == ["A", "C", "B"]
+        assert {item["id"] for item in res.data} >= {a.id, b.id, c.id}
+
+    def test_after_must_be_in_target_column(self, admin_client, project):
+        a = Task.objects.create(title="A", project=project)
+        other = Task.objects.create(title="X", project=project, status="DONE")
+        res = admin_client.post(self.move_url(a.id), {"after": other.id}, format="json")
+        assert res.status_code == 400
+
+    def test_column_is_scoped_to_project(self, admin_client, project):
+        from projectsmanager.models import Project
+        other = Project.objects.create(name="Outro")
+        b = Task.objects.create(title="B", project=project, order=0)
+        a = Task.objects.create(title="A", project=project, order=0)
+        c = Task.objects.create(title="C", project=project, order=1)
+        foreign = Task.objects.create(title="X", project=other, order=0)
+        res = admin_client.post(self.move_url(c.id), {"after": a.id}, format="json")
+        assert {item["id"] for item in res.data} == {a.id, b.id, c.id}
+        assert Task.objects.get(pk=foreign.pk).order == 0
+        assert admin_client.post(self.move_url(c.id), {"after": foreign.id}, format="json").status_code == 400
+
+    def test_rebalance_locks_column(self, project):
+        from unittest import mock
+        from django.db import transaction
+        from django.db.models import QuerySet
+        from tasks.ordering import rebalance
+        for title in "AB":
+            Task.objects.create(title=title, project=project, order=0)
+        original = QuerySet.select_for_update
+        with mock.patch.object(QuerySet, "select_for_update", autospec=True, side_effect=original) as locked:
+            with transaction.atomic():
+                rebalance(Task.objects.filter(project=project, status="TODO"), TASK_COLUMN_ORDERING)
+        assert locked.call_count == 1
+
+    def test_rebalance_command(self, project):
+        for i, title in enumerate("ABC"):
+            Task.objects.create(title=title, project=project, order=i)
+        call_command("rebalance_order", stdout=io.StringIO())
+        assert list(Task.objects.order_by("order").values_list("order", flat=True)) == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+        assert self.column() == ["A", "B", "C"]
+
+    def test_move_subtask_and_append_new(self, admin_client, task):
+        first = admin_client.post("/api/v1/subtasks/", {"task": task.id, "title": "1"}).data
+        second = admin_client.post("/api/v1/subtasks/", {"task": task.id, "title": "2"}).data
+        assert second["order"] > first["order"]
+        res = admin_client.post(f"/api/v1/subtasks/{second['id']}/move/", {"after": None}, format="json")
+        assert res.status_code == 200
+        assert list(task.subtasks.order_by("order").values_list("title", flat=True)) == ["2", "1"]
+
+
+# ========================
+# Nomes desnormalizados
+# ========================
+@pytest.mark.django_db
+class TestRelationNames:
+    """`assigned_to_names`/`department_names` acompanham M2M, renomeacoes e exclusoes."""
+
+    def names(self, task):
+        task.refresh_from_db()
+        return task.assigned_to_names, task.department_names
+
+    def test_migration_fill_is_batched(self, project, collaborator, department, django_assert_num_queries):
+        import importlib
+        from types import SimpleNamespace
+        from django.apps import apps
+        from django.db import connection
+        migration = importlib.import_module("tasks.migrations.0016_task_relation_names")
+        tasks = [Task.objects.create(title=f"T{i}", project=project) for i in range(5)]
+        for task in tasks:
+            task.assigned_to.add(collaborator)
+        tasks[0].department.add(department)
+        Task.objects.update(assigned_to_names=[], department_names=[])
+        # Nomes de assigned_to + nomes de department + um UPDATE para o lote.
+        with django_assert_num_queries(3):
+            migration.fill_relation_names(apps, SimpleNamespace(connection=connection))
+        assert self.names(tasks[0]) == ([collaborator.name], ["TI"])
+        assert self.names(tasks[4]) == ([collaborator.name], [])
+
+    def test_follow_m2m_changes(self, task, collaborator, department):
+        other = Collaborator.objects.create(name="Ana Lima", email="ana@test.com")
+        task.assigned_to.add(collaborator, other)
+        task.department.add(department)
+        assert self.names(task) == (["Ana Lima", collaborator.name], ["TI"])
+        task.assigned_to.remove(other)
+        assert self.names(task) == ([collaborator.name], ["TI"])
+        department.department_tasks.clear()
+        other.assigned_tasks.add(task)
+        assert self.names(task) == (["Ana Lima", collaborator.name], [])
+
+    def test_follow_rename_and_delete(self, task, collaborator, department):
+        task.assigned_to.add(collaborator)
+        task.department.add(department)
+        task.refresh_from_db()
+        before = task.updated_at
+        collaborator.name = "Nome Novo"
+        collaborator.save()
+        department.delete()
+        assert self.names(task) == (["Nome Novo"], [])
+        assert task.updated_at > before
+
+    def test_api_write_returns_names(self, admin_client, task, collaborator):
+        res = admin_client.patch(f"/api/v1/tasks/{task.id}/", {"assigned_to": [collaborator.id]}, format="json")
+        assert res.data["assigned_to_names"] == [collaborator.name]
+
+    def test_reads_skip_m2m_names(self, task, collaborator, django_assert_num_queries):
+        from django.contrib import admin
+        task.assigned_to.add(collaborator)
+        task_admin = admin.site._registry[Task]
+        tasks = list(Task.objects.all())
+        with django_assert_num_queries(0):
+            assert [task_admin.assigned_to_list(t) for t in tasks] == [collaborator.name]
+
+
+# ========================
+# Estatisticas (rollup)
+# ========================
+@pytest.mark.django_db
+class TestTaskStats:
+    """Testes do rollup `TaskStat` e de /api/v1/tasks/stats/."""
+
+    url = "/api/v1/tasks/stats/"
+
+    def assert_rollup_consistent(self):
+        from tasks.models import TaskStat
+        from tasks.stats import KEY_FIELDS, compute_stats
+        stored = {row[:-1]: row[-1] for row in TaskStat.objects.values_list(*KEY_FIELDS, "count") if row[-1]}
+        assert stored == compute_stats()
+
+    def test_incremental_updates_match_rebuild(self, admin_client, task, project, collaborator, department):
+        other = Collaborator.objects.create(name="Ana Lima", email="ana@test.com")
+        task.assigned_to.add(collaborator, other)
+        task.department.add(department)
+        self.assert_rollup_consistent()
+        admin_client.patch(f"/api/v1/tasks/{task.id}/", {"status": "DONE", "deadline": "2026-01-01"}, format="json")
+        self.assert_rollup_consistent()
+        other.assigned_tasks.clear()
+        department.department_tasks.add(Task.objects.create(title="Nova", priority="HIGH"))
+        self.assert_rollup_consistent()
+        admin_client.post("/api/v1/tasks/bulk-reorder/", [{"id": task.id, "order": 5, "status": "TODO"}], format="json")
+        self.assert_rollup_consistent()
+        collaborator.delete()
+        project.delete()
+        self.assert_rollup_consistent()
+        task.delete()
+        self.assert_rollup_consistent()
+
+    def test_payload(self, admin_client, project, collaborator):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        late = Task.objects.create(title="Atrasada", project=project, deadline=yesterday, priority="URGENT")
+        late.assigned_to.add(collaborator)
+        Task.objects.create(title="Feita", project=project, deadline=yesterday, status="DONE")
+        Task.objects.create(title="Solta")
+        res = admin_client.get(self.url)
+        assert res.status_code == 200
+        assert res.data["total"] == 3
+        assert res.data["overdue"] == 1
+        assert res.data["by_status"] == {"TODO": 2, "IN_PROGRESS": 0, "IN_REVIEW": 0, "DONE": 1}
+        assert res.data["by_priority"]["URGENT"] == 1
+        assert res.data["by_project"] == [{"id": project.id, "total": 2, "overdue": 1}]
+        assert res.data["by_assigned_to"] == [{"id": collaborator.id, "total": 1, "overdue": 1}]
+
+    def test_scope_and_status_filters(self, admin_client, project, collaborator, django_assert_num_queries):
+        done = Task.objects.create(title="Feita", project=project, status="DONE")
+        done.assigned_to.add(collaborator)
+        Task.objects.create(title="Aberta", project=project)
+        with django_assert_num_queries(1):
+            res = admin_client.get(self.url, {"project": project.id, "status": "DONE"})
+        assert res.data["total"] == 1
+        assert "by_project" not in res.data
+        # Recortes combinados: contagem direta nas tarefas.
+        res = admin_client.get(self.url, {"project": project.id, "assigned_to": collaborator.id})
+        assert res.data["by_status"]["DONE"] == 1
+        assert res.data["total"] == 1
+
+    def test_all_scope_split_across_rows(self, admin_client, project):
+        from tasks.models import TaskStat
+        from tasks.stats import ALL_SHARDS
+        tasks = [Task.objects.create(title=f"T{i}", project=project) for i in range(ALL_SHARDS + 1)]
+        rows = TaskStat.objects.filter(scope="all", count__gt=0)
+        assert rows.count() == ALL_SHARDS
+        assert {row.scope_id for row in rows} == set(range(ALL_SHARDS))
+        tasks[0].delete()
+        assert admin_client.get(self.url).data["total"] == ALL_SHARDS
+        self.assert_rollup_consistent()
+
+    def test_invalid_params(self, admin_client):
+        assert admin_client.get(self.url, {"status": "X"}).status_code == 400
+        assert admin_client.get(self.url, {"project": "abc"}).status_code == 400
+
+    def test_migrations_build_the_rollup(self, task, collaborator, department):
+        import importlib
+        from types import SimpleNamespace
+        from django.apps import apps
+        from django.db import connection
+        from tasks.models import TaskStat
+        task.assigned_to.add(collaborator)
+        task.department.add(department)
+        Task.objects.create(title="Feita", status="DONE")
+        schema_editor = SimpleNamespace(connection=connection)
+        TaskStat.objects.all().delete()
+        importlib.import_module("tasks.migrations.0017_task_stat").fill_task_stats(apps, schema_editor)
+        assert set(TaskStat.objects.filter(scope="all").values_list("scope_id", flat=True)) == {0}
+        importlib.import_module("tasks.migrations.0020_task_stat_all_shards").shard_all_scope(apps, schema_editor)
+        self.assert_rollup_consistent()
+
+    def test_reconcile_command(self, task):
+        from tasks.models import TaskStat
+        TaskStat.objects.all().delete()
+        out = io.StringIO()
+        call_command("reconcile_task_stats", "--check", stdout=out)
+        assert "divergentes" in out.getvalue()
+        call_command("reconcile_task_stats", stdout=io.StringIO())
+        self.assert_rollup_consistent()
+
+
+# ========================
+# Historico de status e analytics
+# ========================
+@pytest.mark.django_db
+class TestTaskAnalytics:
+    """Testes de `TaskTransition` e /api/v1/tasks/analytics/."""
+
+    url = "/api/v1/tasks/analytics/"
+
+    def history(self, task):
+        from tasks.models import TaskTransition
+        labels = {code: status for status, code in TaskTransition.STATUS_CODES.items()}
+        return [
+            (labels.get(old), labels[new])
+            for old, new in task.transitions.order_by("at", "id").values_list("from_status", "to_status")
+        ]
+
+    def test_transitions_logged_from_all_paths(self, admin_client, task):
+        admin_client.patch(f"/api/v1/tasks/{task.id}/", {"status": "IN_PROGRESS"}, format="json")
+        admin_client.patch(f"/api/v1/tasks/{task.id}/", {"title": "So o titulo"}, format="json")
+        admin_client.post(f"/api/v1/tasks/{task.id}/move/", {"status": "IN_REVIEW"}, format="json")
+        admin_client.post("/api/v1/tasks/bulk-reorder/", [{"id": task.id, "order": 1, "status": "DONE"}], format="json")
+        assert self.history(task) == [
+            (None, "TODO"), ("TODO", "IN_PROGRESS"), ("IN_PROGRESS", "IN_REVIEW"), ("IN_REVIEW", "DONE"),
+        ]
+
+    def make_history(self, title, steps, project=None):
+        from tasks.models import TaskTransition
+        task = Task.objects.create(title=title, project=project, status=steps[-1][0])
+        task.transitions.all().delete()
+        previous = None
+        for status, at in steps:
+            TaskTransition.build(task.id, previous, status, at).save()
+            previous = status
+        return task
+
+    def test_flow_metrics(self, admin_client, project):
+        day = timezone.make_aware(datetime(2026, 3, 2, 12))  # segunda-feira
+        self.make_history("A", [("TODO", day), ("IN_PROGRESS", day + timedelta(days=1)),
+                                ("DONE", day + timedelta(days=3))], project)
+        self.make_history("B", [("TODO", day), ("IN_PROGRESS", day + timedelta(days=2)),
+                                ("DONE", day + timedelta(days=9))])
+        self.make_history("C", [("TODO", day), ("IN_PROGRESS", day + timedelta(days=1))])
+        res = admin_client.get(self.url, {"since": "2026-03-02", "until": "2026-03-16"})
+        assert res.status_code == 200
+        assert res.data["lead_time"]["count"] == 2
+        assert res.data["lead_time"]["p50"] == 6.0
+        assert res.data["cycle_time"]["max"] == 7.0
+        assert [w["count"] for w in res.data["throughput"]] == [1, 1]
+        flow = {row["date"].isoformat(): row for row in res.data["cumulative_flow"]}
+        assert flow["2026-03-02"]["TODO"] == 3
+        assert flow["2026-03-05"] == {"date": flow["2026-03-05"]["date"], "TODO": 0, "IN_PROGRESS": 2,
+                                      "IN_REVIEW": 0, "DONE": 1}
+        assert flow["2026-03-15"]["DONE"] == 2
+        assert res.data["wip_age"]["count"] == 1
+        assert res.data["wip_age"]["oldest"][0]["title"] == "C"
+
+    def test_filters_and_grouping(self, admin_client, project):
+        day = timezone.now() - timedelta(days=1)
+        self.make_history("A", [("TODO", day), ("DONE", day)], project)
+        self.make_history("B", [("TODO", day), ("DONE", day)])
+        assert admin_client.get(self.url, {"project": project.id}).data["lead_time"]["count"] == 1
+        grouped = admin_client.get(self.url, {"group_by": "project"}).data["throughput"]
+        assert sorted((row["project"] or 0, row["count"]) for row in grouped) == [(0, 1), (project.id, 1)]
+
+    def test_invalid_params(self, admin_client):
+        assert admin_client.get(self.url, {"since": "ontem"}).status_code == 400
+        assert admin_client.get(self.url, {"since": "2020-01-01", "until": "2026-01-01"}).status_code == 400
+        assert admin_client.get(self.url, {"group_by": "status"}).status_code == 400
+
+
+# ========================
+# Campos esparsos
+# ========================
+@pytest.mark.django_db
+class TestTaskSparseFields:
+    """Testes de `?fields=`, `?omit=` e `?expand=` em /api/v1/tasks/."""
+
+    url = "/api/v1/tasks/"
+
+    def queries(self, client, url, params):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as captured:
+            res = client.get(url, params)
+        assert res.status_code == 200
+        return res, [query["sql"] for query in captured]
+
+    def test_fields_skip_relations(self, admin_client, task, collaborator):
+        task.assigned_to.add(collaborator)
+        Subtask.objects.create(task=task, title="Sub")
+        res, sql = self.queries(admin_client, self.url, {"fields": "id,title,status,order"})
+        assert res.data["results"] == [{"id": task.id, "title": task.title, "status": "TODO", "order": task.order}]
+        assert not any('"tasks_subtask"."task_id" IN' in query for query in sql)
+        assert not any('"tasks_task_assigned_to"."task_id" IN' in query for query in sql)
+        assert not any('"tasks_task"."description"' in query for query in sql)
+
+    def test_omit_keeps_serializer_format(self, admin_client, task, collaborator):
+        task.assigned_to.add(collaborator)
+        full = admin_client.get(self.url).data["results"][0]
+        res = admin_client.get(self.url, {"omit": "subtasks,description,solution"})
+        expected = {k: v for k, v in full.items() if k not in ("subtasks", "description", "solution")}
+        assert res.data["results"][0] == expected
+        assert list(res.data["results"][0]) == list(expected)
+
+    def test_board_and_retrieve(self, admin_client, task):
+        res = admin_client.get(f"{self.url}board/", {"fields": "id,title"})
+        assert res.data["columns"][0]["results"] == [{"id": task.id, "title": task.title}]
+        res, sql = self.queries(admin_client, f"{self.url}{task.id}/", {"fields": "id,title"})
+        assert res.data == {"id": task.id, "title": task.title}
+        assert not any('"tasks_subtask"."task_id" IN' in query for query in sql)
+
+    def test_expand(self, admin_client, task, collaborator, project):
+        task.assigned_to.add(collaborator)
+        res = admin_client.get(self.url, {"expand": "project,assigned_to", "fields": "id,project,assigned_to"})
+        assert res.data["results"] == [{
+            "id": task.id,
+            "project": {"id": project.id, "name": project.name},
+            "assigned_to": [{"id": collaborator.id, "name": collaborator.name, "email": collaborator.email}],
+        }]
+
+    def test_writes_ignore_fields(self, admin_client, task):
+        res = admin_client.patch(f"{self.url}{task.id}/?fields=id", {"title": "Novo"}, format="json")
+        assert res.status_code == 200
+        assert res.data["title"] == "Novo"
+
+
+# ========================
+# Operacoes em lote
+# ========================
+@pytest.mark.django_db
+class TestTaskBatch:
+    """Testes de POST /api/v1/tasks/batch/."""
+
+    url = "/api/v1/tasks/batch/"
+
+    def test_update_status_and_relations(self, admin_client, task, collaborator, department):
+        done = Task.objects.create(title="Ja feita", status="DONE", completed_at=timezone.now() - timedelta(days=3))
+        maria = Collaborator.objects.create(name="Maria", email="maria@test.com")
+        task.assigned_to.add(collaborator)
+        res = admin_client.post(self.url, [
+            {"op": "update", "ids": [task.id, done.id, 999], "set": {"status": "DONE", "priority": "HIGH"}},
+            {"op": "update", "ids": [task.id, done.id], "add": {"assigned_to": [maria.id]}, "remove": {"assigned_to": [collaborator.id]}},
+        ], format="json")
+        assert res.status_code == 200
+        assert res.data["results"][0] == {"op": "update", "updated": [task.id, done.id], "missing": [999]}
+
+        task.refresh_from_db()
+        before = done.completed_at
+        done.refresh_from_db()
+        assert task.status == "DONE" and task.priority == "HIGH"
+        assert task.completed_at is not None
+        assert done.completed_at == before
+        assert task.assigned_to_names == ["Maria"] and done.assigned_to_names == ["Maria"]
+        assert list(task.transitions.values_list("from_status", "to_status"))[-1] == (1, 4)
+        assert done.transitions.filter(from_status=4).count() == 0
+        out = io.StringIO()
+        call_command("reconcile_task_stats", "--check", stdout=out)
+        assert out.getvalue().startswith("0 chaves")
+
+    def test_reopen_clears_completed_at(self, admin_client):
+        done = Task.objects.create(title="Feita", status="DONE", completed_at=timezone.now())
+        admin_client.post(self.url, [{"op": "update", "ids": [done.id], "set": {"status": "TODO"}}], format="json")
+        done.refresh_from_db()
+        assert done.completed_at is None
+
+    def test_move_between_open_statuses_keeps_completed_at(self, admin_client):
+        completed_at = timezone.now() - timedelta(days=2)
+        reviewed = Task.objects.create(title="Revisada", status="IN_REVIEW", completed_at=completed_at)
+        done = Task.objects.create(title="Feita", status="DONE", completed_at=timezone.now())
+        admin_client.post(self.url, [
+            {"op": "update", "ids": [reviewed.id, done.id], "set": {"status": "IN_PROGRESS"}},
+        ], format="json")
+        reviewed.refresh_from_db()
+        done.refresh_from_db()
+        assert reviewed.completed_at == completed_at
+        assert done.completed_at is None
+
+    def test_create_and_delete(self, admin_client, task, project):
+        res = admin_client.post(self.url, [
+            {"op": "create", "data": {"title": "Nova", "status": "DONE", "project": project.id}},
+            {"op": "delete", "ids": [task.id]},
+        ], format="json")
+        assert res.status_code == 200
+        created = Task.objects.get(title="Nova")
+        assert res.data["results"] == [
+            {"op": "create", "id": created.id},
+            {"op": "delete", "deleted": [task.id], "missing": []},
+        ]
+        assert created.completed_at is not None
+        assert TaskTombstone.objects.filter(task_id=task.id).exists()
+
+    def test_invalid_operation_writes_nothing(self, admin_client, task):
+        res = admin_client.post(self.url, [
+            {"op": "update", "ids": [task.id], "set": {"status": "DONE"}},
+            {"op": "update", "ids": [task.id], "set": {"completed_at": "2020-01-01T00:00:00Z"}},
+        ], format="json")
+        assert res.status_code == 400
+        assert "set" in res.data[1]
+        task.refresh_from_db()
+        assert task.status == "TODO"
+
+    def test_update_is_set_based(self, admin_client, project, django_assert_max_num_queries):
+        ids = [Task.objects.create(title=f"T{i}", project=project).id for i in range(30)]
+        with django_assert_max_num_queries(25):
+            res = admin_client.post(self.url, [{"op": "update", "ids": ids, "set": {"status": "IN_PROGRESS"}}], format="json")
+        assert res.status_code == 200
+        assert Task.objects.filter(status="IN_PROGRESS").count() == 30
+
+    def test_requires_auth(self, anon_client):
+        assert anon_client.post(self.url, [], format="json").status_code == 401
+
+
+# ========================
+# Exportacao em streaming
+# ========================
+@pytest.mark.django_db
+class TestTaskExport:
+    """Testes de /api/v1/tasks/export/."""
+
+    url = "/api/v1/tasks/export/"
+
+    def body(self, res):
+        return b"".join(res.streaming_content).decode()
+
+    def test_csv_default(self, admin_client, task, collaborator):
+        task.assigned_to.add(collaborator)
+        Task.objects.create(title='Com "aspas", virgula', status="DONE")
+        res = admin_client.get(self.url)
+        assert res.status_code == 200
+        assert res["Content-Type"].startswith("text/csv")
+        assert "attachment" in res["Content-Disposition"]
+        import csv
+        rows = list(csv.DictReader(io.StringIO(self.body(res))))
+        by_title = {r["title"]: r for r in rows}
+        assert set(by_title) == {"Tarefa Teste", 'Com "aspas", virgula'}
+        assert by_title["Tarefa Teste"]["assigned_to_names"] == collaborator.name
+        assert by_title["Tarefa Teste"]["project_name"] == task.project.name
+
+    def test_jsonl_matches_api(self, admin_client, task, collaborator):
+        import json
+        task.assigned_to.add(collaborator)
+        Subtask.objects.create(task=task, title="Sub")
+        res = admin_client.get(self.url, {"format": "jsonl"})
+        lines = [json.loads(line) for line in self.body(res).splitlines()]
+        assert lines == json.loads(JSONRenderer().render(TaskSerializer(TaskViewSet.queryset.all(), many=True).data))
+
+    def test_honors_filters_and_chunks(self, admin_client, project, monkeypatch):
+        monkeypatch.setattr("tasks.export.EXPORT_CHUNK_SIZE", 2)
+        for i in range(5):
+            Task.objects.create(title=f"T{i}", project=project)
+        Task.objects.create(title="Fora")
+        res = admin_client.get(self.url, {"project": project.id, "format": "jsonl"})
+        chunks = list(res.streaming_content)
+        assert len(chunks) == 3
+        assert b"Fora" not in b"".join(chunks)
+
+    def test_without_server_side_cursors(self, admin_client, project, monkeypatch):
+        from django.db import connection
+        monkeypatch.setattr("tasks.export.EXPORT_CHUNK_SIZE", 2)
+        for i in range(5):
+            Task.objects.create(title=f"T{i}", project=project, order=(5 - i) * ORDER_GAP)
+        expected = self.body(admin_client.get(self.url, {"format": "jsonl"}))
+        monkeypatch.setitem(connection.settings_dict, "DISABLE_SERVER_SIDE_CURSORS", True)
+        res = admin_client.get(self.url, {"format": "jsonl"})
+        chunks = list(res.streaming_content)
+        assert len(chunks) == 3
+        assert b"".join(chunks).decode() == expected
+
+    def test_requires_auth(self, anon_client):
+        assert anon_client.get(self.url).status_code == 401
+
+
+# ========================
+# Importacao em lote
+# ========================
+@pytest.mark.django_db
+class TestTaskImport:
+    """Testes de `tasks.importer`, do comando `import_board` e de /tasks/import/."""
+
+    url = "/api/v1/tasks/import/"
+
+    def write(self, tmp_path, name, content):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def test_departments_and_collaborators(self, tmp_path, department):
+        departments = self.write(tmp_path, "setores.csv", (
+            "name,department_type,parent_department\n"
+            "Suporte,sub,TI\n"
+            "Financeiro,main,\n"
+            "Contas,sub,Financeiro\n"
+            "ti,main,\n"
+            "Orfao,sub,\n"
+        ))
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_board", "departments", departments, stdout=out, stderr=err)
+        assert "3 importadas, 2 com erro" in out.getvalue()
+        assert "linha 5: name" in err.getvalue()
+        assert "linha 6: parent_department" in err.getvalue()
+        contas = Department.objects.get(name="Contas")
+        assert contas.parent_department.name == "Financeiro"
+
+        collaborators = self.write(tmp_path, "pessoas.jsonl", (
+            '{"name": "Ana", "email": "ana@test.com", "department": "Contas"}\n'
+            '{"name": "Ana 2", "email": "ANA@test.com"}\n'
+            '{"name": "Bia", "email": "invalido"}\n'
+            "nao e json\n"
+        ))
+        call_command("import_board", "collaborators", collaborators, stdout=out, stderr=err)
+        assert Collaborator.objects.get(email="ana@test.com").department == contas
+        assert Collaborator.objects.count() == 1
+
+    def test_tasks_with_relations(self, collaborator, department, project):
+        Collaborator.objects.create(name="Ana", email="ana@test.com")
+        rows = [
+            (2, {
+                "title": "Migrada", "status": "DONE", "project": "projeto alpha",
+                "responsavel": "joao@test.com", "assigned_to": "Ana; Joao Silva",
+                "department": ["TI"], "subtasks": "Passo 1; Passo 2", "deadline": "2030-01-02",
+            }),
+            (3, {"title": "", "status": "PARADO", "project": "Nenhum"}),
+            (4, {"title": "Outra", "assigned_to": str(collaborator.pk)}),
+        ]
+        from tasks.importer import import_rows
+        report = import_rows("tasks", rows, batch_size=2)
+        assert report["created"] == 2
+        assert report["failed"] == 1
+        assert set(report["errors"][0]["errors"]) == {"title", "status", "project"}
+
+        task = Task.objects.get(title="Migrada")
+        assert task.completed_at is not None
+        assert task.responsavel == collaborator
+        assert task.assigned_to_names == ["Ana", "Joao Silva"]
+        assert task.department_names == ["TI"]
+        assert list(task.assigned_to.values_list("name", flat=True).order_by("name")) == ["Ana", "Joao Silva"]
+        assert list(task.subtasks.values_list("title", flat=True)) == ["Passo 1", "Passo 2"]
+        assert list(task.transitions.values_list("from_status", "to_status")) == [(None, 4)]
+        other = Task.objects.get(title="Outra")
+        assert other.assigned_to_names == ["Joao Silva"]
+        call_command("reconcile_task_stats", "--check", stdout=(out := io.StringIO()))
+        assert out.getvalue().startswith("0 chaves")
+
+    def test_batch_query_count(self, collaborator, department, project):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from tasks.importer import import_rows
+
+        def run(count):
+            rows = [
+                (i, {"title": f"T{i}", "project": project.pk, "assigned_to": "joao@test.com",
+                     "department": "TI", "subtasks": ["a", "b"]})
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                assert import_rows("tasks", rows)["created"] == count
+            return len(queries)
+
+        # Mesmas chaves do rollup nas duas cargas: consultas nao dependem do numero de linhas.
+        run(5)
+        assert run(50) == run(5)
+        assert Subtask.objects.count() == 120
+
+    def test_endpoint(self, admin_client, auth_client):
+        upload = io.BytesIO("title,priority\nVia API,HIGH\n".encode())
+        upload.name = "tarefas.csv"
+        assert auth_client.post(self.url, {"file": upload}, format="multipart").status_code == 403
+        upload.seek(0)
+        res = admin_client.post(self.url, {"file": upload, "kind": "tasks"}, format="multipart")
+        assert res.status_code == 200
+        assert res.data == {"created": 1, "failed": 0, "errors": []}
+        assert Task.objects.get(title="Via API").priority == "HIGH"
+
+    def test_endpoint_rejects_unknown_format(self, admin_client):
+        upload = io.BytesIO(b"x")
+        upload.name = "tarefas.xlsx"
+        res = admin_client.post(self.url, {"file": upload}, format="multipart")
+        assert res.status_code == 400
+
+
+# ========================
+# Serializacao rapida
+# ========================
+@pytest.mark.django_db
+class TestFastTaskSerialization:
+    """O caminho rapido deve gerar o mesmo JSON de `TaskSerializer`."""
+
+    def test_byte_identical_to_task_serializer(self, task, collaborator, department):
+        other = Collaborator.objects.create(name="Ana Lima", email="ana@test.com")
+        sub_department = Department.objects.create(
+            name="Suporte", department_type="sub", parent_department=department,
+        )
+        task.assigned_to.add(collaborator, other)
+        task.department.add(department, sub_department)
+        Subtask.objects.create(task=task, title="Segunda", order=2)
+        Subtask.objects.create(task=task, title="Primeira", order=1, is_done=True)
+        Task.objects.create(
+            title="Sem projeto", status="DONE", completed_at=timezone.now(),
+            start_date="2026-01-05", deadline="2026-02-01",
+        )
+
+        queryset = TaskViewSet.queryset.all()
+        expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+        assert JSONRenderer().render(serialize_task_rows(task_rows(queryset))) == expected
+
+    def test_api_list_matches_serializer(self, admin_client, task, collaborator):
+        task.assigned_to.add(collaborator)
+        res = admin_client.get("/api/v1/tasks/")
+        assert res.data["results"] == TaskSerializer(TaskViewSet.queryset.all(), many=True).data
+
+
+# ========================
+# Quadro por coluna
+# ========================
+@pytest.mark.django_db
+class TestTaskBoard:
+    """Testes de /api/v1/tasks/board/."""
+
+    url = "/api/v1/tasks/board/"
+
+    def test_columns_with_counts_and_heads(self, admin_client, project):
+        for i in range(5):
+            Task.objects.create(title=f"T{i}", project=project, status="TODO", order=5 - i)
+        Task.objects.create(title="Feita", project=project, status="DONE")
+        res = admin_client.get(self.url, {"page_size": 3})
+        assert res.status_code == 200
+        columns = {c["status"]: c for c in res.data["columns"]}
+        assert list(columns) == ["TODO", "IN_PROGRESS", "IN_REVIEW", "DONE"]
+        assert columns["TODO"]["count"] == 5
+        assert [t["title"] for t in columns["TODO"]["results"]] == ["T4", "T3", "T2"]
+        assert columns["IN_PROGRESS"] == {
+            "status": "IN_PROGRESS", "label": "Em Progresso", "count": 0, "next": None, "results": [],
+        }
+        assert columns["DONE"]["count"] == 1
+        assert columns["DONE"]["next"] is None
+
+    def test_next_continues_column(self, admin_client, project):
+        for i in range(5):
+            Task.objects.create(title=f"T{i}", project=project, status="TODO", order=i)
+        Task.objects.create(title="Outra", project=project, status="IN_PROGRESS", order=0)
+        res = admin_client.get(self.url, {"page_size": 2})
+        todo = res.data["columns"][0]
+        rest = admin_client.get(todo["next"])
+        assert [t["title"] for t in rest.data["results"]] == ["T2", "T3"]
+
+    def test_respects_filters(self, admin_client, project):
+        for i in range(2):
+            Task.objects.create(title=f"No projeto {i}", project=project)
+        Task.objects.create(title="Sem projeto")
+        res = admin_client.get(self.url, {"project": project.id, "page_size": 1})
+        todo = res.data["columns"][0]
+        assert todo["count"] == 2
+        rest = admin_client.get(todo["next"])
+        assert [t["project"] for t in rest.data["results"]] == [project.id]
+        assert rest.data["next"] is None
+
+    def test_single_task_query(self, admin_client, project, django_assert_num_queries):
+        for status in ("TODO", "IN_PROGRESS", "DONE"):
+            Task.objects.create(title=status, project=project, status=status)
+        # ETag + quadro + assigned_to + department + subtasks.
+        with django_assert_num_queries(5):
+            admin_client.get(self.url)
+
+
+# ========================
+# Busca textual (?q=)
+# ========================
+@pytest.mark.django_db
+class TestTaskSearch:
+    """Testes de /api/v1/tasks/?q= (FTS5 no SQLite de testes)."""
+
+    url = "/api/v1/tasks/"
+
+    def test_ranked_and_highlighted(self, admin_client, project):
+        Task.objects.create(title="Revisar relatorio", description="Ver numeros", project=project)
+        Task.objects.create(title="Impressora", description="Trocar toner do relatorio", project=project)
+        Task.objects.create(title="Outra coisa", project=project)
+        res = admin_client.get(self.url, {"q": "relatorio"})
+        assert res.status_code == 200
+        titles = [t["title"] for t in res.data["results"]]
+        assert titles == ["Revisar relatorio", "Impressora"]
+        first, second = res.data["results"]
+        assert first["search"]["title"] == "Revisar <mark>relatorio</mark>"
+        assert "<mark>relatorio</mark>" in second["search"]["description"]
+        assert first["search"]["rank"] > second["search"]["rank"]
+        assert res.data["next"] is None
+
+    def test_prefix_accents_and_solution(self, admin_client, project):
+        Task.objects.create(title="Configuração de rede", project=project)
+        Task.objects.create(title="Servidor", solution="Reiniciado o serviço", project=project)
+        assert [t["title"] for t in admin_client.get(self.url, {"q": "configura"}).data["results"]] == [
+            "Configuração de rede",
+        ]
+        assert [t["title"] for t in admin_client.get(self.url, {"q": "servico"}).data["results"]] == ["Servidor"]
+
+    def test_prefix_query_per_database(self):
+        assert prefix_query(["config", "rede"], "postgresql") == "config:* & rede:*"
+        assert prefix_query(["config", "rede"], "sqlite") == '"config"* "rede"*'
+
+    def test_index_follows_updates_and_deletes(self, admin_client, task):
+        task.title = "Novo titulo unico"
+        task.save()
+        assert len(admin_client.get(self.url, {"q": "unico"}).data["results"]) == 1
+        task.delete()
+        assert admin_client.get(self.url, {"q": "unico"}).data["results"] == []
+
+    def test_escapes_html_and_ignores_operators(self, admin_client, project):
+        Task.objects.create(title="<b>alerta</b>", project=project)
+        res = admin_client.get(self.url, {"q": 'alerta" (*'})
+        assert res.status_code == 200
+        assert res.data["results"][0]["search"]["title"] == "&lt;b&gt;<mark>alerta</mark>&lt;/b&gt;"
+
+    def test_combines_with_filters(self, admin_client, project):
+        Task.objects.create(title="Backup", project=project, status="DONE")
+        Task.objects.create(title="Backup", project=project, status="TODO")
+        res = admin_client.get(self.url, {"q": "backup", "status": "DONE"})
+        assert [t["status"] for t in res.data["results"]] == ["DONE"]
+
+    def test_admin_search(self, project):
+        from django.contrib import admin
+        Task.objects.create(title="Planilha de custos", project=project)
+        Task.objects.create(title="Outra", project=project)
+        queryset, _ = admin.site._registry[Task].get_search_results(None, Task.objects.all(), "planilha")
+        assert [t.title for t in queryset] == ["Planilha de custos"]
+
+
+# ========================
+# Delta-sync (?since=)
+# ========================
+@pytest.mark.django_db
+class TestTaskDeltaSync:
+    """Testes do modo `?since=<cursor>` de /api/v1/tasks/."""
+
+    url = "/api/v1/tasks/"
+
+    def test_empty_since_returns_full_board_and_cursor(self, admin_client, task):
+        res = admin_client.get(self.url, {"since": ""})
+        assert res.status_code == 200
+        assert [t["id"] for t in res.data["results"]] == [task.id]
+        assert res.data["deleted"] == []
+        assert res.data["cursor"]
+
+    def test_since_returns_only_changed(self, admin_client, task, project):
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        changed = Task.objects.create(title="Recente", project=project)
+        since = (timezone.now() - timedelta(minutes=10)).isoformat()
+        res = admin_client.get(self.url, {"since": since})
+        assert res.status_code == 200
+        assert [t["id"] for t in res.data["results"]] == [changed.id]
+
+    def test_since_reports_deleted_ids(self, admin_client, task):
+        since = (timezone.now() - timedelta(minutes=1)).isoformat()
+        task_id = task.id
+        admin_client.delete(f"{self.url}{task_id}/")
+        res = admin_client.get(self.url, {"since": since})
+        assert res.status_code == 200
+        assert res.data["deleted"] == [task_id]
+        assert TaskTombstone.objects.filter(task_id=task_id).exists()
+
+    def test_since_invalid_cursor(self, admin_client):
+        res = admin_client.get(self.url, {"since": "ontem"})
+        assert res.status_code == 400
+
+    def test_deleted_ids_follow_project_filter(self, admin_client, task, project):
+        since = (timezone.now() - timedelta(minutes=1)).isoformat()
+        other = Task.objects.create(title="Sem projeto")
+        other_id, task_id = other.id, task.id
+        other.delete()
+        task.delete()
+        res = admin_client.get(self.url, {"since": since, "project": project.id})
+        assert res.data["deleted"] == [task_id]
+        assert sorted(admin_client.get(self.url, {"since": since}).data["deleted"]) == sorted([task_id, other_id])
+
+    def test_cursor_older_than_retention_expires(self, admin_client, settings):
+        settings.TASK_TOMBSTONE_RETENTION_DAYS = 7
+        since = (timezone.now() - timedelta(days=8)).isoformat()
+        res = admin_client.get(self.url, {"since": since})
+        assert res.status_code == 410
+        assert res.data["detail"].code == "cursor_expired"
+
+    def test_prune_task_tombstones(self, settings):
+        settings.TASK_TOMBSTONE_RETENTION_DAYS = 7
+        old = TaskTombstone.objects.create(task_id=1)
+        TaskTombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=8))
+        recent = TaskTombstone.objects.create(task_id=2)
+        call_command("prune_task_tombstones", stdout=io.StringIO())
+        assert list(TaskTombstone.objects.values_list("pk", flat=True)) == [recent.pk]
+
+    def test_subtask_change_touches_task(self, task):
+        old = timezone.now() - timedelta(hours=1)
+        Task.objects.filter(pk=task.pk).update(updated_at=old)
+        Subtask.objects.create(task=task, title="Nova")
+        task.refresh_from_db()
+        assert task.updated_at > old
+
+
+# ========================
+# GET condicional (ETag)
+# ========================
+@pytest.mark.django_db
+class TestTaskConditionalGet:
+    """Testes de ETag / If-None-Match em /api/v1/tasks/."""
+
+    url = "/api/v1/tasks/"
+
+    def test_list_returns_etag(self, admin_client, task):
+        res = admin_client.get(self.url)
+        assert res.status_code == 200
+        assert res["ETag"].startswith('"')
+
+    def test_matching_etag_returns_304(self, admin_client, task, django_assert_max_num_queries):
+        etag = admin_client.get(self.url)["ETag"]
+        with django_assert_max_num_queries(1):
+            res = admin_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 304
+        assert res["ETag"] == etag
+
+    def test_change_invalidates_etag(self, admin_client, task):
+        etag = admin_client.get(self.url)["ETag"]
+        admin_client.patch(f"{self.url}{task.id}/", {"title": "Nova"})
+        res = admin_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200
+        assert res["ETag"] != etag
+
+    def test_related_rename_invalidates_etag(self, admin_client, task, project):
+        etag = admin_client.get(f"{self.url}{task.id}/")["ETag"]
+        project.name = "Projeto Renomeado"
+        project.save()
+        res = admin_client.get(f"{self.url}{task.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200
+        assert res.data["project_name"] == "Projeto Renomeado"
+
+    def test_etag_depends_on_query_string(self, admin_client, task):
+        etag = admin_client.get(self.url)["ETag"]
+        res = admin_client.get(self.url, {"status": "DONE"}, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200
+
+
+# ========================
+# Cache de respostas
+# ========================
+@pytest.mark.django_db
+class TestResponseCache:
+    """Testes do cache compartilhado de respostas (`app.response_cache`)."""
+
+    url = "/api/v1/tasks/"
+
+    def test_hit_skips_database(self, admin_client, task, django_assert_num_queries):
+        first = admin_client.get(self.url)
+        with django_assert_num_queries(0):
+            again = admin_client.get(self.url)
+        assert again.data == first.data
+        assert again["ETag"] == first["ETag"]
+        with django_assert_num_queries(0):
+            assert admin_client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    def test_changes_invalidate(self, admin_client, task, collaborator):
+        admin_client.get(self.url)
+        task.assigned_to.add(collaborator)
+        assert admin_client.get(self.url).data["results"][0]["assigned_to_names"] == [collaborator.name]
+        Subtask.objects.create(task=task, title="Nova")
+        assert admin_client.get(self.url).data["results"][0]["subtasks"][0]["title"] == "Nova"
+        collaborator.name = "Outro Nome"
+        collaborator.save()
+        assert admin_client.get(self.url).data["results"][0]["assigned_to_names"] == ["Outro Nome"]
+
+    def test_opt_out(self, admin_client, task, monkeypatch, django_assert_max_num_queries):
+        monkeypatch.setattr(TaskViewSet, "cache_timeout", 0)
+        admin_client.get(self.url)
+        res = admin_client.get(self.url)
+        assert res.status_code == 200
+        with django_assert_max_num_queries(1):
+            assert admin_client.get(self.url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+
+    def test_stats_command(self, admin_client, task):
+        admin_client.get(self.url)
+        admin_client.get(self.url)
+        out = io.StringIO()
+        call_command("cache_stats", "--reset", stdout=out)
+        assert "hits: 1" in out.getvalue()
+        assert "misses: 1" in out.getvalue()
+        assert "evictions: -" in out.getvalue()
+
+
+# ========================
+# Metricas por rota
+# ========================
+@pytest.mark.django_db
+class TestRequestMetrics:
+    """Testes de `app.middleware.RequestMetricsMiddleware` e /api/internal/metrics/."""
+
+    url = "/api/internal/metrics/"
+
+    def test_server_timing_and_summary(self, admin_client, task, settings):
+        settings.REQUEST_METRICS_FLUSH_SECONDS = 0
+        admin_client.delete(self.url)
+        res = admin_client.get("/api/v1/tasks/")
+        timing = res["Server-Timing"]
+        assert timing.startswith("db;dur=") and "render;dur=" in timing and "total;dur=" in timing
+        assert "serialize;dur=" in timing
+        admin_client.get("/api/v1/tasks/")
+
+        routes = admin_client.get(self.url).data["routes"]
+        item = routes["GET task-list"]
+        assert item["requests"] == 2
+        assert sum(item["queries"]["buckets"].values()) == 2
+        assert sum(item["serialize_ms"]["buckets"].values()) == 2
+        assert item["bytes"]["mean"] == len(res.content)
+        assert item["budget"] == settings.REQUEST_BUDGETS["GET task-list"]
+
+    def test_serialize_time_excludes_queries(self, monkeypatch):
+        from app import metrics
+        from app.middleware import QueryTimer
+        clock = metrics.SerializeClock(QueryTimer())
+        token = metrics.serialize_clock.set(clock)
+        ticks = iter([0.0, 10.0])
+        monkeypatch.setattr(metrics.time, "perf_counter", lambda: next(ticks))
+        try:
+            with metrics.serializing():
+                clock.query_timer.seconds += 1  # consulta feita durante a serializacao
+                with metrics.serializing():  # aninhado: nao mede de novo
+                    pass
+        finally:
+            metrics.serialize_clock.reset(token)
+        assert clock.seconds == 9
+
+    def test_budget_exceeded(self, admin_client, task, settings, caplog):
+        from app.metrics import BudgetExceeded
+        settings.REQUEST_BUDGETS = {"GET task-list": {"queries": 1}}
+        with pytest.raises(BudgetExceeded):
+            admin_client.get("/api/v1/tasks/")
+        settings.REQUEST_BUDGET_ACTION = "log"
+        assert admin_client.get("/api/v1/tasks/", {"page_size": 5}).status_code == 200
+        assert "Orcamento excedido em GET task-list" in caplog.text
+
+    def test_budget_routes_exist(self, settings):
+        from django.urls import get_resolver
+        names = get_resolver().reverse_dict
+        missing = [route for route in settings.REQUEST_BUDGETS if route != "*" and route.split(" ", 1)[-1] not in names]
+        assert missing == []
+
+    def test_cache_keys_without_spaces(self, admin_client, task, settings):
+        import warnings
+        from django.core.cache import CacheKeyWarning
+        settings.REQUEST_METRICS_FLUSH_SECONDS = 0
+        admin_client.delete(self.url)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            admin_client.get("/api/v1/tasks/")
+            admin_client.get("/api/v1/projects/")
+            routes = admin_client.get(self.url).data["routes"]
+        assert {"GET task-list", "GET projects-list"} <= routes.keys()
+        assert routes["GET projects-list"]["budget"] == settings.REQUEST_BUDGETS["GET projects-list"]
+        admin_client.delete(self.url)
+        assert "GET task-list" not in admin_client.get(self.url).data["routes"]
+
+    def test_admin_only(self, auth_client):
+        assert auth_client.get(self.url).status_code == 403
+
+
+# ========================
+# Leitura assincrona (ASGI)
+# ========================
+@pytest.fixture
+def jwt_client(admin_user):
+    """APIClient com `Authorization: Bearer` (as views assincronas nao usam o DRF)."""
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin_user)}")
+    return client
+
+
+@pytest.mark.django_db
+class TestAsyncTaskRead:
+    """Testes de /api/v1/async/ (tasks.async_views)."""
+
+    url = "/api/v1/async/tasks/"
+
+    def test_list_matches_drf(self, jwt_client, admin_client, task, collaborator, department):
+        task.assigned_to.add(collaborator)
+        task.department.add(department)
+        Subtask.objects.create(task=task, title="Passo")
+        Task.objects.create(title="Outra", project=task.project)
+        res = jwt_client.get(self.url, {"page_size": 1})
+        drf = admin_client.get("/api/v1/tasks/", {"page_size": 1})
+        assert res.status_code == 200
+        assert res.json()["results"] == drf.json()["results"]
+        second = jwt_client.get(res.json()["next"])
+        assert second.json()["results"] == admin_client.get(drf.json()["next"]).json()["results"]
+        assert second.json()["next"] is None
+
+    def test_list_filters_and_fields(self, jwt_client, task, project):
+        Task.objects.create(title="Sem projeto")
+        res = jwt_client.get(self.url, {"project": project.id, "fields": "id,title"})
+        assert res.json()["results"] == [{"id": task.id, "title": task.title}]
+
+    def test_unsupported_params_rejected(self, jwt_client, task):
+        res = jwt_client.get(self.url, {"q": "relatorio", "expand": "project"})
+        assert res.status_code == 400
+        assert set(res.json()) == {"q", "expand"}
+        assert jwt_client.get(f"{self.url}{task.id}/", {"expand": "project"}).status_code == 400
+
+    def test_delta(self, jwt_client, task):
+        body = jwt_client.get(self.url, {"since": ""}).json()
+        assert [item["id"] for item in body["results"]] == [task.id]
+        task_id = task.id
+        task.delete()
+        delta = jwt_client.get(self.url, {"since": body["cursor"]}).json()
+        assert delta["results"] == []
+        assert delta["deleted"] == [task_id]
+        assert jwt_client.get(self.url, {"since": "ontem"}).status_code == 400
+
+    def test_detail_and_etag(self, jwt_client, admin_client, task):
+        url = f"{self.url}{task.id}/"
+        res = jwt_client.get(url)
+        assert res.json() == admin_client.get(f"/api/v1/tasks/{task.id}/").json()
+        assert jwt_client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+        task.title = "Renomeada"
+        task.save()
+        assert jwt_client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).json()["title"] == "Renomeada"
+        assert jwt_client.get(f"{self.url}999999/").status_code == 404
+
+    def test_requires_jwt(self, anon_client, admin_client, task):
+        assert anon_client.get(self.url).status_code == 401
+        assert anon_client.get(self.url, HTTP_AUTHORIZATION="Bearer invalido").status_code == 401
+        assert admin_client.post(self.url).status_code == 405
+
+    def test_public_board_matches_drf(self, anon_client, task):
+        res = anon_client.get("/api/v1/async/tasks-public/")
+        assert res.content == anon_client.get("/api/v1/tasks-public/").content
+        assert anon_client.get("/api/v1/async/tasks-public/", HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+
+    def test_list_without_n_plus_one(self, jwt_client, grow_tasks, assert_constant_queries):
+        assert_constant_queries(jwt_client, self.url, grow_tasks)
+        assert_constant_queries(jwt_client, self.url, grow_tasks, {"since": ""})
+
+    def test_bench_pollers(self, tmp_path):
+        """Gerador de carga contra um servidor HTTP falso (keep-alive, ETag, chunked)."""
+        import asyncio
+        import threading
+        seen = []
+
+        async def handle(reader, writer):
+            try:
+                while request := await reader.readuntil(b"\r\n\r\n"):
+                    seen.append(request.split(b"\r\n")[0].decode())
+                    if b"If-None-Match" in request:
+                        writer.write(b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\n\r\n')
+                    else:
+                        body = b'{"cursor":"c1","results":[]}'
+                        writer.write(
+                            b'HTTP/1.1 200 OK\r\nETag: "v1"\r\nTransfer-Encoding: chunked\r\n\r\n'
+                            + b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body)
+                        )
+                    await writer.drain()
+            except asyncio.IncompleteReadError:
+                writer.close()
+
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(handle, "127.0.0.1", 0))
+        port = server.sockets[0].getsockname()[1]
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        try:
+            output = tmp_path / "pollers.json"
+            call_command(
+                "bench_pollers", "--token", "x", "--pollers", "3", "--duration", "0.5", "--interval", "0.05",
+                "--target", f"stub=http://127.0.0.1:{port}/api/v1/async/tasks/?since=", "--output", str(output),
+                stdout=io.StringIO(),
+            )
+        finally:
+            # Deixa os handlers verem o fim das conexoes antes de parar o loop.
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), loop).result()
+            loop.call_soon_threadsafe(server.close)
+            loop.call_soon_threadsafe(loop.stop)
+        result = json.loads(output.read_text())["targets"]["stub"]
+        assert result["errors"] == 0
+        assert result["requests"] > 3
+        assert result["not_modified"] > 0
+        assert "GET /api/v1/async/tasks/?since=c1 HTTP/1.1" in seen
+
+    def test_served_by_asgi(self, admin_user, task):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import AccessToken
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(admin_user)}"}
+        res = async_to_sync(AsyncClient().get)(self.url, headers=headers)
+        assert res.status_code == 200
+        assert res.json()["results"][0]["id"] == task.id
+
+
+# ========================
+# Carga sintetica e benchmark
+# ========================
+@pytest.mark.django_db
+class TestSeedAndBenchmark:
+    """Testes de `tasks.seed`, do comando `seed_board` e de `bench_api`."""
+
+    def test_seed_board(self):
+        out = io.StringIO()
+        call_command("seed_board", "--tasks", "40", "--departments", "2", "--collaborators", "8", stdout=out)
+        assert "40 tasks" in out.getvalue()
+        assert Task.objects.count() == 40
+        assert Department.objects.filter(department_type="sub").exists()
+        task = Task.objects.exclude(assigned_to=None).first()
+        assert task.assigned_to_names == sorted(task.assigned_to.values_list("name", flat=True))
+        assert task.department_names == sorted(task.department.values_list("name", flat=True))
+        assert task.transitions.count() == 1
+        call_command("reconcile_task_stats", "--check", stdout=(out := io.StringIO()))
+        assert out.getvalue().startswith("0 chaves")
+
+    def test_seed_is_deterministic(self):
+        from tasks.seed import seed_board
+        seed_board(tasks=10, seed=7, prefix="A")
+        first = list(Task.objects.order_by("id").values_list("title", "status", "priority"))
+        Task.objects.all().delete()
+        seed_board(tasks=10, seed=7, prefix="A")
+        assert list(Task.objects.order_by("id").values_list("title", "status", "priority")) == first
+
+    def test_bench_api_writes_results_and_rolls_back(self, tmp_path):
+        output = tmp_path / "bench.json"
+        call_command(
+            "bench_api", "--seed-tasks", "30", "--requests", "2", "--warmup", "0",
+            "--routes", "task-list", "department-detail", "task-stats", "--output", str(output), stdout=io.StringIO(),
+        )
+        result = json.loads(output.read_text())
+        assert result["tasks"] == 30
+        assert {
+            "GET task-list", "GET task-list?since", "GET department-detail", "GET task-stats?project",
+        } <= set(result["routes"])
+        for item in result["routes"].values():
+            assert item["status"] == 200
+            assert item["p50_ms"] <= item["p99_ms"]
+            assert item["bytes"] > 0
+        assert not Task.objects.exists()
+
+    def test_bench_api_flags_regressions(self, tmp_path):
+        from django.core.management.base import CommandError
+        output = tmp_path / "bench.json"
+        args = ["bench_api", "--seed-tasks", "10", "--requests", "1", "--routes", "task-board"]
+        call_command(*args, "--output", str(output), stdout=io.StringIO())
+        baseline = json.loads(output.read_text())
+        call_command(*args, "--compare", str(output), stdout=io.StringIO())
+
+        baseline["routes"]["GET task-board"]["queries"] -= 1
+        output.write_text(json.dumps(baseline))
+        err = io.StringIO()
+        with pytest.raises(CommandError, match="1 regressoes"):
+            call_command(*args, "--compare", str(output), stdout=io.StringIO(), stderr=err)
+        assert "GET task-board: queries" in err.getvalue()
+
+
+
+# ========================
+# Conexoes com o banco sob carga
+# ========================
+@pytest.mark.django_db
+class TestConnectionLoad:
+    """Testes do comando `bench_connections` e do pool do psycopg 3."""
+
+    def test_bench_connections(self, tmp_path):
+        output = tmp_path / "conexoes.json"
+        call_command(
+            "bench_connections", "--clients", "4", "--duration", "0.2", "--hold", "0.01",
+            "--interval", "0.05", "--output", str(output), stdout=io.StringIO(),
+        )
+        result = json.loads(output.read_text())
+        assert result["requests"] > 0
+        assert result["errors"] == 0
+        assert result["p50_ms"] <= result["p99_ms"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_pool_keeps_connection_count_stable(self, monkeypatch):
+        from django.db import connection
+        if connection.vendor != "postgresql":
+            pytest.skip("o pool do psycopg 3 exige PostgreSQL")
+        pytest.importorskip("psycopg_pool")
+        from tasks.management.commands.bench_connections import run_load
+        connection.close()
+        monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 0)
+        monkeypatch.setitem(
+            connection.settings_dict, "OPTIONS",
+            {**connection.settings_dict["OPTIONS"], "pool": {"min_size": 1, "max_size": 4, "timeout": 30}},
+        )
+        try:
+            result = run_load(clients=40, duration=1, hold=0.02, interval=0.05)
+        finally:
+            connection.close_pool()
+        conns = result["connections"]
+        assert result["errors"] == 0
+        assert result["requests"] > 40
+        assert conns["max"] - conns["baseline"] <= 4
+
+
+# ========================
+# Leituras em replicas
+# ========================
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestReadReplicas:
+    """Testes de `app.db_routers` com o banco `replica` separado (ver conftest)."""
+
+    @pytest.fixture
+    def replica(self, settings):
+        from app import db_routers
+        settings.REPLICA_DATABASES = ["replica"]
+        settings.REPLICA_MAX_LAG_SECONDS = 0
+        db_routers._lag_checks.clear()
+        yield
+        db_routers._lag_checks.clear()
+
+    def names(self, res):
+        return {item["name"] for item in res.data["results"]}
+
+    @pytest.mark.parametrize("url, public", [
+        ("/api/v1/tasks/", False),
+        ("/api/v1/tasks/board/", False),
+        ("/api/v1/tasks-public/", True),
+        ("/api/v1/projects/", False),
+        ("/api/v1/collaborators/", False),
+        ("/api/v1/departments/", False),
+    ])
+    def test_safe_requests_read_from_replica(self, replica, admin_client, anon_client, url, public):
+        from django.db import connections
+        from django.test.utils import CaptureQueriesContext
+        client = anon_client if public else admin_client
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            res = client.get(url)
+        assert res.status_code == 200
+        assert len(replica_queries) > 0
+
+    def test_writes_go_to_primary_and_pin_the_user(self, replica, admin_client):
+        from projectsmanager.models import Project
+        Project.objects.using("replica").create(name="So na replica")
+        assert self.names(admin_client.get("/api/v1/projects/")) == {"So na replica"}
+
+        res = admin_client.post("/api/v1/projects/", {"name": "Nova"}, format="json")
+        assert res.status_code == 201
+        assert Project.objects.using("default").filter(name="Nova").exists()
+        assert self.names(admin_client.get("/api/v1/projects/")) == {"Nova"}
+
+    def test_recent_change_keeps_reads_on_primary(self, replica, settings, admin_client):
+        from app.response_cache import CHANGED_AT_KEY
+        from projectsmanager.models import Project
+        settings.REPLICA_MAX_LAG_SECONDS = 30
+        Project.objects.create(name="No primario")
+        assert self.names(admin_client.get("/api/v1/projects/")) == {"No primario"}
+        cache.delete(CHANGED_AT_KEY)
+        assert self.names(admin_client.get("/api/v1/projects/", {"page": 1})) == set()
+
+    def test_lagging_replica_is_skipped(self, replica, settings, admin_client, monkeypatch):
+        from app.response_cache import CHANGED_AT_KEY
+        from projectsmanager.models import Project
+        monkeypatch.setattr("app.db_routers.replica_lag", lambda alias: 5.0)
+        settings.REPLICA_MAX_LAG_SECONDS = 2
+        Project.objects.create(name="No primario")
+        cache.delete(CHANGED_AT_KEY)
+        assert self.names(admin_client.get("/api/v1/projects/")) == {"No primario"}
+
+    def test_without_replicas_reads_stay_on_primary(self, admin_client, project):
+        assert self.names(admin_client.get("/api/v1/projects/")) == {project.name}
+
 
 # ========================
 # Subtask CRUD
@@ -120,8 +1608,51 @@ class TestPublicTaskAPI:
     def test_list_public(self, anon_client, task):
         res = anon_client.get(self.url)
         assert res.status_code == 200
-        assert res.data["count"] >= 1
+        assert res.json()["count"] >= 1
+
+    def test_list_without_n_plus_one(self, anon_client, grow_tasks, assert_constant_queries):
+        res = assert_constant_queries(anon_client, self.url, grow_tasks)
+        assert res.json()["count"] == 12
 
     def test_public_readonly(self, anon_client, task):
         res = anon_client.post(self.url, {"title": "Hack"})
         assert res.status_code in (403, 405)
+
+    def test_snapshot_served_from_cache(self, anon_client, task, django_assert_num_queries):
+        first = anon_client.get(self.url)
+        with django_assert_num_queries(0):
+            second = anon_client.get(self.url)
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+
+    def test_snapshot_matches_serializer(self, anon_client, task, collaborator):
+        task.assigned_to.add(collaborator)
+        body = anon_client.get(self.url).json()
+        assert body["results"][0]["assigned_to_names"] == [collaborator.name]
+        assert body["results"][0]["project_name"] == task.project.name
+        assert "description" not in body["results"][0]
+
+    def test_snapshot_gzip_and_etag(self, anon_client, task):
+        res = anon_client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        assert res["Content-Encoding"] == "gzip"
+        assert gzip.decompress(res.content)
+        cached = anon_client.get(self.url, HTTP_IF_NONE_MATCH=res["ETag"])
+        assert cached.status_code == 304
+
+    def test_snapshot_invalidated_on_commit(self, anon_client, task, django_capture_on_commit_callbacks):
+        anon_client.get(self.url)
+        with django_capture_on_commit_callbacks(execute=True):
+            task.title = "Renomeada"
+            task.save()
+        assert anon_client.get(self.url).json()["results"][0]["title"] == "Renomeada"
+
+    def test_snapshot_rebuilt_during_commit_not_served(self, anon_client, task, django_capture_on_commit_callbacks):
+        # Reconstrucao concorrente: leu a versao antes do commit e grava depois dele.
+        stale_key = public_board_key()
+        with django_capture_on_commit_callbacks(execute=True):
+            task.title = "Renomeada"
+            task.save()
+        cache.set(stale_key, build_public_board() | {"etag": '"antigo"'})
+        res = anon_client.get(self.url)
+        assert res["ETag"] != '"antigo"'
+        assert res.json()["results"][0]["title"] == "Renomeada"
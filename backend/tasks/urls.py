@@ -1,6 +1,8 @@
 """Roteamento de URLs para o app tasks."""
 
+from django.urls import path
 from rest_framework.routers import DefaultRouter
+from .async_views import public_task_list, task_detail, task_list
 from .views import PublicTaskViewSet, SubtaskViewSet, TaskViewSet
 
 router = DefaultRouter()
@@ -8,4 +10,11 @@ router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'tasks-public', PublicTaskViewSet, basename='task-public')
 router.register(r'subtasks', SubtaskViewSet, basename='subtask')
 
-urlpatterns = router.urls
+# Leitura assincrona para polling, servida pelo ASGI (ver `tasks.async_views`).
+async_urlpatterns = [
+    path('async/tasks/', task_list, name='task-async-list'),
+    path('async/tasks/<int:pk>/', task_detail, name='task-async-detail'),
+    path('async/tasks-public/', public_task_list, name='task-public-async-list'),
+]
+
+urlpatterns = router.urls + async_urlpatterns
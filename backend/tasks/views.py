@@ -1,45 +1,488 @@
 """Views do app tasks (kanban)."""
 
-from rest_framework import viewsets
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from .models import Subtask, Task
-from .serializers import PublicTaskSerializer, SubtaskSerializer, TaskSerializer
+import io
+from datetime import timedelta
 
-class TaskViewSet(viewsets.ModelViewSet):
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.response import Response
+from app.conditional import ConditionalGetMixin
+from app.db_routers import ReplicaReadMixin
+from app.sparse_fields import SparseQuerysetMixin, sparse_params
+from collaborators.models import Collaborator
+from departments.models import Department
+from projectsmanager.models import Project
+from . import analytics
+from .batch import apply_operations
+from .export import CSVRenderer, JSONLRenderer, csv_stream, jsonl_stream
+from .fast_serializers import serialize_task_rows, task_columns, task_rows
+from .importer import IMPORTERS, guess_format, import_rows, read_rows
+from .models import Subtask, Task, TaskStat, TaskTombstone, TaskTransition
+from .ordering import SUBTASK_COLUMN_ORDERING, TASK_COLUMN_ORDERING, place_after
+from .pagination import TaskKeysetPagination, encode_cursor
+from .public_board import get_public_board, snapshot_response
+from .search import SEARCH_COLUMNS, render_highlight, search_tasks
+from .serializers import (
+    PublicTaskSerializer,
+    SubtaskMoveSerializer,
+    SubtaskReorderSerializer,
+    SubtaskSerializer,
+    TaskBatchOperationSerializer,
+    TaskMoveSerializer,
+    TaskReorderSerializer,
+    TaskSerializer,
+)
+from .signals import bulk_updated
+from .stats import SCOPE_PARAMS, live_groups, rollup_groups, scope_breakdown, summarize, track_task_stats
+
+# Margem subtraida do cursor devolvido no delta-sync: cobre transacoes que
+# gravaram `updated_at` antes do cursor mas so comitaram depois da consulta.
+DELTA_CURSOR_SAFETY_MARGIN = timedelta(seconds=2)
+
+# Janela padrao e maxima de `/tasks/analytics/`.
+ANALYTICS_DEFAULT_DAYS = 90
+ANALYTICS_MAX_DAYS = 731
+
+# Limite de itens por chamada de `bulk-reorder`.
+BULK_REORDER_MAX_ITEMS = 500
+
+# Limites de `POST /tasks/batch/`: operacoes por chamada e ids somados entre elas.
+BATCH_MAX_OPERATIONS = 50
+BATCH_MAX_IDS = 500
+
+# Parametros de filtro da listagem -> lookup em `Task`.
+TASK_FILTERS = {
+    'project': 'project_id',
+    'status': 'status',
+    'assigned_to': 'assigned_to__id',
+    'department': 'department__id',
+    'responsavel': 'responsavel_id',
+}
+
+
+def validate_reorder_items(serializer_class, data):
+    """Valida a lista de `bulk-reorder` e retorna os itens indexados por id."""
+    serializer = serializer_class(data=data, many=True, allow_empty=False, max_length=BULK_REORDER_MAX_ITEMS)
+    serializer.is_valid(raise_exception=True)
+    items = {item['id']: item for item in serializer.validated_data}
+    if len(items) != len(serializer.validated_data):
+        raise ValidationError({'id': 'Ids repetidos na lista.'})
+    return items
+
+
+def lock_for_reorder(queryset, items):
+    """Carrega (com `SELECT ... FOR UPDATE`) os objetos da lista ou falha se algum nao existir."""
+    objects = queryset.select_for_update().in_bulk(list(items))
+    missing = sorted(set(items) - set(objects))
+    if missing:
+        raise ValidationError({'id': f'Ids inexistentes: {missing}.'})
+    return objects
+
+
+def column_heads(queryset, limit, fields=None):
+    """Primeiros `limit` cards de cada coluna e o total da coluna, numa unica consulta.
+
+    `ROW_NUMBER()` e `COUNT(*)` particionados por `status` sao calculados sobre
+    o queryset filtrado; o corte por posicao acontece no proprio banco.
+    """
+    column = [F('status')]
+    columns = task_columns(fields)
+    if 'status' not in columns:
+        columns += ('status',)
+    return (
+        queryset.select_related(None).prefetch_related(None)
+        .annotate(
+            position=Window(RowNumber(), partition_by=column, order_by=[F('order').asc(), F('id').desc()]),
+            column_total=Window(Count('id'), partition_by=column),
+        )
+        .filter(position__lte=limit)
+        .order_by('status', 'position')
+        .values(*columns, 'column_total')
+    )
+
+
+def reference_sibling(siblings, after_id):
+    """Resolve o card de referencia do `move`, que precisa estar na coluna de destino."""
+    if after_id is None:
+        return None
+    after = siblings.filter(pk=after_id).first()
+    if after is None:
+        raise ValidationError({'after': 'O card de referencia nao esta na coluna de destino.'})
+    return after
+
+
+class CursorExpired(APIException):
+    """Cursor do delta-sync mais antigo que a retencao dos registros de exclusao."""
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Cursor expirado; sincronize de novo com `?since=` vazio.'
+    default_code = 'cursor_expired'
+
+
+def parse_since(raw_since):
+    """Cursor `?since=` do delta-sync; None quando vazio (quadro inteiro).
+
+    Cursores anteriores a `TASK_TOMBSTONE_RETENTION_DAYS` levantam
+    `CursorExpired` (410): as exclusoes daquele periodo ja foram apagadas.
+    """
+    if not raw_since:
+        return None
+    since = parse_datetime(raw_since)
+    if since is None:
+        raise ValidationError({'since': 'Cursor invalido; use o valor de `cursor` da resposta anterior.'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    if since < timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS):
+        raise CursorExpired()
+    return since
+
+
+def deleted_task_ids(since, params):
+    """Ids excluidos desde `since`, do projeto de `?project=` quando houver.
+
+    Os demais filtros nao se aplicam (a tarefa nao existe mais); ids que o
+    cliente nao conhece sao simplesmente ignorados por ele.
+    """
+    queryset = TaskTombstone.objects.filter(deleted_at__gte=since)
+    if params.get('project'):
+        queryset = queryset.filter(project_id=params['project'])
+    return queryset.values_list('task_id', flat=True).distinct()
+
+
+def filter_tasks(queryset, params):
+    """Aplica os filtros de `TASK_FILTERS` presentes (e nao vazios) em `params`."""
+    for param, lookup in TASK_FILTERS.items():
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{lookup: value})
+    return queryset
+
+
+class TaskViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD de tarefas (cards do kanban) com otimizacoes de queryset e filtros."""
     queryset = Task.objects.select_related('project', 'responsavel').prefetch_related('assigned_to', 'department', 'subtasks').order_by('order', '-id')
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskKeysetPagination
+    etag_models = (Task, Subtask, Project, Collaborator, Department)
+    select_related_fields = {'project': ('project_name',), 'responsavel': ('responsavel_name',)}
+    prefetch_related_fields = {'assigned_to': ('assigned_to',), 'department': ('department',), 'subtasks': ('subtasks',)}
 
     def get_queryset(self):
         """Aplica filtros opcionais para reduzir payload e consultas no cliente."""
-        queryset = super().get_queryset()
+        return filter_tasks(super().get_queryset(), self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        """Lista paginada; `?since=<cursor>` traz so as mudancas e `?q=` faz busca textual."""
+        if 'since' in request.query_params:
+            return self.delta_list(request.query_params['since'])
+        if request.query_params.get('q', '').strip():
+            return self.conditional_response(self.search_list, request)
+        return self.conditional_response(self.list_page, request, *args, **kwargs)
+
+    def list_page(self, request, *args, **kwargs):
+        """Pagina de tarefas pelo caminho rapido, com o mesmo JSON de `TaskSerializer`.
+
+        `?expand=` (objetos aninhados) usa o serializer do DRF.
+        """
+        if sparse_params(request)[2]:
+            return mixins.ListModelMixin.list(self, request, *args, **kwargs)
+        fields = self.get_sparse_fields()
+        rows = task_rows(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_task_rows(page, fields))
+        return Response(serialize_task_rows(rows, fields))
 
-        project_id = self.request.query_params.get('project', None)
-        status = self.request.query_params.get('status', None)
-        assigned_to = self.request.query_params.get('assigned_to', None)
-        department = self.request.query_params.get('department', None)
-        responsavel = self.request.query_params.get('responsavel', None)
+    def search_list(self, request):
+        """Ate `?page_size=` tarefas que casam com `?q=`, por relevancia.
 
-        if project_id:
-            queryset = queryset.filter(project_id=project_id)
+        Cada item traz `search` com `rank` e os trechos destacados com `<mark>`.
+        Sem `next`: refinar a busca e mais util do que paginar por relevancia.
+        """
+        fields = self.get_sparse_fields()
+        queryset = search_tasks(self.filter_queryset(self.get_queryset()), request.query_params['q'])
+        rows = list(
+            queryset.select_related(None).prefetch_related(None)
+            .values(*task_columns(fields), *SEARCH_COLUMNS)[:self.paginator.get_page_size(request)]
+        )
+        results = serialize_task_rows(rows, fields)
+        for item, row in zip(results, rows):
+            item['search'] = {
+                'rank': row['search_rank'],
+                'title': render_highlight(row['search_title']),
+                'description': render_highlight(row['search_description']),
+            }
+        return Response({'next': None, 'results': results})
+
+    def delta_list(self, raw_since):
+        """Delta-sync: tarefas criadas/alteradas e ids excluidos desde `raw_since`.
+
+        `?since=` vazio devolve o quadro inteiro; o `cursor` da resposta deve ser
+        enviado na proxima chamada.
+        """
+        since = parse_since(raw_since)
+        cursor = timezone.now() - DELTA_CURSOR_SAFETY_MARGIN
+        fields = self.get_sparse_fields()
+        queryset = task_rows(self.filter_queryset(self.get_queryset()), fields)
+        deleted = []
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+            deleted = list(deleted_task_ids(since, self.request.query_params))
+
+        return Response({
+            'cursor': cursor.isoformat(),
+            'results': serialize_task_rows(queryset, fields),
+            'deleted': deleted,
+        })
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """Quadro agrupado: por coluna, o total e os primeiros `?page_size=` cards."""
+        return self.conditional_response(self.board_columns, request)
+
+    def board_columns(self, request):
+        """Monta as colunas de `board`; `next` continua a coluna na listagem paginada."""
+        page_size = self.paginator.get_page_size(request)
+        fields = self.get_sparse_fields()
+        rows = list(column_heads(self.filter_queryset(self.get_queryset()), page_size, fields))
+        cards = dict(zip((row['id'] for row in rows), serialize_task_rows(rows, fields)))
+
+        columns = {value: {'rows': [], 'total': 0} for value, _ in Task.STATUS_CHOICES}
+        for row in rows:
+            columns[row['status']]['rows'].append(row)
+            columns[row['status']]['total'] = row['column_total']
+
+        params = request.query_params.copy()
+        params[self.paginator.page_size_query_param] = page_size
+        list_url = self.reverse_action('list')
+        data = []
+        for value, label in Task.STATUS_CHOICES:
+            column_rows = columns[value]['rows']
+            next_url = None
+            if columns[value]['total'] > len(column_rows):
+                last = column_rows[-1]
+                params['status'] = value
+                params[self.paginator.cursor_query_param] = encode_cursor(last['order'], last['id'])
+                next_url = f'{list_url}?{params.urlencode()}'
+            data.append({
+                'status': value,
+                'label': label,
+                'count': columns[value]['total'],
+                'next': next_url,
+                'results': [cards[row['id']] for row in column_rows],
+            })
+        return Response({'columns': data})
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Contagens por status e prioridade, vencidas e, sem recorte, por projeto/pessoa/setor.
+
+        Com no maximo um recorte (`project`, `responsavel`, `assigned_to` ou
+        `department`), le o rollup `TaskStat` em O(grupos). Recortes combinados
+        nao cabem no rollup e sao contados direto nas tarefas.
+        """
+        params = request.query_params
+        status = params.get('status') or None
+        if status and status not in dict(Task.STATUS_CHOICES):
+            raise ValidationError({'status': 'Status invalido.'})
+        scopes = {name: params[name] for name in SCOPE_PARAMS if params.get(name)}
+        today = timezone.localdate()
+
+        if len(scopes) > 1:
+            queryset = self.get_queryset().select_related(None).prefetch_related(None)
+            return Response(summarize(live_groups(queryset, today)))
+
+        scope, scope_id = next(iter(scopes.items()), ('all', 0))
+        try:
+            scope_id = int(scope_id)
+        except ValueError:
+            raise ValidationError({scope: 'Informe um id numerico.'})
+        queryset = TaskStat.objects.filter(scope=scope)
+        if scope != 'all':
+            # O recorte `all` e repartido em varias linhas (`ALL_SHARDS`): soma todas.
+            queryset = queryset.filter(scope_id=scope_id)
         if status:
             queryset = queryset.filter(status=status)
-        if assigned_to:
-            queryset = queryset.filter(assigned_to__id=assigned_to)
-        if department:
-            queryset = queryset.filter(department__id=department)
-        if responsavel:
-            queryset = queryset.filter(responsavel_id=responsavel)
+        data = summarize(rollup_groups(queryset, today))
+        if scope == 'all':
+            for name in SCOPE_PARAMS:
+                data[f'by_{name}'] = scope_breakdown(name, status, today)
+        return Response(data)
+
+    @action(detail=False, methods=['get'], renderer_classes=[CSVRenderer, JSONLRenderer])
+    def export(self, request):
+        """Exporta as tarefas filtradas em streaming: `?format=csv` (padrao) ou `?format=jsonl`."""
+        queryset = self.filter_queryset(self.get_queryset())
+        if request.accepted_renderer.format == 'jsonl':
+            stream, extension = jsonl_stream(queryset), 'jsonl'
+        else:
+            stream, extension = csv_stream(queryset), 'csv'
+        response = StreamingHttpResponse(stream, content_type=request.accepted_renderer.media_type + '; charset=utf-8')
+        filename = f"tarefas-{timezone.localdate():%Y%m%d}.{extension}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(
+        detail=False, methods=['post'], url_path='import',
+        permission_classes=[IsAdminUser], parser_classes=[MultiPartParser],
+    )
+    def import_file(self, request):
+        """Importa `file` (CSV, JSON Lines ou JSON) com `kind=tasks|collaborators|departments`.
+
+        Retorna o relatorio de `tasks.importer.import_rows`. Para migracoes
+        grandes, prefira o comando `import_board` (sem limite de tempo do worker).
+        """
+        kind = request.data.get('kind', 'tasks')
+        if kind not in IMPORTERS:
+            raise ValidationError({'kind': f"Use {', '.join(IMPORTERS)}."})
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'Envie o arquivo.'})
+        file_format = guess_format(upload.name)
+        if file_format is None:
+            raise ValidationError({'file': 'Use um arquivo .csv, .jsonl ou .json.'})
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            report = import_rows(kind, read_rows(stream, file_format))
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ValidationError({'file': str(exc)})
+        return Response(report)
 
-        return queryset
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """Lead/cycle time, vazao semanal, fluxo cumulativo e idade do WIP.
 
+        Usa os mesmos filtros da listagem. Janela em `?since=`/`?until=`
+        (datas, `until` exclusivo; padrao: ultimos 90 dias) e
+        `?group_by=project|department` para a vazao.
+        """
+        params = request.query_params
+        until = self.analytics_date(params, 'until', timezone.localdate() + timedelta(days=1))
+        since = self.analytics_date(params, 'since', until - timedelta(days=ANALYTICS_DEFAULT_DAYS))
+        if not since < until <= since + timedelta(days=ANALYTICS_MAX_DAYS):
+            raise ValidationError({'since': f'Janela invalida (maximo de {ANALYTICS_MAX_DAYS} dias).'})
+        group_by = params.get('group_by') or None
+        if group_by and group_by not in analytics.GROUP_FIELDS:
+            raise ValidationError({'group_by': 'Use project ou department.'})
 
-class PublicTaskViewSet(viewsets.ReadOnlyModelViewSet):
+        tasks = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+        transitions = TaskTransition.objects.filter(task__in=tasks.order_by().values('id'))
+        return Response({
+            'since': since,
+            'until': until,
+            **analytics.flow_times(transitions, since, until),
+            'throughput': analytics.throughput(transitions, since, until, group_by),
+            'cumulative_flow': analytics.cumulative_flow(transitions, since, until),
+            'wip_age': analytics.wip_age(tasks),
+        })
+
+    @staticmethod
+    def analytics_date(params, name, default):
+        if not params.get(name):
+            return default
+        value = parse_date(params[name])
+        if value is None:
+            raise ValidationError({name: 'Data invalida; use AAAA-MM-DD.'})
+        return value
+
+    @action(detail=False, methods=['post'], url_path='bulk-reorder')
+    def bulk_reorder(self, request):
+        """Aplica `[{id, order, status?}]` numa unica transacao e num unico `bulk_update`.
+
+        Mudancas de coluna seguem a mesma regra de `completed_at` de `TaskSerializer`.
+        """
+        items = validate_reorder_items(TaskReorderSerializer, request.data)
+        now = timezone.now()
+        with transaction.atomic():
+            tasks = lock_for_reorder(Task.objects.order_by(), items)
+            moved_columns = []
+            transitions = []
+            for task_id, item in items.items():
+                task = tasks[task_id]
+                task.order = item['order']
+                next_status = item.get('status', task.status)
+                if next_status != task.status:
+                    moved_columns.append(task_id)
+                    transitions.append(TaskTransition.build(task_id, task.status, next_status, now))
+                task.completed_at = task.completed_at_for(next_status)
+                task.status = next_status
+                task.updated_at = now
+            # So trocas de coluna alteram o rollup de `/tasks/stats/`.
+            with track_task_stats(moved_columns):
+                Task.objects.bulk_update(tasks.values(), ['order', 'status', 'completed_at', 'updated_at'])
+            TaskTransition.objects.bulk_create(transitions)
+            bulk_updated.send(sender=Task, instances=list(tasks.values()))
+
+        ordered = [tasks[task_id] for task_id in items]
+        return Response(TaskReorderSerializer(ordered, many=True).data)
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Aplica `[{op, ...}]` (create/update/delete) numa unica transacao.
+
+        Cada `update` e um UPDATE unico para todas as tarefas selecionadas.
+        Retorna um resultado curto por operacao; ids inexistentes vao em `missing`.
+        """
+        serializer = TaskBatchOperationSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=BATCH_MAX_OPERATIONS,
+        )
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data
+        if sum(len(operation.get('ids', ())) for operation in operations) > BATCH_MAX_IDS:
+            raise ValidationError({'ids': f'No maximo {BATCH_MAX_IDS} ids por chamada.'})
+        with transaction.atomic():
+            results, updated = apply_operations(operations, timezone.now())
+            if updated:
+                bulk_updated.send(sender=Task, instances=list(Task.objects.filter(pk__in=updated).only('id')))
+        return Response({'results': results})
+
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        """Move o card para logo apos `after` na coluna `status` do seu projeto, gravando uma unica linha.
+
+        Retorna as posicoes alteradas: normalmente so o card; se a lacuna
+        tiver se esgotado, tambem os vizinhos renumerados.
+        """
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        with transaction.atomic():
+            task = get_object_or_404(Task.objects.select_for_update(), pk=pk)
+            next_status = data.get('status', task.status)
+            siblings = Task.objects.filter(project_id=task.project_id, status=next_status).exclude(pk=task.pk)
+            after = reference_sibling(siblings, data['after'])
+            task.order, rebalanced = place_after(task, siblings, after, TASK_COLUMN_ORDERING)
+            task.completed_at = task.completed_at_for(next_status)
+            task.status = next_status
+            task.save(update_fields=['order', 'status', 'completed_at', 'updated_at'])
+            if rebalanced:
+                bulk_updated.send(sender=Task, instances=rebalanced)
+        return Response(TaskReorderSerializer([task, *rebalanced], many=True).data)
+
+
+class PublicTaskViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """Versao publica (somente leitura) com campos restritos."""
-    queryset = Task.objects.select_related('project', 'responsavel').prefetch_related('assigned_to').order_by('order', '-id')
+    queryset = Task.objects.select_related('project', 'responsavel').order_by('order', '-id')
     serializer_class = PublicTaskSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'tasks_public'
+
+    def list(self, request, *args, **kwargs):
+        """Serve o snapshot pre-serializado do cache, sem consultar o banco."""
+        return snapshot_response(get_public_board(), request)
 
 
 class SubtaskViewSet(viewsets.ModelViewSet):
@@ -47,3 +490,37 @@ class SubtaskViewSet(viewsets.ModelViewSet):
     queryset = Subtask.objects.select_related("task").order_by("order", "created_at")
     serializer_class = SubtaskSerializer
     permission_classes = [IsAuthenticated]
+
+    @action(detail=False, methods=['post'], url_path='bulk-reorder')
+    def bulk_reorder(self, request):
+        """Aplica `[{id, order}]` numa unica transacao e num unico `bulk_update`."""
+        items = validate_reorder_items(SubtaskReorderSerializer, request.data)
+        now = timezone.now()
+        with transaction.atomic():
+            subtasks = lock_for_reorder(Subtask.objects.order_by(), items)
+            for subtask_id, item in items.items():
+                subtasks[subtask_id].order = item['order']
+                subtasks[subtask_id].updated_at = now
+            Subtask.objects.bulk_update(subtasks.values(), ['order', 'updated_at'])
+            # Subtarefas vivem dentro do card: o delta-sync enxerga a tarefa pai.
+            task_ids = {subtask.task_id for subtask in subtasks.values()}
+            Task.objects.filter(pk__in=task_ids).update(updated_at=now)
+            bulk_updated.send(sender=Subtask, instances=list(subtasks.values()))
+
+        ordered = [subtasks[subtask_id] for subtask_id in items]
+        return Response(SubtaskReorderSerializer(ordered, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        """Move a subtarefa para logo apos `after` dentro da mesma tarefa."""
+        serializer = SubtaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            subtask = get_object_or_404(Subtask.objects.select_for_update(), pk=pk)
+            siblings = Subtask.objects.filter(task_id=subtask.task_id).exclude(pk=subtask.pk)
+            after = reference_sibling(siblings, serializer.validated_data['after'])
+            subtask.order, rebalanced = place_after(subtask, siblings, after, SUBTASK_COLUMN_ORDERING)
+            subtask.save(update_fields=['order', 'updated_at'])
+            if rebalanced:
+                bulk_updated.send(sender=Subtask, instances=rebalanced)
+        return Response(SubtaskReorderSerializer([subtask, *rebalanced], many=True).data)
@@ -0,0 +1,69 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { subscribeBoardEvents } from "@/lib/events";
+import { API_EVENTS } from "@/constants/api";
+
+class FakeEventSource {
+    static instances: FakeEventSource[] = [];
+    url: string;
+    closed = false;
+    onopen: (() => void) | null = null;
+    onmessage: ((message: { data: string }) => void) | null = null;
+    onerror: (() => void) | null = null;
+
+    constructor(url: string) {
+        this.url = url;
+        FakeEventSource.instances.push(this);
+    }
+
+    close() {
+        this.closed = true;
+    }
+}
+
+describe("subscribeBoardEvents", () => {
+    beforeEach(() => {
+        FakeEventSource.instances = [];
+        vi.stubGlobal("EventSource", FakeEventSource);
+        vi.useFakeTimers();
+    });
+
+    afterEach(() => {
+        vi.useRealTimers();
+        vi.unstubAllGlobals();
+    });
+
+    it("opens the anonymous stream and forwards parsed events", () => {
+        const onEvent = vi.fn();
+        const unsubscribe = subscribeBoardEvents({ onEvent });
+        const source = FakeEventSource.instances[0];
+        expect(source.url).toBe(API_EVENTS);
+
+        source.onmessage?.({ data: JSON.stringify({ model: "task", action: "updated", id: 1 }) });
+        expect(onEvent).toHaveBeenCalledWith({ model: "task", action: "updated", id: 1 });
+
+        unsubscribe();
+        expect(source.closed).toBe(true);
+    });
+
+    it("reconnects with a fresh ticket after an error", async () => {
+        const getTicket = vi.fn()
+            .mockResolvedValueOnce("first")
+            .mockResolvedValueOnce("second");
+        const onDown = vi.fn();
+        const unsubscribe = subscribeBoardEvents({ getTicket, onEvent: vi.fn(), onDown });
+
+        await vi.waitFor(() => expect(FakeEventSource.instances).toHaveLength(1));
+        const first = FakeEventSource.instances[0];
+        expect(first.url).toBe(`${API_EVENTS}?ticket=first`);
+
+        first.onerror?.();
+        expect(first.closed).toBe(true);
+        expect(onDown).toHaveBeenCalledTimes(1);
+
+        await vi.advanceTimersByTimeAsync(1_000);
+        expect(FakeEventSource.instances).toHaveLength(2);
+        expect(FakeEventSource.instances[1].url).toBe(`${API_EVENTS}?ticket=second`);
+
+        unsubscribe();
+    });
+});
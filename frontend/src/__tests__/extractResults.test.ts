@@ -1,5 +1,5 @@
 import { describe, it, expect } from "vitest";
-import { extractResults } from "@/lib/api";
+import { extractResults, fetchAllPages } from "@/lib/api";
 
 describe("extractResults", () => {
     it("returns array directly when data is already an array", () => {
@@ -28,3 +28,20 @@ describe("extractResults", () => {
         expect(extractResults({ results: "not an array" })).toEqual([]);
     });
 });
+
+describe("fetchAllPages", () => {
+    it("follows next cursors until the last page", async () => {
+        const pages: Record<string, unknown> = {
+            "/a": { next: "/b", results: [{ id: 1 }] },
+            "/b": { next: null, results: [{ id: 2 }] },
+        };
+        const fetcher = async (input: RequestInfo) =>
+            new Response(JSON.stringify(pages[input as string]), { status: 200 });
+        expect(await fetchAllPages(fetcher, "/a")).toEqual([{ id: 1 }, { id: 2 }]);
+    });
+
+    it("returns null when a page fails", async () => {
+        const fetcher = async () => new Response("", { status: 500 });
+        expect(await fetchAllPages(fetcher, "/a")).toBeNull();
+    });
+});
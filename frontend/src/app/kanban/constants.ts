@@ -31,6 +31,9 @@ export const STATUS_LABELS: Record<Task["status"], string> = {
 
 export const TASK_REFRESH_INTERVAL = 5_000;
 
+// Tamanho de pagina pedido ao carregar o board (limitado por TASK_MAX_PAGE_SIZE no backend)
+export const TASK_PAGE_SIZE = 500;
+
 export const EMPTY_FORM: Omit<Task, "id" | "created_at" | "updated_at"> = {
     title: "",
     description: "",
@@ -0,0 +1,78 @@
+import { useEffect } from "react";
+import { subscribeBoardEvents } from "@/lib/events";
+
+// Agrupa rajadas de eventos (ex.: mover varias tasks) numa unica atualizacao.
+const EVENT_REFRESH_DELAY = 500;
+
+/**
+ * Atualiza o quadro a cada evento do stream SSE.
+ *
+ * Polling a cada `fallbackInterval` so enquanto o stream esta fora. Com a aba
+ * oculta, fecha o stream; ao voltar, atualiza e reabre.
+ */
+export function useBoardEvents(
+    refresh: () => void,
+    { getTicket, fallbackInterval }: { getTicket?: () => Promise<string | null>; fallbackInterval: number },
+) {
+    useEffect(() => {
+        let refreshId: number | null = null;
+        let fallbackId: number | null = null;
+        let unsubscribe: (() => void) | null = null;
+        let connectedOnce = false;
+
+        const scheduleRefresh = () => {
+            if (refreshId !== null) return;
+            refreshId = window.setTimeout(() => {
+                refreshId = null;
+                refresh();
+            }, EVENT_REFRESH_DELAY);
+        };
+        const startFallback = () => {
+            if (fallbackId === null) {
+                fallbackId = window.setInterval(refresh, fallbackInterval);
+            }
+        };
+        const stopFallback = () => {
+            if (fallbackId !== null) {
+                window.clearInterval(fallbackId);
+                fallbackId = null;
+            }
+        };
+        const open = () => {
+            if (unsubscribe) return;
+            unsubscribe = subscribeBoardEvents({
+                getTicket,
+                onEvent: scheduleRefresh,
+                onOpen: () => {
+                    stopFallback();
+                    // Na reconexao, busca o que mudou enquanto o stream estava fora.
+                    if (connectedOnce) scheduleRefresh();
+                    connectedOnce = true;
+                },
+                onDown: startFallback,
+            });
+        };
+        const close = () => {
+            unsubscribe?.();
+            unsubscribe = null;
+            connectedOnce = false;
+            stopFallback();
+        };
+        const handleVisibility = () => {
+            if (document.hidden) {
+                close();
+            } else {
+                refresh();
+                open();
+            }
+        };
+
+        open();
+        document.addEventListener("visibilitychange", handleVisibility);
+        return () => {
+            close();
+            if (refreshId !== null) window.clearTimeout(refreshId);
+            document.removeEventListener("visibilitychange", handleVisibility);
+        };
+    }, [refresh, getTicket, fallbackInterval]);
+}
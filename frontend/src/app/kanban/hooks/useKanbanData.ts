@@ -1,10 +1,11 @@
 import { useCallback, useEffect, useState } from "react";
 import { toast } from "react-toastify";
 import AuthService from "@/services/auth";
-import { API_TASKS, API_PROJECTS, API_COLLABORATORS, API_DEPARTMENTS } from "@/constants/api";
-import { extractResults } from "@/lib/api";
+import { API_TASKS, API_PROJECTS, API_COLLABORATORS, API_DEPARTMENTS, API_EVENTS_TICKET } from "@/constants/api";
+import { extractResults, fetchAllPages } from "@/lib/api";
 import type { Task, Project, Collaborator, Department } from "../types";
-import { TASK_REFRESH_INTERVAL } from "../constants";
+import { TASK_PAGE_SIZE, TASK_REFRESH_INTERVAL } from "../constants";
+import { useBoardEvents } from "./useBoardEvents";
 
 export function useKanbanData() {
     const [tasks, setTasks] = useState<Task[]>([]);
@@ -25,19 +26,18 @@ export function useKanbanData() {
                 setLoading(true);
             }
             const [tasksResult, projectsResult, collabResult, deptResult] = await Promise.allSettled([
-                authedFetch(`${API_TASKS}/`),
+                fetchAllPages<Task>(authedFetch, `${API_TASKS}/?page_size=${TASK_PAGE_SIZE}`),
                 authedFetch(`${API_PROJECTS}/`),
                 authedFetch(`${API_COLLABORATORS}/`),
                 authedFetch(`${API_DEPARTMENTS}/`)
             ]);
-            if (tasksResult.status === "rejected" || !tasksResult.value.ok) {
+            if (tasksResult.status === "rejected" || tasksResult.value === null) {
                 throw new Error("Erro ao buscar tasks");
             }
-            const tasksData = await tasksResult.value.json();
             const projectsData = projectsResult.status === "fulfilled" && projectsResult.value.ok ? await projectsResult.value.json() : [];
             const collabData = collabResult.status === "fulfilled" && collabResult.value.ok ? await collabResult.value.json() : [];
             const deptData = deptResult.status === "fulfilled" && deptResult.value.ok ? await deptResult.value.json() : [];
-            setTasks(extractResults<Task>(tasksData));
+            setTasks(tasksResult.value);
             setProjects(extractResults<Project>(projectsData));
             setCollaborators(extractResults<Collaborator>(collabData));
             setDepartments(extractResults<Department>(deptData));
@@ -118,35 +118,16 @@ export function useKanbanData() {
         return () => { cancelled = true; };
     }, [fetchData]);
 
-    useEffect(() => {
-        let intervalId: number | null = null;
-        const startPolling = () => {
-            if (intervalId) return;
-            intervalId = window.setInterval(() => {
-                fetchData({ silent: true });
-            }, TASK_REFRESH_INTERVAL);
-        };
-        const stopPolling = () => {
-            if (intervalId) {
-                window.clearInterval(intervalId);
-                intervalId = null;
-            }
-        };
-        const handleVisibility = () => {
-            if (document.hidden) {
-                stopPolling();
-            } else {
-                fetchData({ silent: true });
-                startPolling();
-            }
-        };
-        startPolling();
-        document.addEventListener("visibilitychange", handleVisibility);
-        return () => {
-            stopPolling();
-            document.removeEventListener("visibilitychange", handleVisibility);
-        };
-    }, [fetchData]);
+    const refresh = useCallback(() => { fetchData({ silent: true }); }, [fetchData]);
+
+    const getStreamTicket = useCallback(async () => {
+        const res = await authedFetch(API_EVENTS_TICKET, { method: "POST" });
+        if (!res.ok) return null;
+        const data = await res.json();
+        return data.ticket as string;
+    }, [authedFetch]);
+
+    useBoardEvents(refresh, { getTicket: getStreamTicket, fallbackInterval: TASK_REFRESH_INTERVAL });
 
     return {
         tasks, setTasks,
@@ -60,6 +60,28 @@ export function useSubtasks(
         [authedFetch, setTasks],
     );
 
+    const moveSubtask = useCallback(
+        async (id: number, after: number | null) => {
+            try {
+                const res = await authedFetch(`${API_SUBTASKS}/${id}/move/`, {
+                    method: "POST",
+                    headers: { "Content-Type": "application/json" },
+                    body: JSON.stringify({ after }),
+                });
+                if (!res.ok) {
+                    toast.error("Erro ao reordenar subtarefas.");
+                    return null;
+                }
+                return (await res.json()) as { id: number; order: number }[];
+            } catch (e) {
+                console.error(e);
+                toast.error("Erro ao reordenar subtarefas.");
+                return null;
+            }
+        },
+        [authedFetch],
+    );
+
     const addSubtask = useCallback(
         async (taskId: number, title: string) => {
             const trimmed = title.trim();
@@ -239,21 +261,28 @@ export function useSubtasks(
             if (fromIndex < toIndex) toIndex -= 1;
             next.splice(toIndex, 0, moved);
             const withOrder = next.map((s, index) => ({ ...s, order: index }));
-            const previousOrderMap = new Map(sorted.map((s, index) => [s.id, s.order ?? index]));
-            const changed = withOrder.filter((s) => s.id && previousOrderMap.get(s.id) !== s.order);
             setTasks((prev) =>
                 prev.map((t) => (t.id === taskId ? { ...t, subtasks: withOrder } : t)),
             );
-            if (changed.length > 0) {
-                await Promise.all(
-                    changed.map((s) => (s.id ? updateSubtask(s.id, { order: s.order }) : Promise.resolve())),
-                );
+            if (fromIndex !== toIndex) {
+                // Ordem esparsa no backend: so a subtarefa movida e gravada.
+                const after = toIndex > 0 ? next[toIndex - 1].id ?? null : null;
+                const updates = await moveSubtask(sourceSubtaskId, after);
+                if (updates) {
+                    const serverOrder = new Map(updates.map((u) => [u.id, u.order]));
+                    const merged = next.map((s) =>
+                        s.id && serverOrder.has(s.id) ? { ...s, order: serverOrder.get(s.id) } : s,
+                    );
+                    setTasks((prev) =>
+                        prev.map((t) => (t.id === taskId ? { ...t, subtasks: merged } : t)),
+                    );
+                }
             }
             setDraggedSubtask(null);
             setDropTargetSubtaskId(null);
             setDropTargetPosition(null);
         },
-        [draggedSubtask, tasks, sortSubtasks, updateSubtask, setTasks],
+        [draggedSubtask, tasks, sortSubtasks, moveSubtask, setTasks],
     );
 
     return {
@@ -5,6 +5,7 @@ import { Clock, User, Briefcase } from "lucide-react";
 import styles from "./page.module.css";
 import { API_TASKS_PUBLIC } from "@/constants/api";
 import { extractResults } from "@/lib/api";
+import { useBoardEvents } from "../hooks/useBoardEvents";
 import { parseISODateLocal } from "@/app/components/DateInputBRNative";
 
 // ====================
@@ -29,7 +30,7 @@ interface Task {
 // ====================
 // Configuração
 // ====================
-const AUTO_REFRESH_INTERVAL = 30000; // 30 segundos
+const AUTO_REFRESH_INTERVAL = 30000; // 30 segundos, sem o stream de eventos
 
 const COLUMNS = [
     { id: "TODO", label: "A Fazer" },
@@ -98,14 +99,11 @@ export default function KanbanTVPage() {
     // ====================
     useEffect(() => {
         fetchData();
-
-        const interval = setInterval(() => {
-            fetchData();
-        }, AUTO_REFRESH_INTERVAL);
-
-        return () => clearInterval(interval);
     }, [fetchData]);
 
+    // Stream anonimo do quadro publico; o polling so roda com ele fora do ar
+    useBoardEvents(fetchData, { fallbackInterval: AUTO_REFRESH_INTERVAL });
+
     // ====================
     // Filtrar tarefas
     // ====================
@@ -18,6 +18,10 @@ export const API_TASKS = `${API_BASE}/api/v1/tasks`;
 export const API_TASKS_PUBLIC = `${API_BASE}/api/v1/tasks-public/`;
 export const API_SUBTASKS = `${API_BASE}/api/v1/subtasks`;
 
+// Eventos do quadro em tempo real (SSE)
+export const API_EVENTS = `${API_BASE}/api/v1/events/`;
+export const API_EVENTS_TICKET = `${API_BASE}/api/v1/events/ticket/`;
+
 // Dependências do Kanban
 export const API_PROJECTS = `${API_BASE}/api/v1/projects`;
 export const API_COLLABORATORS = `${API_BASE}/api/v1/collaborators`;
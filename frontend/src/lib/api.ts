@@ -10,3 +10,25 @@ export function extractResults<T>(data: unknown): T[] {
     }
     return [];
 }
+
+/**
+ * Percorre todas as paginas de um endpoint com paginacao por cursor,
+ * seguindo o campo `next` ate o fim. Retorna null se alguma pagina falhar.
+ */
+export async function fetchAllPages<T>(
+    fetcher: (input: RequestInfo) => Promise<Response>,
+    url: string,
+): Promise<T[] | null> {
+    const items: T[] = [];
+    let next: string | null = url;
+    while (next) {
+        const res = await fetcher(next);
+        if (!res.ok) return null;
+        const data: unknown = await res.json();
+        items.push(...extractResults<T>(data));
+        next = data && typeof data === "object" && "next" in data
+            ? ((data as { next: string | null }).next ?? null)
+            : null;
+    }
+    return items;
+}
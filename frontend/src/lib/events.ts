@@ -0,0 +1,85 @@
+import { API_EVENTS } from "@/constants/api";
+
+/** Evento publicado pelo backend quando um modelo do quadro muda. */
+export interface BoardEvent {
+    model: string;
+    action: "created" | "updated" | "deleted";
+    id: number;
+    task?: number;
+}
+
+interface SubscribeOptions {
+    /** Ticket de uso unico (clientes autenticados); sem ele o stream e anonimo (modo TV). */
+    getTicket?: () => Promise<string | null>;
+    onEvent: (event: BoardEvent) => void;
+    /** Conexao aberta (inclusive apos uma queda). */
+    onOpen?: () => void;
+    /** Conexao caiu; uma nova tentativa ja foi agendada. */
+    onDown?: () => void;
+}
+
+const MAX_RETRY_DELAY_MS = 30_000;
+
+/**
+ * Assina o stream SSE do quadro e retorna a funcao que o encerra.
+ *
+ * O ticket vale uma unica conexao, entao a reconexao automatica do
+ * EventSource e trocada por uma nova conexao (com novo ticket) e espera
+ * exponencial ate 30s.
+ */
+export function subscribeBoardEvents(options: SubscribeOptions): () => void {
+    let source: EventSource | null = null;
+    let retryId: ReturnType<typeof setTimeout> | null = null;
+    let attempt = 0;
+    let closed = false;
+
+    const scheduleRetry = () => {
+        if (closed || retryId !== null) return;
+        const delay = Math.min(MAX_RETRY_DELAY_MS, 1_000 * 2 ** attempt);
+        attempt += 1;
+        retryId = setTimeout(() => {
+            retryId = null;
+            connect();
+        }, delay);
+    };
+
+    const connect = async () => {
+        let url = API_EVENTS;
+        if (options.getTicket) {
+            const ticket = await options.getTicket().catch(() => null);
+            if (closed) return;
+            if (!ticket) {
+                options.onDown?.();
+                scheduleRetry();
+                return;
+            }
+            url = `${API_EVENTS}?ticket=${encodeURIComponent(ticket)}`;
+        }
+        source = new EventSource(url);
+        source.onopen = () => {
+            attempt = 0;
+            options.onOpen?.();
+        };
+        source.onmessage = (message) => {
+            try {
+                options.onEvent(JSON.parse(message.data) as BoardEvent);
+            } catch (e) {
+                console.error(e);
+            }
+        };
+        source.onerror = () => {
+            source?.close();
+            source = null;
+            options.onDown?.();
+            scheduleRetry();
+        };
+    };
+
+    connect();
+    return () => {
+        closed = true;
+        source?.close();
+        source = null;
+        if (retryId !== null) clearTimeout(retryId);
+    };
+}